@@ -1,95 +1,131 @@
 import os
-import glob
 import logging
+import re
 import pytest
 import time
 from datetime import datetime
-from utils.html_reporter import HTMLReportGenerator
+from utils.html_reporter import HTMLReportGenerator, StreamingHTMLReport
+from utils.parallel_runner import connect_to_controller
+from utils.session_files import configure_file_logging, prepare_session_files, session_name_from_args
+from utils.test_scheduler import DurationStore, records_duration
+from utils.drivers import DriverPool, StandbyLauncher, get_driver_reaper
+from tests.login import login
+from utils.auth_cache import get_auth_cache
+from utils.checkpoints import get_checkpoint_store
+from pages.base_page import get_action_stats
+from utils.test_metrics import current_test_metrics, record_timing, start_test_metrics
+from utils.performance_budgets import apply_suite_budgets, format_check, get_performance_budgets
+from utils.local_storefront import local_storefront_enabled, storefront_from_env
+from pages.routes import set_base_url
 
 # Global variables for session tracking
 _logging_initialized = False
 _html_reporter = None
 _session_start_time = None
-_test_start_times = {}
+# nodeid -> seconds per phase ('setup', 'call', 'teardown') of the running test
+_test_phases = {}
+# nodeid -> result built from the call phase, reported once teardown is timed
+_pending_results = {}
+_driver_pool = None
+_worker_id = os.getenv("SUITE_WORKER_ID")
+_results_channel = None
+_nodeid_durations = {}
+_BROWSER_PARAM = re.compile(r"(?<=[\[-])(chrome|firefox|edge)(?=[\]-])", re.IGNORECASE)
 
 def pytest_configure(config):
     """Called once at the start of the entire pytest session"""
-    global _logging_initialized, _html_reporter, _session_start_time
+    global _logging_initialized, _html_reporter, _session_start_time, _results_channel
     
     # Only initialize once per session
     if _logging_initialized:
         return
     
     _session_start_time = datetime.now()
+    config.addinivalue_line("markers", "ui_login: always log in through the login form instead of the cached session")
+    config.addinivalue_line("markers", "ui_navigation: move between pages by clicking through the UI instead of opening URLs")
+    config.addinivalue_line("markers", "budget(commands, command_time, duration, steps): performance budgets for the test (see data/performance_budgets.json)")
+
+    if local_storefront_enabled():
+        # Each process (controller or parallel worker) serves its own copy on a free port
+        storefront = storefront_from_env()
+        set_base_url(storefront.start())
+        config.add_cleanup(storefront.stop)
+
+    if _worker_id:
+        # Parallel worker: log to a private file and stream results to the controller
+        configure_file_logging(os.environ["SUITE_WORKER_LOG"], f"%(asctime)s - %(levelname)s - [{_worker_id}] %(message)s")
+        _results_channel = connect_to_controller()
+        _logging_initialized = True
+        logging.info(f"Worker {_worker_id} started (pid {os.getpid()})")
+        return
     
-    # Initialize HTML reporter
-    _html_reporter = HTMLReportGenerator("Selenium E2E Test Suite")
+    # Setup log file and report path (keeps only 5 most recent logs for this test type)
+    test_name_raw = session_name_from_args(config.args)
+    log_file_path, report_file_path = prepare_session_files(test_name_raw, _session_start_time)
+    configure_file_logging(log_file_path)
     
-    # Setup directories
-    project_root = os.path.dirname(__file__)
-    log_folder = os.path.join(project_root, "logs")
-    reports_folder = os.path.join(project_root, "reports")
-    os.makedirs(log_folder, exist_ok=True)
-    os.makedirs(reports_folder, exist_ok=True)
-
-    # Determine test name for file naming
-    test_paths = config.args
-    if test_paths:
-        test_name_raw = os.path.splitext(os.path.basename(test_paths[0]))[0]
+    # Initialize HTML reporter; by default rows are written as tests finish
+    if os.getenv('STREAMING_REPORT', 'true').lower() == 'false':
+        _html_reporter = HTMLReportGenerator("Selenium E2E Test Suite")
     else:
-        test_name_raw = "full_suite"
-    
-    test_name_upper = test_name_raw.upper()
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H%M")
-
-    # Setup log file
-    log_file_name = f"{test_name_raw}_{timestamp}.txt"
-    log_file_path = os.path.join(log_folder, log_file_name)
-
-    # Keep only 5 most recent logs for this test type
-    matching_logs = glob.glob(os.path.join(log_folder, f"{test_name_raw}_*.txt"))
-    matching_logs.sort(key=os.path.getmtime)
-    if len(matching_logs) >= 5:
-        for file in matching_logs[:len(matching_logs) - 4]:
-            try:
-                os.remove(file)
-            except OSError:
-                pass
-
-    # Clear existing log handlers
-    logger = logging.getLogger()
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
-
-    # Write log header
-    with open(log_file_path, "w", encoding="utf-8") as f:
-        f.write(f"\n{test_name_upper} TEST SESSION\n")
-        f.write(f"Started: {_session_start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write("=" * 60 + "\n\n")
-
-    # Setup file logging
-    file_handler = logging.FileHandler(log_file_path, mode="a", encoding="utf-8")
-    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-    file_handler.setFormatter(formatter)
-    logger.setLevel(logging.INFO)
-    logger.addHandler(file_handler)
+        _html_reporter = StreamingHTMLReport("Selenium E2E Test Suite", report_file_path)
     
     # Store HTML report path
-    report_file_name = f"{test_name_raw}_report_{timestamp}.html"
-    config._html_report_path = os.path.join(reports_folder, report_file_name)
+    config._html_report_path = report_file_path
     
     _logging_initialized = True
     logging.info("Logging and HTML reporting initialized.")
 
+def pytest_collection_modifyitems(session, config, items):
+    """Parallel workers only run the nodeids the controller assigned to them"""
+    assigned_file = os.getenv("SUITE_WORKER_NODEIDS")
+    if not assigned_file:
+        return
+    with open(assigned_file, encoding="utf-8") as f:
+        assigned = [line.strip() for line in f if line.strip()]
+
+    order = {nodeid: index for index, nodeid in enumerate(assigned)}
+    deselected = [item for item in items if item.nodeid not in order]
+    items[:] = sorted((item for item in items if item.nodeid in order), key=lambda item: order[item.nodeid])
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+
 def pytest_sessionstart(session):
     """Called after the Session object has been created"""
     logging.info(f"Test session started with {len(session.config.args)} test file(s)")
 
+@pytest.fixture(scope="session")
+def driver_pool():
+    """Session-wide pool keeping one warm browser per type for this worker"""
+    global _driver_pool
+    standby = StandbyLauncher(headless=True)
+    pool = DriverPool(headless=True, standby=standby if standby.spares > 0 else None)
+    _driver_pool = pool
+    yield pool
+    pool.shutdown()
+    logging.info(f"Driver pool: {pool.launches} browser launch(es), {pool.reuses} reuse(s)")
+
+@pytest.fixture(params=["chrome","firefox","edge"])
+def authenticated_driver(request, driver_pool):
+    """Logged-in driver taken from the session driver pool for multiple browsers"""
+    browser = request.param
+    driver = driver_pool.acquire(browser)
+    use_session_cache = request.node.get_closest_marker("ui_login") is None
+    started = time.perf_counter()
+    try:
+        login(browser, True, driver=driver, use_session_cache=use_session_cache)
+    except Exception:
+        driver_pool.release(driver, browser, discard=True)
+        raise
+    record_timing('login', time.perf_counter() - started)
+    driver.ui_navigation = request.node.get_closest_marker("ui_navigation") is not None
+    yield driver
+    driver_pool.release(driver, browser)
+
 def pytest_runtest_setup(item):
     """Called before each test runs"""
-    global _test_start_times
     test_name = item.name
-    _test_start_times[test_name] = time.time()
+    start_test_metrics(item.nodeid)
     
     # Extract browser info for better logging
     browser = _extract_browser_from_test(test_name)
@@ -101,6 +137,11 @@ def pytest_runtest_setup(item):
 
 def pytest_runtest_teardown(item, nextitem):
     """Called after each test completes"""
+    # Start the browser the next test needs while this one tears down
+    next_browser = _pooled_browser_for(nextitem)
+    if _driver_pool and next_browser:
+        _driver_pool.prewarm(next_browser)
+
     test_name = item.name
     browser = _extract_browser_from_test(test_name)
     if browser:
@@ -108,80 +149,153 @@ def pytest_runtest_teardown(item, nextitem):
     else:
         logging.info(f"🏁 Finished: {test_name}")
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Check the test's performance budgets once its body has run"""
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != "call":
+        return
+    
+    budgets = get_performance_budgets()
+    metrics = current_test_metrics()
+    if budgets.mode == "off" or not metrics or metrics.nodeid != item.nodeid:
+        return
+    marker = item.get_closest_marker("budget")
+    # Teardown hasn't run yet: duration budgets cover setup + call and are labelled that way
+    duration = _test_phases.get(item.nodeid, {}).get('setup', 0) + report.duration
+    checks = budgets.check_test(item.originalname, metrics.data, duration, marker.kwargs if marker else None)
+    if not checks:
+        return
+    
+    metrics.data['budgets'] = checks
+    exceeded = [format_check(check) for check in checks if check['exceeded']]
+    for line in exceeded:
+        logging.warning(f"Performance budget exceeded: {line}")
+    if exceeded and budgets.mode == "fail" and report.passed:
+        report.outcome = "failed"
+        report.longrepr = "Performance budget exceeded:\n" + "\n".join(exceeded)
+
 def pytest_runtest_logreport(report):
-    """Called when a test report is created"""
-    global _html_reporter, _test_start_times
-    
-    if report.when == "call":  # Only process main test execution
-        test_name = report.nodeid.split("::")[-1]
-        
-        # Extract browser and clean test name
-        browser = _extract_browser_from_test(test_name)
-        clean_name = _clean_test_name(test_name)
-
-        # Calculate test duration
-        duration = 0
-        if test_name in _test_start_times:
-            duration = time.time() - _test_start_times[test_name]
-            del _test_start_times[test_name]
-        
-        # Determine status and collect details
-        status = "PASSED"
-        error_message = ""
-        details = f"Test: {clean_name}\nDuration: {duration:.2f}s"
+    """Called for each phase (setup, call, teardown) of a test"""
+    _test_phases.setdefault(report.nodeid, {})[report.when] = report.duration
+    
+    if report.when == "call":  # Status comes from the test body
+        _pending_results[report.nodeid] = _result_from_report(report)
+    elif report.when == "setup" and not report.passed:  # The body never runs, so the setup report is the result
+        _pending_results[report.nodeid] = _result_from_report(report)
+    elif report.when == "teardown":  # Timing is complete once the fixtures are torn down
+        phases = _test_phases.pop(report.nodeid)
+        pending = _pending_results.pop(report.nodeid, None)
+        if pending:
+            _report_result(report.nodeid, pending, phases)
+
+def _result_from_report(report):
+    """Log the outcome of a test body (or its failed/skipped setup) and build its report result (finished by _report_result)"""
+    test_name = report.nodeid.split("::")[-1]
+    
+    # Extract browser and clean test name
+    browser = _extract_browser_from_test(test_name)
+    clean_name = _clean_test_name(test_name)
+    
+    # Determine status and collect details
+    status = "PASSED"
+    error_message = ""
+    details = []
+
+    if browser:
+        details.append(f"Browser: {browser.title()}")
+    
+    if report.failed:
+        status = "FAILED"
+        if report.longrepr:
+            error_message = str(report.longrepr)
+            # Get concise error info
+            lines = error_message.split('\n')
+            for line in lines:
+                line = line.strip()
+                if ('assert' in line.lower() or 'error:' in line.lower()) and line:
+                    details.append(f"Error: {line}")
+                    break
+        # Enhanced logging with browser info
+        if browser:
+            logging.error(f"❌ FAILED: {clean_name} [{browser.upper()}]")
+        else:
+            logging.error(f"❌ FAILED: {test_name}")
 
+    elif report.skipped:
+        status = "SKIPPED"
+        if hasattr(report, 'wasxfail'):
+            details.append(f"Reason: {report.wasxfail}")
         if browser:
-            details += f"\nBrowser: {browser.title()}"
-        
-        if report.failed:
-            status = "FAILED"
-            if report.longrepr:
-                error_message = str(report.longrepr)
-                # Get concise error info
-                lines = error_message.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if ('assert' in line.lower() or 'error:' in line.lower()) and line:
-                        details += f"\nError: {line}"
-                        break
-            # Enhanced logging with browser info
-            if browser:
-                logging.error(f"❌ FAILED: {clean_name} [{browser.upper()}]")
-            else:
-                logging.error(f"❌ FAILED: {test_name}")
-
-        elif report.skipped:
-            status = "SKIPPED"
-            if hasattr(report, 'wasxfail'):
-                details += f"\nReason: {report.wasxfail}"
-            if browser:
-                logging.warning(f"⚠️  SKIPPED: {clean_name} [{browser.upper()}]")
-            else:
-                logging.warning(f"⚠️  SKIPPED: {test_name}")
+            logging.warning(f"⚠️  SKIPPED: {clean_name} [{browser.upper()}]")
+        else:
+            logging.warning(f"⚠️  SKIPPED: {test_name}")
 
+    else:
+        if browser:
+            logging.info(f"✅ PASSED: {clean_name} [{browser.upper()}]")
         else:
-            if browser:
-                logging.info(f"✅ PASSED: {clean_name} [{browser.upper()}]")
-            else:
-                logging.info(f"✅ PASSED: {test_name}")
-
-        # Create display name with browser info for HTML report
-        display_name = f"{clean_name} [{browser.upper()}]" if browser else test_name
-
-        # Add to HTML reporter
-        if _html_reporter:
-            _html_reporter.add_test_result(
-                test_name=display_name,
-                status=status,
-                duration=duration,
-                details=details,
-                error_message=error_message[:1000] if error_message else "",  # Limit error length
-                browser=browser or "unknown"
-            )
+            logging.info(f"✅ PASSED: {test_name}")
+
+    # Create display name with browser info for HTML report
+    display_name = f"{clean_name} [{browser.upper()}]" if browser else test_name
+
+    result = {
+        'test_name': display_name,
+        'status': status,
+        'duration': 0,
+        'details': details,
+        'error_message': error_message[:1000] if error_message else "",  # Limit error length
+        'browser': browser or "unknown"
+    }
+
+    # Step timings and other per-test measurements recorded by the helpers
+    metrics = current_test_metrics()
+    if metrics and metrics.nodeid == report.nodeid and metrics.has_data():
+        result['metrics'] = metrics.to_dict()
+        _log_command_metrics(result['metrics'].get('commands'))
+    return {'clean_name': clean_name, 'result': result}
+
+def _report_result(nodeid, pending, phases):
+    """Add the phase timings to a test's result and hand it to the report"""
+    result = pending['result']
+    duration = sum(phases.values())
+    phase_summary = ", ".join(f"{phase} {phases.get(phase, 0):.2f}s" for phase in ("setup", "call", "teardown"))
+    result['duration'] = duration
+    result['details'] = "\n".join([f"Test: {pending['clean_name']}", f"Duration: {duration:.2f}s ({phase_summary})",
+                                   *result['details']])
+    result.setdefault('metrics', {})['phases'] = dict(phases)
+    logging.info(f"Timing: {phase_summary}")
+
+    if records_duration(nodeid, result['status']):
+        _nodeid_durations[nodeid] = duration
+
+    # Parallel workers stream the result to the controller, which owns the report
+    if _results_channel:
+        _results_channel.send({'type': 'result', 'worker': _worker_id, 'nodeid': nodeid, 'result': result})
+    elif _html_reporter:
+        _html_reporter.add_test_result(**result)
+
+def _log_command_metrics(commands):
+    """Log a test's WebDriver round trips and its slowest commands"""
+    if not commands:
+        return
+    logging.info(f"WebDriver commands: {commands['count']} in {commands['duration']:.2f}s, {commands['errors']} error(s)")
+    for command in commands['slowest']:
+        target = f" ({command['target']})" if command['target'] else ""
+        outcome = f" - {command['error']}" if command['error'] else ""
+        logging.info(f"    {command['duration']:.3f}s {command['command']}{target} from {command['source']}{outcome}")
 
 def pytest_sessionfinish(session, exitstatus):
     """Called after the entire test session finishes"""
-    global _html_reporter, _session_start_time
+    global _html_reporter, _session_start_time, _results_channel
+    
+    # Pending background quits must finish before the session is reported as done
+    reaper = get_driver_reaper()
+    reaper.drain()
+    if reaper.reaped:
+        logging.info(f"Driver reaper: {reaper.reaped} driver(s) quit in background, {reaper.killed} force-killed")
     
     session_end_time = datetime.now()
     total_duration = (session_end_time - _session_start_time).total_seconds()
@@ -190,6 +304,15 @@ def pytest_sessionfinish(session, exitstatus):
     failed_count = session.testsfailed
     passed_count = total_tests - failed_count
     
+    if _worker_id:
+        # The controller writes the session summary and the merged report
+        _log_session_stats()
+        logging.info(f"Worker {_worker_id} finished {total_tests} test(s) in {total_duration:.2f}s")
+        if _results_channel:
+            _results_channel.send({'type': 'done', 'worker': _worker_id, 'exitstatus': int(exitstatus)})
+            _results_channel.close()
+        return
+    
     # Log session summary
     logging.info("=" * 60)
     logging.info("TEST SESSION SUMMARY")
@@ -200,10 +323,18 @@ def pytest_sessionfinish(session, exitstatus):
     logging.info(f"Duration: {total_duration:.2f}s")
     logging.info(f"Exit Status: {exitstatus}")
     logging.info(f"Session finished: {session_end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    _log_session_stats()
+    
+    # Feed the duration history used to schedule parallel and sharded runs
+    if _nodeid_durations:
+        durations = DurationStore()
+        durations.record_many(_nodeid_durations)
+        durations.save()
     
     # Generate HTML report
     if _html_reporter and hasattr(session.config, '_html_report_path'):
         try:
+            session.exitstatus = apply_suite_budgets(_html_reporter, session.exitstatus)
             _html_reporter.set_session_times(_session_start_time, session_end_time)
             report_path = _html_reporter.generate_html_report(session.config._html_report_path)
             
@@ -222,15 +353,37 @@ def pytest_sessionfinish(session, exitstatus):
     
     logging.info("=" * 60)
 
+def _log_session_stats():
+    """Summarize how much browser startup, login, setup and waiting work was avoided"""
+    if _driver_pool and _driver_pool.standby:
+        logging.info(_driver_pool.standby.summary())
+    auth_cache = get_auth_cache()
+    if auth_cache.hits or auth_cache.misses:
+        logging.info(f"Auth session cache: {auth_cache.hits} injected session(s), {auth_cache.misses} UI login(s)")
+    checkpoints = get_checkpoint_store()
+    if checkpoints.hits or checkpoints.misses:
+        logging.info(f"App checkpoints: {checkpoints.hits} restored, {checkpoints.misses} built from scratch")
+    action_stats = get_action_stats()
+    if action_stats.fast_path or action_stats.retried or action_stats.failed:
+        logging.info(action_stats.summary())
+
+def _pooled_browser_for(item):
+    """Browser a test will take from the driver pool, or None if it doesn't use the pool"""
+    if item is None or "authenticated_driver" not in getattr(item, "fixturenames", []):
+        return None
+    callspec = getattr(item, "callspec", None)
+    return callspec.params.get("authenticated_driver") if callspec else None
+
 def _extract_browser_from_test(test_name):
-    """Extract browser name from parametrized test names like 'test_name[chrome]'"""
-    import re
-    match = re.search(r'\[([^\]]+)\]$', test_name)
-    if match:
-        return match.group(1).lower()
-    return None
+    """Extract the browser from parametrized test names like 'test_name[chrome]' or 'test_name[chrome-0]'"""
+    match = _BROWSER_PARAM.search(test_name)
+    return match.group(1).lower() if match else None
 
 def _clean_test_name(test_name):
-    """Remove browser parameter from test name for cleaner display"""
-    import re
-    return re.sub(r'\[([^\]]+)\]$', '', test_name)
\ No newline at end of file
+    """Remove the browser parameter from a test name for cleaner display ('test_name[chrome-0]' -> 'test_name[0]')"""
+    browser = _extract_browser_from_test(test_name)
+    if not browser:
+        return test_name
+    name, _, params = test_name.partition("[")
+    others = [param for param in params[:-1].split("-") if param.lower() != browser]
+    return f"{name}[{'-'.join(others)}]" if others else name
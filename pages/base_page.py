@@ -0,0 +1,272 @@
+import os
+import threading
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (ElementClickInterceptedException, ElementNotInteractableException,
+                                        InvalidElementStateException, JavascriptException,
+                                        NoSuchElementException, StaleElementReferenceException,
+                                        TimeoutException, UnknownMethodException, WebDriverException)
+from pages.routes import ready_locator, url_for
+from pages.tracing import traced
+
+# Resolves as soon as the condition holds: checked once up front, then on every
+# DOM mutation or history change, until the in-page timer gives up (null).
+_WAIT_SCRIPT = """
+var by = arguments[0], value = arguments[1], condition = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+
+var find = function () {
+    switch (by) {
+        case 'id': var el = document.getElementById(value); return el ? [el] : [];
+        case 'class name': return Array.prototype.slice.call(document.getElementsByClassName(value));
+        case 'name': return Array.prototype.slice.call(document.getElementsByName(value));
+        case 'tag name': return Array.prototype.slice.call(document.getElementsByTagName(value));
+        case 'css selector': return Array.prototype.slice.call(document.querySelectorAll(value));
+        case 'xpath':
+            var found = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < found.snapshotLength; i++) { nodes.push(found.snapshotItem(i)); }
+            return nodes;
+    }
+    return [];
+};
+var visible = function (el) {
+    var style = window.getComputedStyle(el);
+    return el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+};
+var check = function () {
+    var elements = find();
+    if (condition === 'all_present') { return elements.length ? elements : null; }
+    for (var i = 0; i < elements.length; i++) {
+        var el = elements[i];
+        if (condition === 'present') { return el; }
+        if (visible(el) && (condition === 'visible' || !el.disabled)) { return el; }
+    }
+    return null;
+};
+
+var initial = check();
+if (initial) { done(initial); return; }
+
+var finished = false, observer, timer;
+var onChange = function () {
+    var result = check();
+    if (result) { finish(result); }
+};
+var finish = function (result) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    window.removeEventListener('popstate', onChange);
+    window.removeEventListener('hashchange', onChange);
+    done(result);
+};
+observer = new MutationObserver(onChange);
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+window.addEventListener('popstate', onChange);
+window.addEventListener('hashchange', onChange);
+timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+_POLLING_CONDITIONS = {
+    'present': EC.presence_of_element_located,
+    'visible': EC.visibility_of_element_located,
+    'clickable': EC.element_to_be_clickable,
+    'all_present': EC.presence_of_all_elements_located
+}
+
+_SCRIPT_LOCATORS = {By.ID, By.CLASS_NAME, By.NAME, By.TAG_NAME, By.CSS_SELECTOR, By.XPATH}
+
+# Async scripts must be allowed to run at least as long as the longest wait
+_MIN_SCRIPT_TIMEOUT = 30
+
+# Errors that mean "not ready yet" rather than "broken"
+_RETRYABLE_ACTION_ERRORS = (NoSuchElementException, StaleElementReferenceException,
+                            ElementNotInteractableException, ElementClickInterceptedException,
+                            InvalidElementStateException)
+
+# Error messages from drivers that don't support or don't allow async scripts
+_UNSUPPORTED_SCRIPT_ERRORS = ("unknown command", "unsupported operation", "not implemented",
+                              "not supported", "javascript is disabled", "javascript disabled")
+
+# Wait-and-retry rounds after the immediate attempt fails
+ACTION_RETRIES = 3
+
+
+class ActionStats:
+    """How often page actions succeeded on the first try"""
+
+    def __init__(self):
+        self.fast_path = 0
+        self.retried = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def record(self, outcome):
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def summary(self):
+        total = self.fast_path + self.retried + self.failed
+        rate = self.fast_path / total * 100 if total else 0
+        return (f"Page actions: {self.fast_path}/{total} on the fast path ({rate:.0f}%), "
+                f"{self.retried} needed a wait, {self.failed} failed")
+
+
+@traced
+class BasePage:
+    """Shared plumbing for page objects"""
+
+    # Key into pages.routes.ROUTES for pages that can be opened by URL
+    route = None
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def open(self, wait_time=10, route=None):
+        """
+        Navigate straight to this page's URL
+
+        Args:
+            route (str, optional): Another route served by this page object
+                (e.g. 'checkout_overview' for CheckoutPage)
+
+        Returns:
+            bool: True once the page's ready element is present (a single wait)
+        """
+        route = route or self.route
+        self.driver.get(url_for(route))
+        try:
+            self.wait_for(ready_locator(route), wait_time)
+            return True
+        except TimeoutException:
+            return False
+
+    def wait_for(self, locator, wait_time=10, condition='present'):
+        """
+        Wait for an element with one round trip instead of polling every 500 ms
+
+        An async script watches the DOM with a MutationObserver and returns
+        the element as soon as the condition holds. Falls back to a polling
+        WebDriverWait if async scripts are unavailable, the locator type
+        can't be resolved in the page, or the page navigates mid-wait.
+
+        Args:
+            locator (tuple): (By, value), as used by find_element
+            wait_time (float): Seconds before giving up
+            condition (str): 'present', 'visible', 'clickable' or 'all_present'
+
+        Returns:
+            WebElement, or a list of WebElements for 'all_present'
+
+        Raises:
+            TimeoutException: If the condition didn't hold within wait_time
+        """
+        deadline = time.monotonic() + wait_time
+
+        if locator[0] in _SCRIPT_LOCATORS and _event_waits_enabled(self.driver):
+            try:
+                _ensure_script_timeout(self.driver, wait_time)
+                result = self.driver.execute_async_script(
+                    _WAIT_SCRIPT, locator[0], locator[1], condition, int(wait_time * 1000))
+            except JavascriptException:
+                # Page unloaded under the script; finish the wait by polling
+                result = None
+            except TimeoutException:
+                result = None
+            except WebDriverException as e:
+                # Only a driver that can't run async scripts at all gives them up for good;
+                # anything else (stale page, navigation, a slow script) polls this once
+                if _scripts_unsupported(e):
+                    self.driver._event_waits_unavailable = True
+                result = None
+            else:
+                if not result:
+                    raise TimeoutException(f"{locator[1]} not {condition} after {wait_time}s")
+                return result
+
+        remaining = max(deadline - time.monotonic(), 0)
+        return WebDriverWait(self.driver, remaining).until(_POLLING_CONDITIONS[condition](locator))
+
+    def click(self, locator, wait_time=10):
+        """Click right away; only wait for the element to be clickable if that fails"""
+        self._act(locator, wait_time, 'clickable', lambda element: element.click())
+
+    def type_text(self, locator, text, wait_time=10, clear=True):
+        """Type into a field right away; only wait for it to be visible if that fails"""
+        def enter(element):
+            if clear:
+                element.clear()
+            element.send_keys(text)
+        self._act(locator, wait_time, 'visible', enter)
+
+    def _act(self, locator, wait_time, condition, action):
+        """
+        Optimistic action: one find-and-act, then bounded wait-and-retry rounds
+
+        Raises:
+            The last error seen if the action never succeeded within wait_time
+        """
+        stats = get_action_stats()
+        try:
+            action(self.driver.find_element(*locator))
+            stats.record('fast_path')
+            return
+        except _RETRYABLE_ACTION_ERRORS as e:
+            error = e
+
+        deadline = time.monotonic() + wait_time
+        for _ in range(ACTION_RETRIES):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                action(self.wait_for(locator, remaining, condition))
+                stats.record('retried')
+                return
+            except TimeoutException as e:
+                error = e
+                break
+            except _RETRYABLE_ACTION_ERRORS as e:
+                error = e
+
+        stats.record('failed')
+        raise error
+
+
+_action_stats = None
+
+def get_action_stats():
+    """Process-wide action counters, logged at the end of the session"""
+    global _action_stats
+    if _action_stats is None:
+        _action_stats = ActionStats()
+    return _action_stats
+
+
+def _event_waits_enabled(driver):
+    if os.getenv('EVENT_DRIVEN_WAITS', 'true').lower() == 'false':
+        return False
+    return not getattr(driver, '_event_waits_unavailable', False)
+
+
+def _scripts_unsupported(error):
+    """Whether a failed execute_async_script means the driver will never run one"""
+    if isinstance(error, UnknownMethodException):
+        return True
+    message = (error.msg or "").lower()
+    return any(text in message for text in _UNSUPPORTED_SCRIPT_ERRORS)
+
+
+def _ensure_script_timeout(driver, wait_time):
+    """Raise the driver's async script timeout once, if this wait needs longer"""
+    needed = wait_time + 5
+    if getattr(driver, '_event_wait_script_timeout', 0) >= needed:
+        return
+    timeout = max(needed, _MIN_SCRIPT_TIMEOUT)
+    driver.set_script_timeout(timeout)
+    driver._event_wait_script_timeout = timeout
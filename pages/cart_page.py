@@ -1,18 +1,19 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from pages.base_page import BasePage
+from pages.tracing import traced
+
+@traced
+class CartPage(BasePage):
+    route = "cart"
 
-class CartPage:
     def __init__(self, driver):
-        self.driver = driver
+        super().__init__(driver)
         self.cart_item = (By.CLASS_NAME, "cart_item")
         self.checkout_button = (By.ID, "checkout")
         self.continue_shopping_button = (By.ID, "continue-shopping")
 
     def wait_for_cart_items(self, wait_time=10):
-        WebDriverWait(self.driver, wait_time).until(
-            EC.presence_of_all_elements_located(self.cart_item)
-        )
+        self.wait_for(self.cart_item, wait_time, 'all_present')
 
     def get_cart_items(self):
         return self.driver.find_elements(*self.cart_item)
@@ -22,11 +23,7 @@ class CartPage:
         return len(self.get_cart_items())
     
     def click_checkout(self):
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable(self.checkout_button)
-        ).click()
+        self.click(self.checkout_button)
 
     def click_continue_shopping(self):
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable(self.continue_shopping_button)
-        ).click()
\ No newline at end of file
+        self.click(self.continue_shopping_button)
\ No newline at end of file
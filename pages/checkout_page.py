@@ -1,11 +1,68 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from decimal import Decimal, InvalidOperation
+import re
+from pages.base_page import BasePage
+from pages.tracing import traced
+
+# Sets each field through the native value setter and fires input/change, so the
+# app's controlled inputs and validation see the values as if they were typed
+_FILL_FORM_SCRIPT = """
+var values = arguments[0];
+var setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+var missing = [];
+Object.keys(values).forEach(function (id) {
+    var input = document.getElementById(id);
+    if (!input) { missing.push(id); return; }
+    input.focus();
+    setter.call(input, values[id]);
+    input.dispatchEvent(new Event('input', {bubbles: true}));
+    input.dispatchEvent(new Event('change', {bubbles: true}));
+    input.blur();
+});
+return missing;
+"""
+
+_OVERVIEW_SCRIPT = """
+var text = function (selector, root) {
+    var el = (root || document).querySelector(selector);
+    return el ? el.textContent.trim() : null;
+};
+var items = Array.prototype.map.call(document.querySelectorAll('.cart_item'), function (item) {
+    return {
+        name: text('.inventory_item_name', item),
+        quantity: text('.cart_quantity', item),
+        price: text('.inventory_item_price', item)
+    };
+});
+return {
+    subtotal: text('.summary_subtotal_label'),
+    tax: text('.summary_tax_label'),
+    total: text('.summary_total_label'),
+    items: items
+};
+"""
+
+_AMOUNT = re.compile(r"\$\s*([\d,]+(?:\.\d+)?)")
+
+
+def parse_amount(text):
+    """Exact amount from text like 'Item total: $29.99' (Decimal('0') if there is none)"""
+    match = _AMOUNT.search(text or "")
+    if not match:
+        return Decimal("0")
+    try:
+        return Decimal(match.group(1).replace(",", ""))
+    except InvalidOperation:
+        return Decimal("0")
+
+
+@traced
+class CheckoutPage(BasePage):
+    route = "checkout_info"
 
-class CheckoutPage:
     def __init__(self, driver):
-        self.driver = driver
+        super().__init__(driver)
         
         # Checkout Information
         self.first_name_input = (By.ID, "first-name")
@@ -13,6 +70,7 @@ class CheckoutPage:
         self.postal_code_input = (By.ID, "postal-code")
         self.continue_button = (By.ID, "continue")
         self.error_container = (By.CLASS_NAME, "error-message-container")
+        self.error_message = (By.CSS_SELECTOR, "h3[data-test='error']")
         
         # Checkout Overview
         self.item_total = (By.CLASS_NAME, "summary_subtotal_label")
@@ -29,97 +87,116 @@ class CheckoutPage:
     def wait_for_checkout_info_page(self, wait_time=10):
         """Wait for the checkout information form to load"""
         try:
-            WebDriverWait(self.driver, wait_time).until(
-                EC.presence_of_element_located(self.first_name_input)
-            )
+            self.wait_for(self.first_name_input, wait_time)
             return True
         except TimeoutException:
             return False
 
-    def fill_checkout_information(self, first_name, last_name, postal_code):
-        """Fill out the checkout information form"""
-        self.driver.find_element(*self.first_name_input).clear()
-        self.driver.find_element(*self.first_name_input).send_keys(first_name)
-        
-        self.driver.find_element(*self.last_name_input).clear()
-        self.driver.find_element(*self.last_name_input).send_keys(last_name)
-        
-        self.driver.find_element(*self.postal_code_input).clear()
-        self.driver.find_element(*self.postal_code_input).send_keys(postal_code)
+    def fill_checkout_information(self, first_name, last_name, postal_code, batched=True):
+        """
+        Fill out the checkout information form
+
+        Args:
+            batched (bool): Set all fields in one script call (firing the input
+                events validation relies on). False types into each field.
+        """
+        if batched:
+            missing = self.driver.execute_script(_FILL_FORM_SCRIPT, {
+                self.first_name_input[1]: first_name,
+                self.last_name_input[1]: last_name,
+                self.postal_code_input[1]: postal_code
+            })
+            if missing:
+                raise NoSuchElementException(f"Checkout form field(s) not found: {', '.join(missing)}")
+            return
+
+        self.type_text(self.first_name_input, first_name)
+        self.type_text(self.last_name_input, last_name)
+        self.type_text(self.postal_code_input, postal_code)
 
     def click_continue(self):
         """Click the continue button to proceed to overview"""
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable(self.continue_button)
-        ).click()
+        self.click(self.continue_button)
+
+    def get_error_message(self, wait_time=5):
+        """
+        Get error message if form validation fails
 
-    def get_error_message(self):
-        """Get error message if form validation fails"""
+        Waits for whichever comes first, the validation error or the overview
+        page, so a successful submit doesn't sit out the whole wait.
+
+        Returns:
+            str or None: The error text, or None once the overview loaded (or
+            neither showed up within wait_time)
+        """
+        outcome = (By.CSS_SELECTOR, f"{self.error_message[1]}, .{self.item_total[1]}")
         try:
-            error_element = WebDriverWait(self.driver, 5).until(
-                EC.presence_of_element_located(self.error_container)
-            )
-            return error_element.text.strip()
+            element = self.wait_for(outcome, wait_time)
         except TimeoutException:
             return None
+        if element.get_attribute("data-test") != "error":
+            return None
+        return element.text.strip()
 
     def wait_for_checkout_overview(self, wait_time=10):
         """Wait for the checkout overview page to load"""
         try:
-            WebDriverWait(self.driver, wait_time).until(
-                EC.presence_of_element_located(self.item_total)
-            )
+            self.wait_for(self.item_total, wait_time)
             return True
         except TimeoutException:
             return False
 
+    def get_overview_summary(self):
+        """
+        Read every overview value in one script call
+
+        Returns:
+            dict: {
+                'subtotal': Decimal,
+                'tax': Decimal,
+                'total': Decimal,
+                'items': list of {'name': str, 'quantity': int, 'price': Decimal},
+                'items_count': int
+            }
+        """
+        data = self.driver.execute_script(_OVERVIEW_SCRIPT)
+        items = [{
+            'name': item['name'] or "",
+            'quantity': int(item['quantity']) if (item['quantity'] or "").isdigit() else 1,
+            'price': parse_amount(item['price'])
+        } for item in data['items']]
+        return {
+            'subtotal': parse_amount(data['subtotal']),
+            'tax': parse_amount(data['tax']),
+            'total': parse_amount(data['total']),
+            'items': items,
+            'items_count': len(items)
+        }
+
     def get_item_total(self):
-        """Get the subtotal amount from overview page"""
-        try:
-            total_text = self.driver.find_element(*self.item_total).text
-            # Extract number from "Item total: $29.99" format
-            return float(total_text.split('$')[1])
-        except (ValueError, IndexError):
-            return 0.0
+        """Get the subtotal amount from overview page as a Decimal"""
+        return parse_amount(self.driver.find_element(*self.item_total).text)
 
     def get_tax_amount(self):
-        """Get the tax amount from overview page"""
-        try:
-            tax_text = self.driver.find_element(*self.tax_total).text
-            # Extract number from "Tax: $2.40" format
-            return float(tax_text.split('$')[1])
-        except (ValueError, IndexError):
-            return 0.0
+        """Get the tax amount from overview page as a Decimal"""
+        return parse_amount(self.driver.find_element(*self.tax_total).text)
 
     def get_total_price(self):
-        """Get the final total price from overview page"""
-        try:
-            total_text = self.driver.find_element(*self.total_price).text
-            # Extract number from "Total: $32.39" format
-            return float(total_text.split('$')[1])
-        except (ValueError, IndexError):
-            return 0.0
+        """Get the final total price from overview page as a Decimal"""
+        return parse_amount(self.driver.find_element(*self.total_price).text)
 
     def get_overview_items_count(self):
         """Get the number of items in the checkout overview"""
-        try:
-            items = self.driver.find_elements(*self.cart_items_overview)
-            return len(items)
-        except:
-            return 0
+        return len(self.driver.find_elements(*self.cart_items_overview))
 
     def click_finish(self):
         """Click the finish button to complete the purchase"""
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable(self.finish_button)
-        ).click()
+        self.click(self.finish_button)
 
     def wait_for_checkout_complete(self, wait_time=10):
         """Wait for the checkout complete page to load"""
         try:
-            WebDriverWait(self.driver, wait_time).until(
-                EC.presence_of_element_located(self.complete_header)
-            )
+            self.wait_for(self.complete_header, wait_time)
             return True
         except TimeoutException:
             return False
@@ -140,9 +217,7 @@ class CheckoutPage:
 
     def click_back_home(self):
         """Click back to products button to return to inventory"""
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable(self.back_home_button)
-        ).click()
+        self.click(self.back_home_button)
 
     def is_on_checkout_info_page(self):
         """Check if currently on checkout information page"""
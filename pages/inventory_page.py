@@ -1,49 +1,191 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from pages.base_page import BasePage
+from pages.tracing import traced
 
-class InventoryPage:    
-    def __init__(self, driver):        
-        self.driver = driver            
-        self.cart_badge = (By.CLASS_NAME, "shopping_cart_badge")        
-        self.cart_link = (By.CLASS_NAME, "shopping_cart_link")    
+# Reads every inventory item in one call. A MutationObserver on the list bumps a
+# version counter, so a caller holding a stamp only gets fresh data if the DOM changed.
+_CATALOG_SCRIPT = """
+var list = document.querySelector('.inventory_list');
+if (!list) { return null; }
+var state = window.__inventoryCatalog;
+if (!state || state.list !== list) {
+    state = window.__inventoryCatalog = {list: list, version: 0, token: Date.now() + '-' + Math.random()};
+    new MutationObserver(function () { state.version++; }).observe(
+        list, {subtree: true, childList: true, attributes: true, characterData: true});
+}
+var stamp = state.token + ':' + state.version;
+if (arguments[0] === stamp) { return {unchanged: true}; }
+
+var text = function (root, selector) {
+    var el = root.querySelector(selector);
+    return el ? el.textContent.trim() : '';
+};
+var items = [];
+list.querySelectorAll('.inventory_item').forEach(function (item, index) {
+    var title = item.querySelector('[id$="_title_link"]');
+    var button = item.querySelector('button');
+    var buttonId = button ? button.id : '';
+    items.push({
+        index: index,
+        product_id: title ? parseInt(title.id.split('_')[1], 10) : null,
+        name: text(item, '.inventory_item_name'),
+        price: text(item, '.inventory_item_price'),
+        description: text(item, '.inventory_item_desc'),
+        button_id: buttonId,
+        in_cart: buttonId.indexOf('remove') === 0
+    });
+});
+return {stamp: stamp, items: items};
+"""
+
+# Resolves every fragment and clicks its "Add to cart" button in one command. A
+# fragment whose item is already in the cart, or was resolved earlier in the batch
+# ("bike" and "light" are the same product), is a duplicate and is not clicked. The
+# badge is read on the next tick so the app has re-rendered after the clicks.
+_ADD_ITEMS_SCRIPT = """
+var fragments = arguments[0];
+var done = arguments[arguments.length - 1];
+var items = Array.prototype.slice.call(document.querySelectorAll('.inventory_item'));
+var seen = {};
+var results = fragments.map(function (fragment) {
+    var needle = fragment.toLowerCase();
+    var item = items.find(function (candidate) {
+        var name = candidate.querySelector('.inventory_item_name');
+        return name && name.textContent.toLowerCase().indexOf(needle) !== -1;
+    });
+    var button = item ? item.querySelector('button') : null;
+    if (!button) {
+        return {fragment: fragment, name: null, added: false, duplicate: false};
+    }
+    var name = item.querySelector('.inventory_item_name').textContent.trim();
+    if (seen[name] || button.id.indexOf('add-to-cart') !== 0) {
+        seen[name] = true;
+        return {fragment: fragment, name: name, added: false, duplicate: true};
+    }
+    seen[name] = true;
+    button.click();
+    return {fragment: fragment, name: name, added: true, duplicate: false};
+});
+setTimeout(function () {
+    var badge = document.querySelector('.shopping_cart_badge');
+    done({results: results, cart_count: badge ? parseInt(badge.textContent, 10) || 0 : 0});
+}, 0);
+"""
+
+
+class CatalogSnapshot:
+    """Inventory items read in a single round trip, indexed by name"""
+
+    def __init__(self, stamp, items):
+        self.stamp = stamp
+        self.items = items
+        self._by_name = {item['name'].lower(): item for item in items}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def first(self):
+        return self.items[0] if self.items else None
+
+    def get(self, name):
+        """Item with exactly this name (case-insensitive), or None"""
+        return self._by_name.get(name.lower())
+
+    def find(self, name_fragment):
+        """First item whose name contains the fragment (case-insensitive), or None"""
+        fragment = name_fragment.lower()
+        for item in self.items:
+            if fragment in item['name'].lower():
+                return item
+        return None
+
+
+@traced
+class InventoryPage(BasePage):
+    route = "inventory"
+
+    def __init__(self, driver):
+        super().__init__(driver)
+        self.cart_badge = (By.CLASS_NAME, "shopping_cart_badge")
+        self.cart_link = (By.CLASS_NAME, "shopping_cart_link")
         self.inventory_container = (By.CLASS_NAME, "inventory_list")
         self.inventory_items = (By.CLASS_NAME, "inventory_item")
         self.cart_icon = (By.CLASS_NAME, "shopping_cart_link")
+        self._catalog = None
 
     def wait_for_inventory(self, wait_time=10):
         try:
-            WebDriverWait(self.driver, wait_time).until(
-                EC.presence_of_element_located(self.inventory_container)
-            )
+            self.wait_for(self.inventory_container, wait_time)
         except TimeoutException:
             raise Exception("Inventory did not load.")
 
     def get_inventory_items(self):
         return self.driver.find_elements(*self.inventory_items)
 
+    def get_catalog(self, refresh=False):
+        """
+        Snapshot of every inventory item (name, price, description, button id, in-cart state)
+
+        The cached snapshot is reused until the inventory DOM changes, which
+        is detected in the same script call that would fetch it.
+
+        Args:
+            refresh (bool): Ignore the cached snapshot and read the page again
+
+        Returns:
+            CatalogSnapshot: Empty if the inventory list is not on the page
+        """
+        stamp = None if refresh or self._catalog is None else self._catalog.stamp
+        data = self.driver.execute_script(_CATALOG_SCRIPT, stamp)
+        if data is None:
+            self._catalog = None
+            return CatalogSnapshot(None, [])
+        if not data.get('unchanged'):
+            self._catalog = CatalogSnapshot(data['stamp'], data['items'])
+        return self._catalog
+
     def get_first_item_name(self):
-        items = self.get_inventory_items()
-        return items[0].find_element(By.CLASS_NAME, "inventory_item_name").text if items else ""
+        first = self.get_catalog().first()
+        return first['name'] if first else ""
 
     def get_first_item_price(self):
-        items = self.get_inventory_items()
-        return items[0].find_element(By.CLASS_NAME, "inventory_item_price").text if items else ""
+        first = self.get_catalog().first()
+        return first['price'] if first else ""
 
     def add_first_item_to_cart(self):
-        items = self.get_inventory_items()
-        if items:
-            items[0].find_element(By.TAG_NAME, "button").click()
+        first = self.get_catalog().first()
+        if first:
+            self.driver.find_element(By.ID, first['button_id']).click()
 
     def add_item_to_cart_by_name(self, name_fragment):
-        items = self.get_inventory_items()
-        for item in items:
-            name = item.find_element(By.CLASS_NAME, "inventory_item_name").text
-            if name_fragment.lower() in name.lower():
-                item.find_element(By.TAG_NAME, "button").click()
-                return True
-        return False
+        item = self.get_catalog().find(name_fragment)
+        if item is None:
+            return False
+        self.driver.find_element(By.ID, item['button_id']).click()
+        return True
+
+    def add_items_to_cart(self, name_fragments):
+        """
+        Add several items in a single browser command
+
+        Items already in the cart, or already resolved by an earlier fragment,
+        are left alone (their "Remove" button is not clicked) and reported as
+        duplicates rather than added.
+
+        Args:
+            name_fragments (list): Item name fragments, matched case-insensitively
+
+        Returns:
+            dict: {
+                'results': list of {'fragment', 'name', 'added', 'duplicate'},
+                'cart_count': int
+            }
+        """
+        return self.driver.execute_async_script(_ADD_ITEMS_SCRIPT, list(name_fragments))
 
     def get_cart_count(self):
         try:
@@ -52,4 +194,4 @@ class InventoryPage:
             return "0"
 
     def go_to_cart(self):
-        self.driver.find_element(*self.cart_icon).click()
\ No newline at end of file
+        self.click(self.cart_icon)
@@ -1,16 +1,22 @@
 from selenium.webdriver.common.by import By
+from pages.base_page import BasePage
+from pages.tracing import traced
+from pages.routes import url_for
+
+@traced
+class LoginPage(BasePage):
+    route = "login"
 
-class LoginPage:
     def __init__(self, driver):
-        self.driver = driver
+        super().__init__(driver)
         self.username_input = (By.ID, "user-name")
         self.password_input = (By.ID, "password")
         self.login_button = (By.ID, "login-button")
 
     def load(self):
-        self.driver.get("https://www.saucedemo.com/")
+        self.driver.get(url_for(self.route))
 
     def login(self, username, password):
-        self.driver.find_element(*self.username_input).send_keys(username)
-        self.driver.find_element(*self.password_input).send_keys(password)
-        self.driver.find_element(*self.login_button).click()
\ No newline at end of file
+        self.type_text(self.username_input, username, clear=False)
+        self.type_text(self.password_input, password, clear=False)
+        self.click(self.login_button)
@@ -0,0 +1,42 @@
+import os
+from urllib.parse import urljoin
+
+from selenium.webdriver.common.by import By
+
+BASE_URL = os.getenv("SAUCEDEMO_BASE_URL", "https://www.saucedemo.com/").rstrip("/") + "/"
+
+# Route name -> (path relative to BASE_URL, element that exists once the page has rendered)
+ROUTES = {
+    'login': ("", (By.ID, "login-button")),
+    'inventory': ("inventory.html", (By.CLASS_NAME, "inventory_list")),
+    'cart': ("cart.html", (By.ID, "checkout")),
+    'checkout_info': ("checkout-step-one.html", (By.ID, "first-name")),
+    'checkout_overview': ("checkout-step-two.html", (By.ID, "finish")),
+    'checkout_complete': ("checkout-complete.html", (By.ID, "back-to-products"))
+}
+
+
+def set_base_url(url):
+    """Point every page object at another storefront (e.g. a local stand-in)"""
+    global BASE_URL
+    BASE_URL = url.rstrip("/") + "/"
+
+
+def url_for(route):
+    return urljoin(BASE_URL, ROUTES[route][0])
+
+
+def ready_locator(route):
+    return ROUTES[route][1]
+
+
+def direct_navigation_enabled(driver):
+    """
+    Whether helpers may jump straight to a page's URL instead of clicking through the UI
+
+    Off when DIRECT_NAVIGATION=false, or for a driver flagged with
+    `ui_navigation` (set by the fixture for tests marked ui_navigation).
+    """
+    if os.getenv('DIRECT_NAVIGATION', 'true').lower() == 'false':
+        return False
+    return not getattr(driver, 'ui_navigation', False)
@@ -0,0 +1,92 @@
+import contextvars
+import functools
+import inspect
+import os
+import time
+
+# Spans kept per test; later ones are only counted
+MAX_SPANS = 2000
+
+_active_trace = contextvars.ContextVar("page_trace", default=None)
+
+
+class Trace:
+    """
+    Nested timing spans of page-object and helper calls for one test
+
+    Spans are stored compactly as [name, start, duration, depth, error]
+    (seconds relative to the start of the trace), in the order the calls
+    started, so a parent always comes right before its children.
+    """
+
+    def __init__(self, max_spans=MAX_SPANS):
+        self.max_spans = max_spans
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.spans = []
+        self.dropped = 0
+        self._depth = 0
+
+    def run(self, name, func, *args, **kwargs):
+        """Call func inside a span called `name`"""
+        if len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return func(*args, **kwargs)
+
+        span = [name, time.perf_counter() - self._started, None, self._depth, None]
+        self.spans.append(span)
+        self._depth += 1
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            span[4] = type(e).__name__
+            raise
+        finally:
+            self._depth -= 1
+            span[2] = time.perf_counter() - self._started - span[1]
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: {'started_at': epoch seconds, 'spans': [[name, start, duration, depth, error], ...],
+                   'dropped': int}
+        """
+        spans = [[name, round(start, 4), round(duration if duration is not None else 0, 4), depth, error]
+                 for name, start, duration, depth, error in self.spans]
+        return {'started_at': self.started_at, 'spans': spans, 'dropped': self.dropped}
+
+
+def page_tracing_enabled():
+    return os.getenv('PAGE_TRACE', 'true').lower() != 'false'
+
+
+def start_trace():
+    """Record spans from calls in this context into a new Trace (None if PAGE_TRACE=false)"""
+    trace = Trace() if page_tracing_enabled() else None
+    _active_trace.set(trace)
+    return trace
+
+
+def traced(cls):
+    """
+    Class decorator: every public method defined on the class becomes a span
+
+    Spans are named after the instance's class (`CheckoutPage.click` for an
+    inherited BasePage method) and only recorded while a trace is active,
+    i.e. during a test.
+    """
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.isfunction(value):
+            continue
+        setattr(cls, attr, _span_method(value))
+    return cls
+
+
+def _span_method(func):
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        trace = _active_trace.get()
+        if trace is None:
+            return func(self, *args, **kwargs)
+        return trace.run(f"{type(self).__name__}.{func.__name__}", func, self, *args, **kwargs)
+    return wrapper
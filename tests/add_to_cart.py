@@ -2,6 +2,7 @@ import logging
 from pages.inventory_page import InventoryPage
 from pages.cart_page import CartPage
 from tests.login import login
+from utils.drivers import release_driver
 import time
 
 # Initialize logger
@@ -14,7 +15,7 @@ def test_add_items_to_cart():
     items = ["shirt","car","backpack"]
     add_items_to_cart(driver, items)
 
-    driver.quit()
+    release_driver(driver)
 
 
 def add_specific_item_to_cart(driver, item_to_add, num_cart_items=0):
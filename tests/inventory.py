@@ -1,5 +1,5 @@
 from pages.login_page import LoginPage
-from utils.drivers import create_driver
+from utils.drivers import create_driver, release_driver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -39,4 +39,4 @@ def test_inventory_page_load():
     assert "$" in first_item_price, "First item price should include a dollar sign"
     logger.info("All inventory checks passed !!!")
 
-    driver.quit()
\ No newline at end of file
+    release_driver(driver)
\ No newline at end of file
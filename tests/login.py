@@ -1,16 +1,27 @@
 import json
 from pages.login_page import LoginPage
+from utils.auth_cache import auth_cache_enabled, get_auth_cache
 from utils.drivers import create_driver
 
-def login(browser="chrome",headless=True):
-    """ Updated login function to upport cross-browser testing """
+def login(browser="chrome",headless=True, driver=None, use_session_cache=True):
+    """ Updated login function to upport cross-browser testing
+
+    Pass an existing driver (e.g. from the driver pool) to log in without
+    launching a new browser. After the first UI login per user and browser,
+    the captured session is injected instead; pass use_session_cache=False
+    (or mark the test with @pytest.mark.ui_login) to always use the login form.
+    """
     
     with open("data/login_data.json") as f:
         creds = json.load(f)["users"][0]
 
-    driver = create_driver(browser, headless)
-    login_page = LoginPage(driver)
-    login_page.load()
-    login_page.login(creds["username"], creds["password"])
+    if driver is None:
+        driver = create_driver(browser, headless)
+    if use_session_cache and auth_cache_enabled():
+        get_auth_cache().login(driver, browser, creds["username"], creds["password"])
+    else:
+        login_page = LoginPage(driver)
+        login_page.load()
+        login_page.login(creds["username"], creds["password"])
     assert "inventory" in driver.current_url
     return driver
@@ -1,12 +1,13 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from pages.login_page import LoginPage
+from utils.driver_resolver import get_driver_resolver
+from utils.drivers import release_driver
 
 def test_login_success():
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+    driver = webdriver.Chrome(service=Service(get_driver_resolver().resolve("chrome")))
     login_page = LoginPage(driver)
     login_page.load()
     login_page.login("standard_user", "secret_sauce")
     assert "inventory" in driver.current_url
-    driver.quit()
\ No newline at end of file
+    release_driver(driver)
\ No newline at end of file
@@ -5,8 +5,9 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from pages.login_page import LoginPage
+from utils.driver_resolver import get_driver_resolver
+from utils.drivers import release_driver
 
 def create_driver(headless=True):
     chrome_options = Options()
@@ -15,7 +16,7 @@ def create_driver(headless=True):
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--window-size=1920,1080")
 
-    service = Service(ChromeDriverManager().install())
+    service = Service(get_driver_resolver().resolve("chrome"))
     driver = webdriver.Chrome(service=service, options=chrome_options)
     return driver
 
@@ -42,4 +43,4 @@ def test_login_multiple_users(username, password):
         logging.error(f"[FAIL] Login failed for user: {username} | Error: {error_text}")
         assert False, f"Login failed for {username} – {error_text}"
 
-    driver.quit()
\ No newline at end of file
+    release_driver(driver)
\ No newline at end of file
@@ -0,0 +1,55 @@
+import pytest
+
+from utils.latency_stats import RESERVOIR_SIZE, LatencyRecorder, Reservoir, histogram, percentile
+
+
+class TestLatencyStats:
+    """Percentiles, histograms and bounded samples"""
+
+    def test_percentile_interpolates_between_values(self):
+        values = [4, 1, 3, 2]
+
+        assert percentile(values, 0) == 1
+        assert percentile(values, 50) == 2.5
+        assert percentile(values, 100) == 4
+        assert percentile(values, 95) == pytest.approx(3.85)
+
+    def test_percentile_of_nothing_is_none(self):
+        assert percentile([], 95) is None
+
+    def test_histogram_counts_each_value_once(self):
+        counts = dict(histogram([0.1, 0.5, 0.6, 40], buckets=(0.5, 1)))
+
+        assert counts == {'<=0.5s': 2, '<=1s': 1, '>1s': 1}
+
+    def test_reservoir_is_exact_until_full(self):
+        reservoir = Reservoir(size=10)
+        for value in range(10):
+            reservoir.add(value)
+
+        assert sorted(reservoir) == list(range(10))
+        assert percentile(reservoir, 50) == 4.5
+
+    def test_reservoir_memory_is_bounded(self):
+        reservoir = Reservoir(size=50)
+        for value in range(10000):
+            reservoir.add(value)
+
+        assert len(reservoir) == 50
+        assert reservoir.count == 10000
+        assert reservoir.max == 9999
+        assert set(reservoir) <= set(range(10000))
+
+    def test_recorder_keeps_a_bounded_sample_but_exact_totals(self):
+        recorder = LatencyRecorder()
+        for value in range(RESERVOIR_SIZE * 3):
+            recorder.record("checkout", value)
+        recorder.record("checkout", 0, ok=False)
+
+        summary = recorder.summary("checkout", elapsed=10)
+
+        assert len(recorder.durations("checkout")) == RESERVOIR_SIZE
+        assert summary['completed'] == RESERVOIR_SIZE * 3
+        assert summary['errors'] == 1
+        assert summary['mean'] == pytest.approx((RESERVOIR_SIZE * 3 - 1) / 2)
+        assert summary['max'] == RESERVOIR_SIZE * 3 - 1
@@ -0,0 +1,69 @@
+import json
+
+from utils import performance_budgets
+from utils.html_reporter import HTMLReportGenerator
+from utils.performance_budgets import PerformanceBudgets, apply_suite_budgets, format_check
+
+
+def make_budgets(tmp_path, monkeypatch, config):
+    """PerformanceBudgets read from a temporary file, ignoring PERFORMANCE_BUDGETS"""
+    monkeypatch.delenv("PERFORMANCE_BUDGETS", raising=False)
+    path = tmp_path / "performance_budgets.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return PerformanceBudgets(path=str(path))
+
+
+class TestPerformanceBudgets:
+    """Per-test and session-wide budget checks"""
+
+    def test_marker_budgets_override_the_file(self, tmp_path, monkeypatch):
+        budgets = make_budgets(tmp_path, monkeypatch, {"tests": {"test_x": {"commands": 5, "duration": 10}}})
+        metrics = {'commands': {'count': 8, 'duration': 1.0}}
+
+        checks = budgets.check_test("test_x", metrics, 12.0, {"commands": 10})
+
+        assert [(check['metric'], check['exceeded']) for check in checks] == [
+            ("commands", False), ("duration (setup + call)", True)]
+
+    def test_step_budgets_are_checked_on_every_run(self, tmp_path, monkeypatch):
+        budgets = make_budgets(tmp_path, monkeypatch, {"steps": {"overview": {"max": 2, "commands": 10}}})
+        metrics = {'steps': [{'step': 'overview', 'duration': 2.5, 'commands': 4},
+                             {'step': 'finish', 'duration': 9.0, 'commands': 40}]}
+
+        checks = budgets.check_test("test_x", metrics, 3.0)
+
+        assert [format_check(check) for check in checks] == [
+            "step overview max: 2.500 > 2", "step overview commands: 4 <= 10"]
+
+    def test_unknown_test_budget_is_ignored(self, tmp_path, monkeypatch):
+        budgets = make_budgets(tmp_path, monkeypatch, {"tests": {"test_x": {"clicks": 1}}})
+
+        assert budgets.check_test("test_x", {}, 1.0) == []
+
+    def test_suite_percentiles(self, tmp_path, monkeypatch):
+        budgets = make_budgets(tmp_path, monkeypatch, {"steps": {"info": {"p50": 1.0, "p95": 1.0}, "finish": {"p95": 1}}})
+
+        checks = budgets.check_suite({'info': [0.5, 0.6, 0.7, 3.0]})
+
+        assert [(check['metric'], check['exceeded']) for check in checks] == [("p50", False), ("p95", True)]
+
+    def test_exceeded_suite_budget_fails_the_session_in_fail_mode(self, tmp_path, monkeypatch):
+        budgets = make_budgets(tmp_path, monkeypatch, {"mode": "fail", "steps": {"info": {"p95": 1.0}}})
+        monkeypatch.setattr(performance_budgets, "_budgets", budgets)
+        reporter = HTMLReportGenerator()
+        reporter.add_test_result("test_x", "passed", 5.0, metrics={
+            'steps': [{'step': 'info', 'status': 'passed', 'duration': 2.0, 'attempts': 1, 'commands': 3}]})
+
+        assert apply_suite_budgets(reporter, 0) == 1
+        assert reporter.budget_mode == "fail"
+
+    def test_warn_mode_keeps_the_exit_status(self, tmp_path, monkeypatch):
+        budgets = make_budgets(tmp_path, monkeypatch, {"mode": "warn", "steps": {"info": {"p95": 1.0}}})
+        monkeypatch.setattr(performance_budgets, "_budgets", budgets)
+
+        assert apply_suite_budgets(HTMLReportGenerator(), 0) == 0
+
+    def test_unknown_mode_falls_back_to_warn(self, tmp_path, monkeypatch):
+        budgets = make_budgets(tmp_path, monkeypatch, {"mode": "strict"})
+
+        assert budgets.mode == "warn"
@@ -0,0 +1,58 @@
+import random
+
+from utils.test_scheduler import DurationStore, records_duration, schedule_longest_first
+
+
+def make_store(tmp_path, durations):
+    """DurationStore backed by a temporary file, seeded with nodeid -> seconds"""
+    store = DurationStore(path=str(tmp_path / "test_durations.json"))
+    store.record_many(durations)
+    return store
+
+
+def nodeids_for(count):
+    return [f"tests/e2e_checkout.py::TestE2ECheckoutFlow::test_{index:02d}[chrome]" for index in range(count)]
+
+
+class TestScheduleLongestFirst:
+    """LPT assignment of tests to workers"""
+
+    def test_slowest_test_goes_to_least_loaded_worker(self, tmp_path):
+        store = make_store(tmp_path, {"a": 10, "b": 8, "c": 6, "d": 4, "e": 2})
+
+        assignments, loads = schedule_longest_first(["e", "d", "c", "b", "a"], 2, store)
+
+        assert assignments == [["a", "d", "e"], ["b", "c"]]
+        assert loads == [16, 14]
+
+    def test_ties_are_broken_by_nodeid_not_input_order(self, tmp_path):
+        nodeids = nodeids_for(12)
+        store = make_store(tmp_path, {nodeid: 5 for nodeid in nodeids})
+        shuffled = list(nodeids)
+        random.Random(1).shuffle(shuffled)
+
+        assert schedule_longest_first(nodeids, 3, store) == schedule_longest_first(shuffled, 3, store)
+
+    def test_more_workers_than_tests_leaves_workers_idle(self, tmp_path):
+        store = make_store(tmp_path, {"a": 3})
+
+        assignments, loads = schedule_longest_first(["a"], 3, store)
+
+        assert assignments == [["a"], [], []]
+        assert loads == [3, 0.0, 0.0]
+
+    def test_unknown_test_is_estimated_from_other_browsers(self, tmp_path):
+        store = make_store(tmp_path, {"t.py::test_x[chrome]": 4, "t.py::test_x[edge]": 4})
+
+        assert store.estimate("t.py::test_x[firefox]") == 4
+
+
+class TestRecordsDuration:
+    """Which results are folded into the duration history"""
+
+    def test_browser_test_that_ran_is_recorded(self):
+        assert records_duration("t.py::test_x[firefox]", "FAILED")
+
+    def test_skipped_and_unit_tests_are_not_recorded(self):
+        assert not records_duration("t.py::test_x[chrome]", "SKIPPED")
+        assert not records_duration("tests/unit/test_shards.py::test_plan", "PASSED")
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from utils.shards import load_plan_shard, plan_shard, plan_shards, write_plan
+from utils.test_scheduler import DurationStore
+
+
+def make_store(tmp_path, durations):
+    """DurationStore backed by a temporary file, seeded with nodeid -> seconds"""
+    store = DurationStore(path=str(tmp_path / "test_durations.json"))
+    store.record_many(durations)
+    return store
+
+
+def nodeids_for(count):
+    return [f"tests/e2e_checkout.py::TestE2ECheckoutFlow::test_{index:02d}[chrome]" for index in range(count)]
+
+
+class TestShardPlan:
+    """Splitting the suite across CI machines"""
+
+    def test_shards_are_a_disjoint_complete_partition(self, tmp_path):
+        nodeids = nodeids_for(25)
+        store = make_store(tmp_path, {nodeid: index % 7 + 1 for index, nodeid in enumerate(nodeids)})
+
+        shards = [shard_nodeids for shard_nodeids, _ in plan_shards(nodeids, 3, store)]
+        planned = [nodeid for shard_nodeids in shards for nodeid in shard_nodeids]
+
+        assert len(planned) == len(set(planned))
+        assert set(planned) == set(nodeids)
+
+    def test_same_input_gives_same_plan(self, tmp_path):
+        nodeids = nodeids_for(25)
+        store = make_store(tmp_path, {nodeid: index % 5 + 1 for index, nodeid in enumerate(nodeids)})
+        reordered = list(reversed(nodeids)) + nodeids[:3]
+
+        for index in range(3):
+            assert plan_shard(nodeids, 3, index, store) == plan_shard(reordered, 3, index, store)
+
+    def test_shard_index_out_of_range(self, tmp_path):
+        with pytest.raises(ValueError):
+            plan_shard(nodeids_for(3), 3, 3, make_store(tmp_path, {}))
+
+    def test_plan_file_round_trip(self, tmp_path):
+        nodeids = nodeids_for(10)
+        store = make_store(tmp_path, {nodeid: index + 1 for index, nodeid in enumerate(nodeids)})
+        path = write_plan(str(tmp_path / "shard-plan.json"), nodeids, 3, store)
+
+        for index, expected in enumerate(plan_shards(nodeids, 3, store)):
+            assert load_plan_shard(path, 3, index) == expected
+        with open(path, encoding="utf-8") as f:
+            assert json.load(f)["total"] == 3
+
+    def test_plan_file_for_another_shard_count_is_rejected(self, tmp_path):
+        path = write_plan(str(tmp_path / "shard-plan.json"), nodeids_for(4), 2, make_store(tmp_path, {}))
+
+        with pytest.raises(ValueError):
+            load_plan_shard(path, 3, 0)
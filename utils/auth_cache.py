@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+import time
+from email.utils import formatdate
+
+from pages.login_page import LoginPage
+from pages.routes import url_for
+
+logger = logging.getLogger(__name__)
+
+# Don't inject a session that is about to expire mid-test
+EXPIRY_MARGIN_SECONDS = 60
+
+_CAPTURE_STORAGE_SCRIPT = """
+var copy = function (storage) {
+    var data = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        data[key] = storage.getItem(key);
+    }
+    return data;
+};
+return {local: copy(window.localStorage), session: copy(window.sessionStorage)};
+"""
+
+_INJECT_STATE_SCRIPT = """
+var state = arguments[0];
+window.localStorage.clear();
+window.sessionStorage.clear();
+Object.keys(state.local).forEach(function (key) { window.localStorage.setItem(key, state.local[key]); });
+Object.keys(state.session).forEach(function (key) { window.sessionStorage.setItem(key, state.session[key]); });
+state.cookies.forEach(function (cookie) { document.cookie = cookie; });
+"""
+
+_VALIDATE_SCRIPT = """
+return window.location.pathname.indexOf('inventory') !== -1 && !!document.querySelector('.inventory_list');
+"""
+
+
+class AuthSessionCache:
+    """
+    Reuse a logged-in SauceDemo session instead of typing credentials every test
+
+    The first login per (browser, username) goes through the UI and its
+    cookies and storage are captured. Later logins inject that snapshot and
+    open /inventory.html directly; if the app rejects the session the cache
+    entry is dropped and a normal UI login is done.
+    """
+
+    def __init__(self):
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def login(self, driver, browser, username, password):
+        """
+        Log the driver in, from the cached session when possible
+
+        Returns:
+            bool: True if the cached session was used, False if the UI login ran
+        """
+        key = (browser.lower(), username)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+
+        if snapshot and not is_expired(snapshot) and self._restore(driver, snapshot):
+            with self._lock:
+                self.hits += 1
+            return True
+
+        if snapshot:
+            logger.info(f"Cached session for {username} [{browser}] rejected, logging in through the UI")
+
+        with self._lock:
+            if snapshot:
+                self._snapshots.pop(key, None)
+            self.misses += 1
+        login_page = LoginPage(driver)
+        login_page.load()
+        login_page.login(username, password)
+        if "inventory" in driver.current_url:
+            with self._lock:
+                self._snapshots[key] = self._capture(driver)
+        return False
+
+    def clear(self):
+        with self._lock:
+            self._snapshots.clear()
+
+    def _capture(self, driver):
+        return dict(capture_state(driver), captured_at=time.time())
+
+    def _restore(self, driver, snapshot):
+        """Inject a snapshot and check the app accepts it with a single script call"""
+        inject_state(driver, snapshot)
+        driver.get(url_for("inventory"))
+        return bool(driver.execute_script(_VALIDATE_SCRIPT))
+
+
+def capture_state(driver):
+    """Cookies plus local and session storage of the current page's origin"""
+    storage = driver.execute_script(_CAPTURE_STORAGE_SCRIPT)
+    return {
+        'cookies': driver.get_cookies(),
+        'local': storage['local'],
+        'session': storage['session']
+    }
+
+
+def inject_state(driver, state):
+    """Replace the app's cookies and storage with a captured state, leaving the browser on the login page"""
+    # Cookies and storage can only be set once the browser is on the app's origin
+    driver.get(url_for("login"))
+
+    script_cookies = [_cookie_string(cookie) for cookie in state['cookies'] if not cookie.get('httpOnly')]
+    for cookie in state['cookies']:
+        if cookie.get('httpOnly'):
+            driver.add_cookie(cookie)
+    driver.execute_script(_INJECT_STATE_SCRIPT, {
+        'local': state['local'],
+        'session': state['session'],
+        'cookies': script_cookies
+    })
+
+
+def is_expired(snapshot):
+    """Whether a captured state's cookies expire within EXPIRY_MARGIN_SECONDS"""
+    expiries = [cookie['expiry'] for cookie in snapshot['cookies'] if cookie.get('expiry')]
+    return bool(expiries) and min(expiries) < time.time() + EXPIRY_MARGIN_SECONDS
+
+
+def _cookie_string(cookie):
+    """document.cookie form of a WebDriver cookie dict"""
+    parts = [f"{cookie['name']}={cookie['value']}", f"path={cookie.get('path', '/')}"]
+    if cookie.get('expiry'):
+        parts.append(f"expires={formatdate(cookie['expiry'], usegmt=True)}")
+    if cookie.get('secure'):
+        parts.append("secure")
+    if cookie.get('sameSite'):
+        parts.append(f"samesite={cookie['sameSite']}")
+    return "; ".join(parts)
+
+
+_auth_cache = None
+
+def get_auth_cache():
+    """Process-wide session cache, shared by every test on this worker"""
+    global _auth_cache
+    if _auth_cache is None:
+        _auth_cache = AuthSessionCache()
+    return _auth_cache
+
+def auth_cache_enabled():
+    return os.getenv('AUTH_SESSION_CACHE', 'true').lower() != 'false'
@@ -1,9 +1,15 @@
 import logging
 from pages.inventory_page import InventoryPage
 from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
+from pages.routes import direct_navigation_enabled
+from pages.tracing import traced
+from utils.cart_seeder import CartSeeder
+from utils.checkpoints import cart_scenario, checkpoints_enabled, get_checkpoint_store
 
 logger = logging.getLogger(__name__)
 
+@traced
 class CartHelper:
     """Helper class for cart operations to promote code reusability"""
     
@@ -11,6 +17,20 @@ class CartHelper:
         self.driver = driver
         self.inventory_page = InventoryPage(driver)
         self.cart_page = CartPage(driver)
+        self.checkout_page = CheckoutPage(driver)
+
+    def _go_to_cart(self):
+        """
+        Open the cart, by URL unless the test covers UI navigation
+        
+        Returns:
+            bool: True if the cart is already known to be rendered (direct
+            navigation passed its readiness check), False if callers should wait
+        """
+        if direct_navigation_enabled(self.driver):
+            return self.cart_page.open()
+        self.inventory_page.go_to_cart()
+        return False
 
     def add_items_to_cart(self, items_list):
         """
@@ -24,30 +44,39 @@ class CartHelper:
                 'success': bool,
                 'added_items': list,
                 'failed_items': list,
+                'duplicate_items': list,
                 'total_added': int,
                 'cart_count': int,
                 'cart_count_matches': bool
             }
+            Duplicates (items already in the cart, or matched by an earlier
+            fragment) are not failures but are left out of total_added.
         """
         added_items = []
         failed_items = []
+        duplicate_items = []
         
         # Ensure we're on inventory page
         self.inventory_page.wait_for_inventory()
         
-        for item in items_list:
-            success = self.inventory_page.add_item_to_cart_by_name(item)
-            
-            if success:
+        # One round trip: every click plus the resulting badge count
+        batch = self.inventory_page.add_items_to_cart(items_list)
+        
+        for result in batch['results']:
+            item = result['fragment']
+            if result['added']:
                 added_items.append(item)
                 logger.info(f"Successfully added item containing '{item}' to cart")
+            elif result['duplicate']:
+                duplicate_items.append(item)
+                logger.info(f"Item containing '{item}' ({result['name']}) was already in the cart")
             else:
                 failed_items.append(item)
                 logger.warning(f"Failed to add item containing '{item}' - item not found")
         
-        # Verify cart count matches added items
-        expected_count = len(added_items)
-        actual_count = int(self.inventory_page.get_cart_count())
+        # Every resolved item is now in the cart exactly once
+        expected_count = len({result['name'] for result in batch['results'] if result['name']})
+        actual_count = batch['cart_count']
         
         logger.info(f"Cart summary: {actual_count} items in cart, expected {expected_count}")
         
@@ -55,11 +84,60 @@ class CartHelper:
             'success': len(failed_items) == 0,
             'added_items': added_items,
             'failed_items': failed_items,
+            'duplicate_items': duplicate_items,
             'total_added': len(added_items),
             'cart_count': actual_count,
             'cart_count_matches': actual_count == expected_count
         }
 
+    def build_cart(self, items_list, cart_setup="ui"):
+        """
+        Put items in the cart, through the UI or by seeding the cart state
+        
+        Args:
+            items_list (list): Item name fragments (or product ids when seeding)
+            cart_setup (str): "ui" to click "Add to cart", "seeded" to write the
+                cart state directly (for tests that don't cover adding items)
+            
+        Returns:
+            dict: Same shape as add_items_to_cart
+        """
+        if cart_setup == "seeded":
+            return CartSeeder(self.driver).seed(items_list)
+        if cart_setup != "ui":
+            raise ValueError(f"Unknown cart_setup '{cart_setup}', expected 'ui' or 'seeded'")
+        return self.add_items_to_cart(items_list)
+
+    def reach_checkout(self, items_list, cart_setup="ui"):
+        """
+        Fill the cart and open the checkout form, from a checkpoint when possible
+        
+        A seeded cart is captured as a 'checkout_info' checkpoint the first
+        time it reaches checkout on a browser; later tests seeding the same
+        items restore it. A "ui" cart is always built, since adding the items
+        is what those tests cover.
+        
+        Args:
+            items_list (list): Items for build_cart
+            cart_setup (str): "ui" or "seeded", see build_cart
+            
+        Returns:
+            dict: The build_cart result plus 'reached_checkout' and 'restored' (bools)
+        """
+        checkpoints = get_checkpoint_store() if checkpoints_enabled() and cart_setup == "seeded" else None
+        scenario = cart_scenario(items_list, cart_setup)
+        if checkpoints:
+            saved = checkpoints.restore(self.driver, scenario, "checkout_info")
+            if saved:
+                return dict(saved, reached_checkout=True, restored=True)
+        
+        add_result = self.build_cart(items_list, cart_setup)
+        reached = add_result['total_added'] > 0 and self.proceed_to_checkout()
+        if checkpoints and reached:
+            checkpoints.capture(self.driver, scenario, "checkout_info", add_result)
+        
+        return dict(add_result, reached_checkout=reached, restored=False)
+
     def verify_cart_contents(self, expected_count):
         """
         Navigate to cart and verify contents
@@ -75,11 +153,12 @@ class CartHelper:
             }
         """
         # Go to cart page
-        self.inventory_page.go_to_cart()
+        rendered = self._go_to_cart()
         
         # Wait for cart items to load
         try:
-            self.cart_page.wait_for_cart_items()
+            if not rendered:
+                self.cart_page.wait_for_cart_items()
             actual_count = self.cart_page.cart_count()
         except:
             # If no items, cart_count should be 0
@@ -103,16 +182,20 @@ class CartHelper:
             bool: True if successfully navigated to checkout
         """
         try:
-            # Ensure we're on cart page
-            if "cart" not in self.driver.current_url:
-                self.inventory_page.go_to_cart()
-                self.cart_page.wait_for_cart_items()
-            
-            # Click checkout button
-            self.cart_page.click_checkout()
-            
-            # Verify we're on checkout page
-            success = "checkout-step-one" in self.driver.current_url
+            if direct_navigation_enabled(self.driver):
+                # Jump straight to the form; its readiness check is the verification
+                success = self.checkout_page.open()
+            else:
+                # Ensure we're on cart page
+                if "cart" not in self.driver.current_url:
+                    self.inventory_page.go_to_cart()
+                    self.cart_page.wait_for_cart_items()
+                
+                # Click checkout button
+                self.cart_page.click_checkout()
+                
+                # Verify we're on checkout page
+                success = "checkout-step-one" in self.driver.current_url
             
             if success:
                 logger.info("Successfully navigated to checkout page")
@@ -162,10 +245,11 @@ class CartHelper:
         inventory_cart_count = int(self.inventory_page.get_cart_count())
         
         # Navigate to cart and get detailed info
-        self.inventory_page.go_to_cart()
+        rendered = self._go_to_cart()
         
         try:
-            self.cart_page.wait_for_cart_items()
+            if not rendered:
+                self.cart_page.wait_for_cart_items()
             cart_page_count = self.cart_page.cart_count()
         except:
             cart_page_count = 0
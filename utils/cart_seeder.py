@@ -0,0 +1,100 @@
+import json
+import logging
+from selenium.common.exceptions import TimeoutException
+from pages.inventory_page import InventoryPage
+
+logger = logging.getLogger(__name__)
+
+# SauceDemo product ids in inventory order (fragments match the first name that contains them, like the UI)
+PRODUCTS = [
+    (4, "Sauce Labs Backpack"),
+    (0, "Sauce Labs Bike Light"),
+    (1, "Sauce Labs Bolt T-Shirt"),
+    (5, "Sauce Labs Fleece Jacket"),
+    (2, "Sauce Labs Onesie"),
+    (3, "Test.allTheThings() T-Shirt (Red)")
+]
+
+CART_STORAGE_KEY = "cart-contents"
+
+_WRITE_CART_SCRIPT = """
+window.localStorage.setItem(arguments[0], arguments[1]);
+"""
+
+
+def resolve_product_id(item):
+    """Product id for an id or a name fragment, or None if nothing matches"""
+    if isinstance(item, int):
+        return item if any(product_id == item for product_id, _ in PRODUCTS) else None
+    fragment = str(item).lower()
+    for product_id, name in PRODUCTS:
+        if fragment in name.lower():
+            return product_id
+    return None
+
+
+class CartSeeder:
+    """
+    Build a cart by writing SauceDemo's client-side cart state directly
+
+    For tests that need items in the cart but aren't testing add-to-cart:
+    one storage write, one reload and a badge check instead of a click per item.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.inventory_page = InventoryPage(driver)
+
+    def seed(self, items, wait_time=10):
+        """
+        Replace the cart contents with the given items
+
+        Args:
+            items (list): Product ids (int) or item name fragments (str)
+
+        Returns:
+            dict: Same shape as CartHelper.add_items_to_cart, plus 'product_ids'
+        """
+        added_items = []
+        failed_items = []
+        duplicate_items = []
+        product_ids = []
+
+        for item in items:
+            product_id = resolve_product_id(item)
+            if product_id is None:
+                failed_items.append(item)
+                logger.warning(f"Failed to seed item '{item}' - no matching product")
+                continue
+            if product_id in product_ids:
+                duplicate_items.append(item)
+                continue
+            added_items.append(item)
+            product_ids.append(product_id)
+
+        self.driver.execute_script(_WRITE_CART_SCRIPT, CART_STORAGE_KEY, json.dumps(product_ids))
+        self.driver.refresh()
+
+        actual_count = self._badge_count(len(product_ids), wait_time)
+        expected_count = len(product_ids)
+
+        logger.info(f"Seeded cart with product ids {product_ids}: badge shows {actual_count}, expected {expected_count}")
+
+        return {
+            'success': len(failed_items) == 0,
+            'added_items': added_items,
+            'failed_items': failed_items,
+            'duplicate_items': duplicate_items,
+            'total_added': len(product_ids),
+            'cart_count': actual_count,
+            'cart_count_matches': actual_count == expected_count,
+            'product_ids': product_ids
+        }
+
+    def _badge_count(self, expected, wait_time):
+        if not expected:
+            return int(self.inventory_page.get_cart_count())
+        try:
+            return int(self.inventory_page.wait_for(self.inventory_page.cart_badge, wait_time).text)
+        except (TimeoutException, ValueError):
+            return 0
@@ -1,8 +1,24 @@
 import logging
+import os
+import time
+from selenium.common.exceptions import (ElementClickInterceptedException, ElementNotInteractableException,
+                                        StaleElementReferenceException, TimeoutException)
 from pages.checkout_page import CheckoutPage
+from pages.tracing import traced
+from utils.test_metrics import current_test_metrics
+from utils.webdriver_commands import command_count, instrument_driver
 
 logger = logging.getLogger(__name__)
 
+# Result keys and failed_step names kept from the original single-call flow
+_STEP_RESULT_KEYS = {'info': 'info_result', 'overview': 'overview_result', 'finish': 'purchase_result'}
+_FAILED_STEP_NAMES = {'info': 'checkout_info', 'overview': 'checkout_overview', 'finish': 'purchase_completion'}
+
+# Step failures worth retrying: the page was slow or changed under us, not wrong
+_TRANSIENT_ERRORS = (TimeoutException, StaleElementReferenceException,
+                     ElementClickInterceptedException, ElementNotInteractableException)
+
+@traced
 class CheckoutHelper:
     """Helper class for checkout operations to promote code reusability"""
     
@@ -32,7 +48,8 @@ class CheckoutHelper:
                 return {
                     'success': False,
                     'error_message': 'Checkout information page did not load',
-                    'step_completed': None
+                    'step_completed': None,
+                    'retryable': True
                 }
             
             # Fill out the form
@@ -64,7 +81,8 @@ class CheckoutHelper:
                 return {
                     'success': False,
                     'error_message': 'Failed to proceed to checkout overview',
-                    'step_completed': 'checkout_info_failed'
+                    'step_completed': 'checkout_info_failed',
+                    'retryable': True
                 }
                 
         except Exception as e:
@@ -73,9 +91,42 @@ class CheckoutHelper:
             return {
                 'success': False,
                 'error_message': error_msg,
-                'step_completed': 'checkout_info_error'
+                'step_completed': 'checkout_info_error',
+                'retryable': isinstance(e, _TRANSIENT_ERRORS)
             }
 
+    def reach_overview(self, first_name, last_name, postal_code, cart_helper, items_list, cart_setup="ui"):
+        """
+        Get to the checkout overview
+        
+        Reaches checkout with CartHelper.reach_checkout (restoring its
+        checkpoint when possible) and runs the information step.
+        
+        Returns:
+            dict: {
+                'success': bool,
+                'restored': bool,
+                'cart_result': dict (see CartHelper.reach_checkout),
+                'info_result': dict or None
+            }
+        """
+        cart_result = cart_helper.reach_checkout(items_list, cart_setup)
+        if not cart_result['reached_checkout']:
+            return {
+                'success': False,
+                'restored': cart_result['restored'],
+                'cart_result': cart_result,
+                'info_result': None
+            }
+        
+        info_result = self.complete_checkout_information(first_name, last_name, postal_code)
+        return {
+            'success': info_result['success'],
+            'restored': cart_result['restored'],
+            'cart_result': cart_result,
+            'info_result': info_result
+        }
+
     def verify_checkout_overview(self, expected_items_count=None):
         """
         Verify the checkout overview page details
@@ -84,24 +135,26 @@ class CheckoutHelper:
             expected_items_count (int, optional): Expected number of items
             
         Returns:
-            dict: Overview verification results and totals
+            dict: Overview verification results and totals (amounts are Decimal)
         """
         try:
             if not self.checkout_page.wait_for_checkout_overview():
                 return {
                     'success': False,
-                    'error': 'Checkout overview page did not load'
+                    'error': 'Checkout overview page did not load',
+                    'retryable': True
                 }
             
-            # Get all the totals
-            item_total = self.checkout_page.get_item_total()
-            tax_amount = self.checkout_page.get_tax_amount()
-            final_total = self.checkout_page.get_total_price()
-            items_count = self.checkout_page.get_overview_items_count()
+            # Get all the totals and line items in one round trip
+            summary = self.checkout_page.get_overview_summary()
+            item_total = summary['subtotal']
+            tax_amount = summary['tax']
+            final_total = summary['total']
+            items_count = summary['items_count']
             
-            # Verify math (item total + tax = final total, within small rounding tolerance)
+            # Verify math (item total + tax = final total); amounts are Decimals so this is exact
             calculated_total = item_total + tax_amount
-            math_correct = abs(calculated_total - final_total) < 0.01
+            math_correct = calculated_total == final_total
             
             # Verify expected items count if provided
             items_count_correct = True
@@ -118,6 +171,7 @@ class CheckoutHelper:
                 'calculated_total': calculated_total,
                 'math_correct': math_correct,
                 'items_count': items_count,
+                'line_items': summary['items'],
                 'expected_items_count': expected_items_count,
                 'items_count_correct': items_count_correct
             }
@@ -139,7 +193,8 @@ class CheckoutHelper:
             logger.error(error_msg)
             return {
                 'success': False,
-                'error': error_msg
+                'error': error_msg,
+                'retryable': isinstance(e, _TRANSIENT_ERRORS)
             }
 
     def complete_purchase(self):
@@ -169,30 +224,42 @@ class CheckoutHelper:
             if not self.checkout_page.wait_for_checkout_complete():
                 return {
                     'success': False,
-                    'error': 'Checkout completion page did not load'
+                    'error': 'Checkout completion page did not load',
+                    'retryable': True
                 }
             
-            # Get completion messages
-            completion_message = self.checkout_page.get_completion_message()
-            completion_text = self.checkout_page.get_completion_text()
-            
-            logger.info(f"Purchase completed! Message: '{completion_message}'")
-            
-            return {
-                'success': True,
-                'completion_message': completion_message,
-                'completion_text': completion_text,
-                'step_completed': 'purchase_complete'
-            }
+            return self._completed_purchase()
             
         except Exception as e:
             error_msg = f"Exception during purchase completion: {str(e)}"
             logger.error(error_msg)
             return {
                 'success': False,
-                'error': error_msg
+                'error': error_msg,
+                'retryable': isinstance(e, _TRANSIENT_ERRORS)
             }
 
+    def _completed_purchase(self):
+        """Result of the finish step, read from the checkout complete page"""
+        completion_message = self.checkout_page.get_completion_message()
+        completion_text = self.checkout_page.get_completion_text()
+        
+        logger.info(f"Purchase completed! Message: '{completion_message}'")
+        
+        return {
+            'success': True,
+            'completion_message': completion_message,
+            'completion_text': completion_text,
+            'step_completed': 'purchase_complete'
+        }
+
+    def _purchase_went_through(self):
+        """Before retrying finish: the finish step's result if the order was already placed, else None"""
+        if self.checkout_page.is_on_checkout_complete_page():
+            logger.info("Order was placed before the finish step failed, not submitting it again")
+            return self._completed_purchase()
+        return None
+
     def return_to_inventory(self):
         """
         Return to inventory from completion page
@@ -220,7 +287,8 @@ class CheckoutHelper:
             logger.error(f"Error returning to inventory: {str(e)}")
             return False
 
-    def complete_full_checkout_flow(self, first_name, last_name, postal_code, expected_items_count=None):
+    def complete_full_checkout_flow(self, first_name, last_name, postal_code, expected_items_count=None,
+                                    return_home=False):
         """
         Complete the entire checkout flow in one method
         
@@ -229,53 +297,120 @@ class CheckoutHelper:
             last_name (str): Customer last name
             postal_code (str): Customer postal code
             expected_items_count (int, optional): Expected number of items
+            return_home (bool): Also go back to the inventory at the end
             
         Returns:
-            dict: Complete checkout flow results
+            dict: Complete checkout flow results, including per-step 'steps'
         """
         logger.info(f"Starting full checkout flow for {first_name} {last_name}")
         
-        # Step 1: Complete checkout information
-        info_result = self.complete_checkout_information(first_name, last_name, postal_code)
-        if not info_result['success']:
-            return {
-                'success': False,
-                'failed_step': 'checkout_info',
-                'error': info_result['error_message'],
-                'info_result': info_result
-            }
+        result = self.run_checkout_pipeline(first_name, last_name, postal_code, expected_items_count, return_home)
+        if result['success']:
+            logger.info("✅ Full checkout flow completed successfully!")
+        return result
+
+    def run_checkout_pipeline(self, first_name, last_name, postal_code, expected_items_count=None,
+                              return_home=True, retries=None):
+        """
+        Run checkout as explicit steps: info -> overview -> finish -> back_home
         
-        # Step 2: Verify checkout overview
-        overview_result = self.verify_checkout_overview(expected_items_count)
-        if not overview_result['success']:
-            return {
-                'success': False,
-                'failed_step': 'checkout_overview',
-                'error': overview_result.get('error', 'Overview verification failed'),
-                'info_result': info_result,
-                'overview_result': overview_result
-            }
+        Each step records its start/end time, WebDriver command count and
+        outcome. A step that failed transiently (a timeout or an element that
+        changed under it) is retried, up to `retries` times (default
+        CHECKOUT_STEP_RETRIES or 1), after reopening the page it starts from,
+        so the cart and earlier steps are not redone. Validation errors and
+        wrong totals are not retried, and finish is never submitted again once
+        the order has gone through.
         
-        # Step 3: Complete purchase
-        purchase_result = self.complete_purchase()
-        if not purchase_result['success']:
-            return {
-                'success': False,
-                'failed_step': 'purchase_completion',
-                'error': purchase_result.get('error', 'Purchase completion failed'),
-                'info_result': info_result,
-                'overview_result': overview_result,
-                'purchase_result': purchase_result
+        Returns:
+            dict: {
+                'success': bool,
+                'failed_step': str or None,
+                'error': str or None,
+                'steps': list of step records,
+                'info_result', 'overview_result', 'purchase_result': step results,
+                'final_total': Decimal, 'items_purchased': int (on success)
             }
+        """
+        if retries is None:
+            retries = int(os.getenv('CHECKOUT_STEP_RETRIES', '1'))
+        instrument_driver(self.driver)
         
-        # Success!
-        logger.info("✅ Full checkout flow completed successfully!")
+        # (name, step, page it starts from, check before a retry whether it already happened)
+        steps = [
+            ('info', lambda: self.complete_checkout_information(first_name, last_name, postal_code), 'checkout_info', None),
+            ('overview', lambda: self.verify_checkout_overview(expected_items_count), 'checkout_overview', None),
+            ('finish', self.complete_purchase, 'checkout_overview', self._purchase_went_through),
+        ]
+        if return_home:
+            steps.append(('back_home', lambda: {'success': self.return_to_inventory()}, 'checkout_complete', None))
         
-        return {
-            'success': True,
-            'info_result': info_result,
-            'overview_result': overview_result,
-            'purchase_result': purchase_result,
-            'final_total': overview_result['final_total'],
-            'items_purchased': overview_result['items_count']
-        }
\ No newline at end of file
+        result = {'success': True, 'failed_step': None, 'error': None, 'steps': []}
+        for name, run_step, resume_route, already_done in steps:
+            record, step_result = self._run_step(name, run_step, resume_route, retries, already_done)
+            result['steps'].append(record)
+            result[_STEP_RESULT_KEYS.get(name, f'{name}_result')] = step_result
+            if record['status'] == 'failed':
+                result.update(success=False, failed_step=_FAILED_STEP_NAMES.get(name, name), error=record['error'])
+                break
+        
+        if result['success']:
+            result['final_total'] = result['overview_result']['final_total']
+            result['items_purchased'] = result['overview_result']['items_count']
+        
+        metrics = current_test_metrics()
+        if metrics:
+            metrics.add_steps(result['steps'])
+        logger.info("Checkout steps: " + ", ".join(
+            f"{step['step']} {step['status']} {step['duration']:.2f}s/{step['commands']} cmds" for step in result['steps']))
+        return result
+
+    def _run_step(self, name, run_step, resume_route, retries, already_done=None):
+        """
+        Run one pipeline step, resuming at its starting page before each retry
+
+        Only failures flagged 'retryable' are retried. `already_done`, if
+        given, is asked first and its result used when the failed attempt
+        actually took effect.
+        """
+        started = time.time()
+        commands_before = command_count(self.driver)
+        step_result = {}
+        error = None
+        attempts = 0
+        
+        while attempts <= retries:
+            if attempts:
+                if not step_result.get('retryable'):
+                    break
+                done = already_done() if already_done else None
+                if done:
+                    step_result, error = done, None
+                    break
+                logger.warning(f"Retrying checkout step '{name}' from {resume_route} ({error})")
+                if not self.checkout_page.open(route=resume_route):
+                    error = f"Could not reopen {resume_route} to retry '{name}'"
+                    break
+            attempts += 1
+            try:
+                step_result = run_step()
+            except Exception as e:
+                step_result = {'success': False, 'error': str(e), 'retryable': isinstance(e, _TRANSIENT_ERRORS)}
+            if step_result.get('success'):
+                error = None
+                break
+            error = step_result.get('error_message') or step_result.get('error') or f"Step '{name}' failed"
+        
+        ended = time.time()
+        status = 'failed' if error else ('retried' if attempts > 1 else 'passed')
+        record = {
+            'step': name,
+            'status': status,
+            'attempts': attempts,
+            'started': started,
+            'ended': ended,
+            'duration': ended - started,
+            'commands': command_count(self.driver) - commands_before,
+            'error': error
+        }
+        return record, step_result
@@ -0,0 +1,148 @@
+import copy
+import hashlib
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+from utils.auth_cache import capture_state, inject_state, is_expired
+from utils.session_files import PROJECT_ROOT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_FILES = [os.path.join(PROJECT_ROOT, "data", "checkout_data.json")]
+
+_VALIDATE_SCRIPT = """
+return window.location.pathname === arguments[0];
+"""
+
+
+class CheckpointStore:
+    """
+    Named snapshots of app state (cookies, storage, URL) to branch scenarios from
+
+    Tests that share a prefix (log in, fill the cart, reach checkout) capture
+    the state once at a named point; later tests on the same browser that
+    start from the same state (see cart_scenario) restore it into their
+    pooled driver instead of replaying the prefix. The store lives in the
+    worker process, so only tests on the same worker share checkpoints.
+    Every checkpoint remembers a hash of the test data files and is dropped
+    as soon as they change.
+    """
+
+    def __init__(self, data_files=None):
+        self.data_files = data_files or DEFAULT_DATA_FILES
+        self._checkpoints = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def capture(self, driver, scenario, name, data=None):
+        """
+        Save the driver's current app state as checkpoint `name` of `scenario`
+
+        Args:
+            data (dict, optional): Anything the flow produced on the way (e.g.
+                the add-to-cart result), handed back by restore()
+        """
+        checkpoint = dict(capture_state(driver),
+                          url=driver.current_url,
+                          data=copy.deepcopy(data),
+                          data_hash=self._data_hash(),
+                          captured_at=time.time())
+        with self._lock:
+            self._checkpoints[self._key(driver, scenario, name)] = checkpoint
+        logger.info(f"Captured checkpoint '{name}' for scenario '{scenario}' [{_browser_name(driver)}]")
+
+    def restore(self, driver, scenario, name):
+        """
+        Put the driver into checkpoint `name` of `scenario`
+
+        Checkpoints whose cookies have expired are dropped without touching
+        the driver; one the app rejects is dropped and the driver's previous
+        cookies, storage and page are put back.
+
+        Returns:
+            dict or None: The data saved with the checkpoint, or None if there
+            is no valid checkpoint (the caller should run the flow itself)
+        """
+        key = self._key(driver, scenario, name)
+        with self._lock:
+            checkpoint = self._checkpoints.get(key)
+
+        if checkpoint and checkpoint['data_hash'] != self._data_hash():
+            logger.info(f"Checkpoint '{name}' for scenario '{scenario}' is stale (test data changed)")
+            checkpoint = None
+        elif checkpoint and is_expired(checkpoint):
+            logger.info(f"Checkpoint '{name}' for scenario '{scenario}' has expired cookies")
+            checkpoint = None
+
+        if checkpoint is None:
+            with self._lock:
+                self._checkpoints.pop(key, None)
+                self.misses += 1
+            return None
+
+        # Keep the current (logged-in) state, so a rejected checkpoint leaves the driver as it was
+        previous = dict(capture_state(driver), url=driver.current_url)
+        inject_state(driver, checkpoint)
+        driver.get(checkpoint['url'])
+        if not driver.execute_script(_VALIDATE_SCRIPT, urlparse(checkpoint['url']).path):
+            logger.info(f"Checkpoint '{name}' for scenario '{scenario}' was rejected by the app")
+            with self._lock:
+                self._checkpoints.pop(key, None)
+                self.misses += 1
+            inject_state(driver, previous)
+            driver.get(previous['url'])
+            return None
+
+        with self._lock:
+            self.hits += 1
+        logger.info(f"Restored checkpoint '{name}' for scenario '{scenario}' [{_browser_name(driver)}]")
+        return copy.deepcopy(checkpoint['data']) if checkpoint['data'] is not None else {}
+
+    def clear(self):
+        with self._lock:
+            self._checkpoints.clear()
+
+    def _key(self, driver, scenario, name):
+        return (_browser_name(driver), scenario, name)
+
+    def _data_hash(self):
+        digest = hashlib.sha256()
+        for path in self.data_files:
+            try:
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+            except OSError:
+                digest.update(b"missing:" + path.encode())
+        return digest.hexdigest()
+
+
+def cart_scenario(items_list, cart_setup):
+    """
+    Checkpoint scenario for a cart, e.g. 'seeded:backpack,shirt'
+
+    Named after the starting state rather than the test, so every test that
+    builds the same cart the same way shares its checkpoints.
+    """
+    return f"{cart_setup}:{','.join(str(item) for item in items_list)}"
+
+
+def _browser_name(driver):
+    # capabilities are cached on the driver, so this costs no round trip
+    return (getattr(driver, "capabilities", None) or {}).get("browserName", "unknown").lower()
+
+
+_checkpoint_store = None
+
+def get_checkpoint_store():
+    """Process-wide checkpoint store, shared by every test on this worker"""
+    global _checkpoint_store
+    if _checkpoint_store is None:
+        _checkpoint_store = CheckpointStore()
+    return _checkpoint_store
+
+def checkpoints_enabled():
+    return os.getenv('APP_CHECKPOINTS', 'true').lower() != 'false'
@@ -0,0 +1,279 @@
+import glob
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# On-disk index shared by every session on this machine
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".cache", "ecommerce-selenium-suite", "driver_index.json")
+
+_PROGRAM_FILES = [os.getenv("PROGRAMFILES", r"C:\Program Files"),
+                  os.getenv("PROGRAMFILES(X86)", r"C:\Program Files (x86)"),
+                  os.getenv("LOCALAPPDATA", "")]
+
+BROWSER_SPECS = {
+    "chrome": {
+        "binary_env": "CHROME_BIN",
+        "driver_env": "CHROMEDRIVER_PATH",
+        "system_env": "USE_SYSTEM_CHROMEDRIVER",
+        "binary_names": ["google-chrome", "google-chrome-stable", "chrome", "chromium", "chromium-browser"],
+        "driver_name": "chromedriver",
+        "wdm_folder": "chromedriver",
+        "install_paths": [os.path.join(p, "Google", "Chrome", "Application", "chrome.exe") for p in _PROGRAM_FILES if p] + [
+            "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+            "/opt/google/chrome/chrome",
+        ],
+        "match_driver_major": True,
+    },
+    "firefox": {
+        "binary_env": "FIREFOX_BIN",
+        "driver_env": "GECKODRIVER_PATH",
+        "binary_names": ["firefox", "firefox-esr"],
+        "driver_name": "geckodriver",
+        "wdm_folder": "geckodriver",
+        "install_paths": [os.path.join(p, "Mozilla Firefox", "firefox.exe") for p in _PROGRAM_FILES if p] + [
+            "/Applications/Firefox.app/Contents/MacOS/firefox",
+            "/usr/lib/firefox/firefox",
+        ],
+        "match_driver_major": False,
+    },
+    "edge": {
+        "binary_env": "EDGE_BIN",
+        "driver_env": "EDGEDRIVER_PATH",
+        "binary_names": ["microsoft-edge", "microsoft-edge-stable", "msedge"],
+        "driver_name": "msedgedriver",
+        "wdm_folder": "edgedriver",
+        "install_paths": [os.path.join(p, "Microsoft", "Edge", "Application", "msedge.exe") for p in _PROGRAM_FILES if p] + [
+            "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge",
+            "/opt/microsoft/msedge/msedge",
+        ],
+        "match_driver_major": True,
+    },
+}
+
+# Folders where drivers are commonly dropped by hand
+DRIVER_DIRS = [r"C:\WebDrivers", "/usr/local/bin", "/usr/bin", "/opt/homebrew/bin"]
+
+_VERSION_PATTERN = re.compile(r"(\d+)\.(\d+)(?:\.\d+)*")
+
+
+class DriverResolver:
+    """
+    Find browser and driver binaries once and remember them across sessions.
+
+    Resolved paths are written to a JSON index keyed by browser and installed
+    major version (e.g. "chrome-139"). Later sessions read the index without
+    touching the network, and a browser upgrade simply produces a new key that
+    is resolved again. Browsers whose version can't be read are resolved every
+    session and never indexed, since an upgrade would go unnoticed.
+    """
+
+    def __init__(self, index_path=None):
+        self.index_path = index_path or os.getenv("DRIVER_INDEX_PATH", DEFAULT_INDEX_PATH)
+        self._resolved = {}
+
+    def resolve(self, browser):
+        """
+        Get the driver executable for a browser.
+
+        Args:
+            browser (str): "chrome", "firefox", or "edge"
+
+        Returns:
+            str or None: Driver path, or None to let Selenium locate the driver itself
+        """
+        browser = browser.lower()
+        if browser in self._resolved:
+            return self._resolved[browser]
+
+        spec = BROWSER_SPECS[browser]
+
+        # An explicit path always wins and is never cached
+        explicit = os.getenv(spec["driver_env"])
+        if explicit:
+            logger.info(f"Using {spec['driver_name']} from {spec['driver_env']}: {explicit}")
+            self._resolved[browser] = explicit
+            return explicit
+
+        # CI installs a matching driver on PATH and asks Selenium to find it
+        if spec.get("system_env") and os.getenv(spec["system_env"]) == "true":
+            logger.info(f"Using system {spec['driver_name']} from PATH ({spec['system_env']})")
+            self._resolved[browser] = None
+            return None
+
+        binary = find_browser_binary(browser)
+        version = get_browser_version(binary) if binary else None
+        major = version.split(".")[0] if version else "unknown"
+        key = f"{browser}-{major}"
+
+        index = self._load_index() if version else {}
+        entry = index.get(key)
+        if entry and os.path.isfile(entry.get("driver_path", "")):
+            logger.info(f"Driver index hit for {key}: {entry['driver_path']}")
+            self._resolved[browser] = entry["driver_path"]
+            return entry["driver_path"]
+
+        driver_path = find_local_driver(browser, major if spec["match_driver_major"] else None)
+        source = "local"
+        if driver_path is None:
+            driver_path = _download_driver(browser)
+            source = "webdriver-manager"
+
+        if driver_path and version:
+            index[key] = {
+                "browser_binary": binary,
+                "browser_version": version,
+                "driver_path": driver_path,
+                "source": source,
+                "resolved_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._save_index(index)
+            logger.info(f"Resolved {key} driver ({source}): {driver_path}")
+        elif driver_path:
+            logger.info(f"Resolved {key} driver ({source}), not indexed: {driver_path}")
+        else:
+            logger.warning(f"No {spec['driver_name']} found for {key}, falling back to Selenium Manager")
+
+        self._resolved[browser] = driver_path
+        return driver_path
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, index):
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"Could not write driver index {self.index_path}: {e}")
+
+
+def find_browser_binary(browser):
+    """Locate the browser executable via env var, PATH, then well-known install dirs."""
+    spec = BROWSER_SPECS[browser]
+
+    candidates = [os.getenv(spec["binary_env"])]
+    candidates += [shutil.which(name) for name in spec["binary_names"]]
+    candidates += spec["install_paths"]
+
+    for path in candidates:
+        if path and os.path.isfile(path):
+            return path
+    return None
+
+
+def get_browser_version(binary):
+    """Read the installed browser version without launching a session."""
+    # On Windows the browsers are GUI programs: `--version` prints nothing and opens a window
+    if sys.platform.startswith("win"):
+        return _read_install_version(binary)
+
+    try:
+        output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+        match = _VERSION_PATTERN.search(output)
+        if match:
+            return match.group(0)
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return _read_install_version(binary)
+
+
+def _read_install_version(binary):
+    """Version from the files next to the binary, or None"""
+    # Windows Chrome/Edge keep a folder per version in their install dir
+    install_dir = os.path.dirname(binary)
+    versions = [name for name in os.listdir(install_dir) if _VERSION_PATTERN.fullmatch(name)] if os.path.isdir(install_dir) else []
+    if versions:
+        return max(versions, key=_version_key)
+
+    # Firefox ships an application.ini next to its binary
+    ini_path = os.path.join(install_dir, "application.ini")
+    if os.path.isfile(ini_path):
+        with open(ini_path, encoding="utf-8", errors="ignore") as f:
+            match = re.search(r"^Version=(\S+)", f.read(), re.MULTILINE)
+            if match:
+                return match.group(1)
+    return None
+
+
+def find_local_driver(browser, major=None):
+    """
+    Look for an already installed driver on PATH, in the wdm cache and in well-known dirs.
+
+    Args:
+        browser (str): Browser name
+        major (str, optional): Required driver major version (Chromium based browsers)
+    """
+    spec = BROWSER_SPECS[browser]
+    exe_name = spec["driver_name"] + (".exe" if sys.platform.startswith("win") else "")
+
+    candidates = [shutil.which(spec["driver_name"])]
+    wdm_root = os.path.join(os.getenv("WDM_HOME", os.path.join(os.path.expanduser("~"), ".wdm")), "drivers", spec["wdm_folder"])
+    wdm_drivers = glob.glob(os.path.join(wdm_root, "**", exe_name), recursive=True)
+    candidates += sorted(wdm_drivers, key=_version_key_from_path, reverse=True)
+    candidates += [os.path.join(folder, exe_name) for folder in DRIVER_DIRS]
+
+    for path in candidates:
+        if not path or not os.path.isfile(path):
+            continue
+        if major is None or major == "unknown" or _driver_major(path) == major:
+            return path
+    return None
+
+
+def _driver_major(driver_path):
+    try:
+        output = subprocess.run([driver_path, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = _VERSION_PATTERN.search(output)
+    return match.group(1) if match else None
+
+
+def _download_driver(browser):
+    """Last resort: let webdriver-manager download the driver (needs network)."""
+    try:
+        if browser == "chrome":
+            from webdriver_manager.chrome import ChromeDriverManager
+            return ChromeDriverManager().install()
+        if browser == "firefox":
+            from webdriver_manager.firefox import GeckoDriverManager
+            return GeckoDriverManager().install()
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
+        return EdgeChromiumDriverManager().install()
+    except Exception as e:
+        logger.warning(f"webdriver-manager could not install the {browser} driver: {e}")
+        return None
+
+
+def _version_key(version):
+    return tuple(int(part) for part in re.findall(r"\d+", version))
+
+
+def _version_key_from_path(path):
+    match = _VERSION_PATTERN.search(path)
+    return _version_key(match.group(0)) if match else ()
+
+
+_default_resolver = None
+
+
+def get_driver_resolver():
+    """Process-wide resolver so each browser is resolved at most once per worker."""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = DriverResolver()
+    return _default_resolver
@@ -5,10 +5,22 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
+from utils.driver_resolver import get_driver_resolver
+from utils.test_metrics import record_timing
+from utils.webdriver_commands import instrument_driver
+from selenium.common.exceptions import WebDriverException
+from concurrent.futures import ThreadPoolExecutor
+import logging
 import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
 
 def create_driver(browser="chrome", headless=True):
     """
@@ -20,13 +32,17 @@ def create_driver(browser="chrome", headless=True):
     browser = browser.lower()
     
     if browser == "chrome":
-        return _create_chrome_driver(headless)
+        driver = _create_chrome_driver(headless)
     elif browser == "firefox":
-        return _create_firefox_driver(headless)
+        driver = _create_firefox_driver(headless)
     elif browser == "edge":
-        return _create_edge_driver(headless)
+        driver = _create_edge_driver(headless)
     else:
         raise ValueError(f"Unsupported browser: {browser}. Use 'chrome', 'firefox', or 'edge'")
+    
+    # Per-test command counts, timings and slowest commands (see utils.webdriver_commands)
+    instrument_driver(driver)
+    return driver
 
 def _create_chrome_driver(headless=True):
     """Create Chrome WebDriver with options."""
@@ -49,21 +65,13 @@ def _create_chrome_driver(headless=True):
     }
     options.add_experimental_option("prefs", preferences)
     
-    # Adjust Chrome browser based on Runtime 
-    chromedriver_path = os.getenv('CHROMEDRIVER_PATH')
-    if chromedriver_path:
-        # Use explicit ChromeDriver path (set by GitHub Actions)
-        service = ChromeService(chromedriver_path)
-        print(f"Using ChromeDriver from explicit path: {chromedriver_path}")
-    elif os.getenv('USE_SYSTEM_CHROMEDRIVER') == 'true':
-        # Use system PATH to find ChromeDriver (installed by GitHub Actions)
-        service = ChromeService()
-        print("Using system ChromeDriver from PATH")
-    else:
-        # Use WebDriver Manager for local development
-        service = ChromeService(ChromeDriverManager().install())
-        print("Using WebDriver Manager for ChromeDriver locally")
-    return webdriver.Chrome(service=service, options=options)
+    # Own the profile dir so the reaper can delete it after quit
+    profile_dir = tempfile.mkdtemp(prefix="selenium-chrome-")
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    
+    # Driver path comes from the offline resolver index (CHROMEDRIVER_PATH still wins)
+    service = ChromeService(_resolve_driver("chrome"))
+    return _start_with_profile(webdriver.Chrome, service, options, profile_dir)
 
 def _create_firefox_driver(headless=True):
     """Create Firefox WebDriver with options."""
@@ -80,8 +88,11 @@ def _create_firefox_driver(headless=True):
     options.set_preference("dom.webnotifications.enabled", False)
     options.set_preference("media.volume_scale", "0.0")
     
-    service = FirefoxService(GeckoDriverManager().install())
-    return webdriver.Firefox(service=service, options=options)
+    service = FirefoxService(_resolve_driver("firefox"))
+    driver = webdriver.Firefox(service=service, options=options)
+    # geckodriver creates the profile itself; remember it in case quit never finishes
+    driver.temp_profile_dir = driver.capabilities.get("moz:profile")
+    return driver
 
 def _create_edge_driver(headless=True):
     """Create Edge WebDriver with options."""
@@ -104,12 +115,327 @@ def _create_edge_driver(headless=True):
     }
     options.add_experimental_option("prefs", preferences)
     
-    # Handle CI vs local development
-    if os.getenv('CI') == 'true':
-        service = EdgeService()  # Use system PATH
-    else:
-        # Use local path for development (fixed escape sequence)
-        service = EdgeService(r"C:\WebDrivers\msedgedriver.exe")
+    profile_dir = tempfile.mkdtemp(prefix="selenium-edge-")
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    
+    # Resolver checks EDGEDRIVER_PATH, PATH, the wdm cache and C:\WebDrivers
+    service = EdgeService(_resolve_driver("edge"))
+
+    return _start_with_profile(webdriver.Edge, service, options, profile_dir)
+
+def _resolve_driver(browser):
+    """Driver executable for a browser, timed into the running test's setup breakdown"""
+    started = time.perf_counter()
+    path = get_driver_resolver().resolve(browser)
+    record_timing('driver_resolve', time.perf_counter() - started)
+    return path
+
+def _start_with_profile(driver_class, service, options, profile_dir):
+    """Start a Chromium based driver and tag it with its temp profile dir."""
+    try:
+        driver = driver_class(service=service, options=options)
+    except Exception:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    driver.temp_profile_dir = profile_dir
+    return driver
+
+
+class DriverPool:
+    """
+    Keep one warm WebDriver per browser for the current worker process.
+
+    Drivers are handed out with acquire() and given back with release(), which
+    wipes cookies, storage, extra windows and the URL so the next test starts
+    from a clean browser. A driver is recycled after max_uses tests or as soon
+    as it stops responding.
+    """
+
+    def __init__(self, headless=True, max_uses=None, standby=None):
+        self.headless = headless
+        self.max_uses = max_uses or int(os.getenv('DRIVER_POOL_MAX_USES', '25'))
+        self.standby = standby
+        self._idle = {}
+        self._uses = {}
+        self._in_use = {}
+        self.launches = 0
+        self.reuses = 0
+
+    def acquire(self, browser="chrome"):
+        """Return a ready driver for the browser, launching one only if none is idle."""
+        browser = browser.lower()
+        driver = self._idle.pop(browser, None)
+        if driver is not None and _is_alive(driver):
+            self._in_use[id(driver)] = browser
+            self.reuses += 1
+            return driver
+        if driver is not None:
+            logger.warning(f"Pooled {browser} driver stopped responding, launching a new one")
+            release_driver(driver)
+
+        started = time.perf_counter()
+        driver = self.standby.take(browser) if self.standby else None
+        if driver is None:
+            driver = create_driver(browser, self.headless)
+        # Includes waiting for a standby launch and resolving the driver binary
+        record_timing('driver_launch', time.perf_counter() - started)
+        self._uses[id(driver)] = 0
+        self._in_use[id(driver)] = browser
+        self.launches += 1
+        return driver
+
+    def release(self, driver, browser="chrome", discard=False):
+        """
+        Return a driver to the pool after resetting its state.
+
+        Args:
+            driver: Driver previously returned by acquire()
+            browser (str): Browser the driver was acquired for
+            discard (bool): Quit the driver instead of keeping it warm
+        """
+        browser = browser.lower()
+        self._in_use.pop(id(driver), None)
+        uses = self._uses.pop(id(driver), 0) + 1
+
+        if discard or uses >= self.max_uses or browser in self._idle:
+            release_driver(driver)
+            return
+
+        try:
+            reset_driver_state(driver)
+        except WebDriverException as e:
+            logger.warning(f"Could not reset {browser} driver, recycling it: {str(e).splitlines()[0]}")
+            release_driver(driver)
+            return
+
+        self._uses[id(driver)] = uses
+        self._idle[browser] = driver
+
+    def will_need_launch(self, browser):
+        """True if the next acquire() for this browser cannot be served by a warm driver."""
+        browser = browser.lower()
+        idle = self._idle.get(browser)
+        if idle is not None and self._uses.get(id(idle), 0) < self.max_uses:
+            return False
+        # A driver still checked out comes back warm unless this use recycles it
+        for driver_id, in_use_browser in self._in_use.items():
+            if in_use_browser == browser and self._uses.get(driver_id, 0) + 1 < self.max_uses:
+                return False
+        return True
+
+    def prewarm(self, browser):
+        """Start a standby launch if the next test on this browser would otherwise cold start."""
+        if self.standby and self.will_need_launch(browser):
+            self.standby.prewarm(browser)
+
+    def shutdown(self):
+        """Quit every idle driver held by the pool."""
+        for driver in self._idle.values():
+            release_driver(driver)
+        self._idle.clear()
+        self._uses.clear()
+        if self.standby:
+            self.standby.shutdown()
+
+
+class StandbyLauncher:
+    """
+    Launch browsers on background threads before a test asks for them.
+
+    Up to `spares` hot drivers are kept per browser type. take() hands over a
+    ready (or still starting) standby driver and records how much of its
+    launch time was hidden behind the previous test.
+    """
+
+    def __init__(self, headless=True, spares=None):
+        self.headless = headless
+        self.spares = spares if spares is not None else int(os.getenv('DRIVER_STANDBY_SPARES', '1'))
+        self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="standby-driver")
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.launch_seconds = 0.0
+        self.hidden_seconds = 0.0
+
+    def prewarm(self, browser):
+        """Top up the standby queue for a browser to the configured number of spares."""
+        browser = browser.lower()
+        with self._lock:
+            queue = self._pending.setdefault(browser, [])
+            while len(queue) < self.spares:
+                logger.info(f"Launching standby {browser} driver in the background")
+                queue.append(self._executor.submit(self._launch, browser))
+
+    def take(self, browser):
+        """Return a standby driver for the browser, or None if none was launched."""
+        with self._lock:
+            queue = self._pending.get(browser.lower())
+            future = queue.pop(0) if queue else None
+        if future is None:
+            return None
+
+        wait_start = time.time()
+        try:
+            driver, launch_seconds = future.result()
+        except Exception as e:
+            logger.warning(f"Standby {browser} launch failed, starting one inline: {e}")
+            return None
+        waited = time.time() - wait_start
+
+        with self._lock:
+            self.hits += 1
+            self.launch_seconds += launch_seconds
+            self.hidden_seconds += max(0.0, launch_seconds - waited)
+        return driver
+
+    def summary(self):
+        """One line describing how much launch latency the standby drivers absorbed."""
+        hidden_pct = (self.hidden_seconds / self.launch_seconds * 100) if self.launch_seconds > 0 else 0
+        return (f"Standby browsers: {self.hits} used, {self.hidden_seconds:.2f}s of "
+                f"{self.launch_seconds:.2f}s launch time hidden ({hidden_pct:.1f}%)")
+
+    def shutdown(self):
+        """Quit any spare that was launched but never used."""
+        with self._lock:
+            futures = [f for queue in self._pending.values() for f in queue]
+            self._pending.clear()
+        for future in futures:
+            if future.cancel():
+                continue
+            try:
+                release_driver(future.result()[0])
+            except Exception:
+                pass
+        self._executor.shutdown(wait=True)
+
+    def _launch(self, browser):
+        start = time.time()
+        driver = create_driver(browser, self.headless)
+        return driver, time.time() - start
+
+
+def reset_driver_state(driver):
+    """Close extra windows and clear cookies, storage and the current page."""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    driver.execute_script(
+        "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}"
+    )
+    driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
+def _is_alive(driver):
+    """Cheap health check used before handing out a pooled driver."""
+    try:
+        driver.current_url
+        return True
+    except WebDriverException:
+        return False
+
+
+class DriverReaper:
+    """
+    Quit drivers on background threads so teardown leaves the critical path.
+
+    Each quit gets `timeout` seconds; after that the driver service process
+    tree (chromedriver/geckodriver/msedgedriver and its browser) is killed.
+    Temp profile dirs are removed either way. drain() blocks until every
+    submitted driver is gone.
+    """
+
+    def __init__(self, timeout=None, max_workers=4):
+        self.timeout = timeout or float(os.getenv('DRIVER_QUIT_TIMEOUT', '10'))
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="driver-reaper")
+        self._futures = []
+        self._lock = threading.Lock()
+        self.reaped = 0
+        self.killed = 0
+
+    def submit(self, driver):
+        """Queue a driver for shutdown and return immediately."""
+        with self._lock:
+            self._futures = [f for f in self._futures if not f.done()]
+            self._futures.append(self._executor.submit(self._reap, driver))
+
+    def drain(self):
+        """Wait for every pending quit to finish."""
+        with self._lock:
+            futures = list(self._futures)
+            self._futures.clear()
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.warning(f"Driver teardown failed: {e}")
+        return len(futures)
+
+    def _reap(self, driver):
+        service_pid = _service_pid(driver)
+        profile_dir = getattr(driver, "temp_profile_dir", None)
+
+        quitter = threading.Thread(target=_quit_quietly, args=(driver,), daemon=True)
+        quitter.start()
+        quitter.join(self.timeout)
+        if quitter.is_alive() and service_pid:
+            logger.warning(f"driver.quit() exceeded {self.timeout:g}s, killing process tree {service_pid}")
+            _kill_process_tree(service_pid)
+            with self._lock:
+                self.killed += 1
+
+        if profile_dir and os.path.abspath(profile_dir).startswith(os.path.abspath(tempfile.gettempdir())):
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        with self._lock:
+            self.reaped += 1
+
+
+_reaper = None
+
+def get_driver_reaper():
+    """Process-wide reaper shared by fixtures, the pool and standalone tests."""
+    global _reaper
+    if _reaper is None:
+        _reaper = DriverReaper()
+    return _reaper
+
+def release_driver(driver):
+    """Hand a driver to the background reaper instead of calling driver.quit()."""
+    get_driver_reaper().submit(driver)
+
+
+def _quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _service_pid(driver):
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
 
-    return webdriver.Edge(service=service, options=options)
+def _kill_process_tree(pid):
+    """Kill a process and all of its descendants."""
+    if sys.platform.startswith("win"):
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True)
+        return
 
+    # Collect children while the parent is still alive, otherwise they get re-parented
+    try:
+        output = subprocess.run(["pgrep", "-P", str(pid)], capture_output=True, text=True).stdout
+        children = [int(child) for child in output.split()]
+    except (OSError, ValueError):
+        children = []
+    for child in children:
+        _kill_process_tree(child)
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except OSError:
+        pass
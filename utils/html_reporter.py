@@ -1,8 +1,15 @@
+import html
 import json
 import os
 from datetime import datetime
 from typing import Dict, List, Any
 
+from utils.latency_stats import Reservoir
+from utils.trace_export import ChromeTraceWriter, trace_path_for
+
+# Timings from TestMetrics broken out of setup in the phase table
+_SETUP_TIMINGS = ('driver_launch', 'driver_resolve', 'login')
+
 class HTMLReportGenerator:
     """Generate beautiful HTML reports from test results"""
     
@@ -11,12 +18,23 @@ class HTMLReportGenerator:
         self.test_results = []
         self.start_time = None
         self.end_time = None
+        self.schedule = []
+        self.budget_checks = []
+        self.budget_mode = None
+        
+        # Running aggregates, so the summary never needs the full result list
+        self.result_count = 0
+        self.status_counts = {'PASSED': 0, 'FAILED': 0, 'SKIPPED': 0}
+        self.total_duration = 0
+        self.browser_stats = {}
+        self.phase_totals = {}
+        self.step_durations = {}  # step -> Reservoir of passed runs' durations
         
     def add_test_result(self, test_name: str, status: str, duration: float = 0, 
                        details: str = "", error_message: str = "", screenshot_path: str = "", 
-                       browser: str = ""):
-        """Add a test result to the report"""
-        self.test_results.append({
+                       browser: str = "", metrics: Dict[str, Any] = None):
+        """Add a test result to the report (metrics: per-test measurements, e.g. 'steps')"""
+        result = {
             'name': test_name,
             'status': status.upper(),
             'duration': duration,
@@ -24,93 +42,80 @@ class HTMLReportGenerator:
             'error_message': error_message,
             'screenshot_path': screenshot_path,
             'timestamp': datetime.now().isoformat(),
-            'browser': browser.lower() if browser else ""
-        })
+            'browser': browser.lower() if browser else "",
+            'metrics': metrics or {}
+        }
+        self._aggregate(result)
+        self._record(result)
     
     def set_session_times(self, start_time: datetime, end_time: datetime):
         """Set the session start and end times"""
         self.start_time = start_time
         self.end_time = end_time
     
+    def set_schedule_summary(self, workers: List[Dict[str, Any]]):
+        """Set per-worker predicted and actual durations from a parallel run"""
+        self.schedule = workers
+    
+    def set_budget_summary(self, checks: List[Dict[str, Any]], mode: str):
+        """Set session-wide performance budget checks (see utils.performance_budgets)"""
+        self.budget_checks = checks
+        self.budget_mode = mode
+    
     def generate_html_report(self, output_path: str) -> str:
-        """Generate the HTML report"""
+        """Generate the HTML report, plus <report>.trace.json with the tests' page-object spans"""
         # Ensure reports directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        # Calculate summary statistics
-        total_tests = len(self.test_results)
-        passed_tests = sum(1 for result in self.test_results if result['status'] == 'PASSED')
-        failed_tests = sum(1 for result in self.test_results if result['status'] == 'FAILED')
-        skipped_tests = sum(1 for result in self.test_results if result['status'] == 'SKIPPED')
-        
-        pass_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
-        total_duration = sum(result['duration'] for result in self.test_results)
-        
-        # Generate HTML content
-        html_content = self._generate_html_template(
-            total_tests, passed_tests, failed_tests, skipped_tests, 
-            pass_rate, total_duration
-        )
+        parts = [self._generate_document_start(), self._generate_summary_sections(), self._generate_results_table_start()]
+        parts.extend(self._generate_result_rows(i, result) for i, result in enumerate(self.test_results, 1))
+        parts.append(self._generate_results_table_end())
+        parts.append(self._generate_document_end())
         
         # Write to file
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+            f.write("".join(parts))
+        
+        traces = ChromeTraceWriter(trace_path_for(output_path))
+        for result in self.test_results:
+            traces.add(result['name'], result['metrics'].get('trace'))
+        traces.close()
         
         return output_path
     
-    def _generate_html_template(self, total_tests: int, passed_tests: int, 
-                               failed_tests: int, skipped_tests: int, 
-                               pass_rate: float, total_duration: float) -> str:
-        """Generate the complete HTML template"""
-        
-         # Calculate browser statistics
-        browser_stats = self._get_browser_statistics()
-        browser_summary_cards = self._generate_browser_summary_cards(browser_stats)
-        
-        # Test results table rows
-        test_rows = ""
-        for i, result in enumerate(self.test_results, 1):
-            status_class = result['status'].lower()
-            status_icon = self._get_status_icon(result['status'])
-            duration_str = f"{result['duration']:.2f}s" if result['duration'] > 0 else "N/A"
-            
-             # Add browser icon to the display name
-            browser = result.get('browser', 'unknown')
-            browser_icon = self._get_browser_icon(browser)
-            display_name = result['name']
-
-            error_details = ""
-            if result['error_message']:
-                error_details = f"""
-                <div class="error-details" style="display: none;">
-                    <pre>{result['error_message']}</pre>
-                </div>
-                """
-            
-            test_rows += f"""
-            <tr class="test-row {status_class}" data-browser="{browser}"onclick="toggleDetails({i})">
-                <td>{i}</td>
-                <td class="test-name">
-                    <span class="browser-icon">{browser_icon}</span>
-                    {display_name}
-                </td>
-                <td class="status {status_class}">
-                    <span class="status-icon">{status_icon}</span>
-                    {result['status']}
-                </td>
-                <td>{duration_str}</td>
-                <td>{result.get('timestamp', '').split('T')[1][:8] if result.get('timestamp') else 'N/A'}</td>
-            </tr>
-            <tr class="details-row" id="details-{i}" data-browser="{browser}"style="display: none;">
-                <td colspan="5">
-                    <div class="test-details">
-                        {result['details']}
-                        {error_details}
-                    </div>
-                </td>
-            </tr>
-            """
-        
+    def _record(self, result):
+        """Keep a result until the report is generated"""
+        self.test_results.append(result)
+    
+    def _aggregate(self, result):
+        """Fold one result into the running totals used by the summary sections"""
+        self.result_count += 1
+        if result['status'] in self.status_counts:
+            self.status_counts[result['status']] += 1
+        self.total_duration += result['duration']
+        
+        browser = result.get('browser') or 'unknown'
+        stats = self.browser_stats.setdefault(browser, {'total': 0, 'passed': 0, 'failed': 0, 'skipped': 0})
+        stats['total'] += 1
+        if result['status'] in ('PASSED', 'FAILED', 'SKIPPED'):
+            stats[result['status'].lower()] += 1
+        
+        metrics = result['metrics']
+        phases = metrics.get('phases')
+        if phases:
+            totals = self.phase_totals.setdefault(browser, dict.fromkeys(('tests', 'setup', 'call', 'teardown') + _SETUP_TIMINGS, 0))
+            totals['tests'] += 1
+            for phase in ('setup', 'call', 'teardown'):
+                totals[phase] += phases.get(phase, 0)
+            for name in _SETUP_TIMINGS:
+                totals[name] += metrics.get('timings', {}).get(name, 0)
+        
+        for step in metrics.get('steps', []):
+            if step['status'] != 'failed':
+                self.step_durations.setdefault(step['step'], Reservoir()).add(step['duration'])
+    
+    def _generate_document_start(self, container_class="container"):
+        """Everything before the first section: head, styles, scripts and the page container"""
         return f"""
 <!DOCTYPE html>
 <html lang="en">
@@ -121,16 +126,35 @@ class HTMLReportGenerator:
     <style>
         {self._get_css_styles()}
     </style>
+    <script>
+        {self._get_javascript()}
+    </script>
 </head>
 <body>
-    <div class="container">
+    <div class="{container_class}">
+        """
+    
+    def _generate_document_end(self):
+        return """
+    </div>
+</body>
+</html>
+        """
+    
+    def _generate_summary_sections(self):
+        """Header, summary cards, browser cards and session-wide sections"""
+        total_tests = self.result_count
+        passed_tests = self.status_counts['PASSED']
+        pass_rate = (passed_tests / total_tests * 100) if total_tests > 0 else 0
+        
+        return f"""
         <header>
             <h1>{self.project_name}</h1>
             <h2>Cross-Browser Test Execution Report</h2>
             <div class="report-meta">
                 <span>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</span>
-                <span>Duration: {total_duration:.2f}s</span>
-                <span>Browsers: {len(browser_stats)} tested</span>
+                <span>Duration: {self.total_duration:.2f}s</span>
+                <span>Browsers: {len(self.browser_stats)} tested</span>
             </div>
         </header>
 
@@ -145,11 +169,11 @@ class HTMLReportGenerator:
             </div>
             <div class="card failed">
                 <h3>Failed</h3>
-                <div class="number">{failed_tests}</div>
+                <div class="number">{self.status_counts['FAILED']}</div>
             </div>
             <div class="card skipped">
                 <h3>Skipped</h3>
-                <div class="number">{skipped_tests}</div>
+                <div class="number">{self.status_counts['SKIPPED']}</div>
             </div>
             <div class="card pass-rate">
                 <h3>Pass Rate</h3>
@@ -160,8 +184,17 @@ class HTMLReportGenerator:
             </div>
         </div>
 
-        {browser_summary_cards}
+        {self._generate_browser_summary_cards(self.browser_stats)}
 
+        {self._generate_schedule_section()}
+
+        {self._generate_budget_section()}
+
+        {self._generate_phase_section()}
+        """
+    
+    def _generate_results_table_start(self):
+        return """
         <div class="test-results">
             <h3>Test Results by Browser</h3>
              <div class="browser-filter">
@@ -181,43 +214,65 @@ class HTMLReportGenerator:
                     </tr>
                 </thead>
                 <tbody id="test-results-body">
-                    {test_rows}
+        """
+    
+    def _generate_results_table_end(self):
+        return """
                 </tbody>
             </table>
         </div>
-    </div>
-
-    <script>
-        {self._get_javascript()}
-    </script>
-</body>
-</html>
         """
     
-    def _get_browser_statistics(self):
-        """Calculate statistics per browser"""
-        browser_stats = {}
-        for result in self.test_results:
-            browser = result.get('browser', 'unknown')
-            if browser not in browser_stats:
-                browser_stats[browser] = {'total': 0, 'passed': 0, 'failed': 0, 'skipped': 0}
-            
-            browser_stats[browser]['total'] += 1
-            if result['status'] == 'PASSED':
-                browser_stats[browser]['passed'] += 1
-            elif result['status'] == 'FAILED':
-                browser_stats[browser]['failed'] += 1
-            elif result['status'] == 'SKIPPED':
-                browser_stats[browser]['skipped'] += 1
-        
-        return browser_stats
+    def _generate_result_rows(self, i, result):
+        """The summary row and the hidden details row of one result"""
+        status_class = result['status'].lower()
+        status_icon = self._get_status_icon(result['status'])
+        duration_str = f"{result['duration']:.2f}s" if result['duration'] > 0 else "N/A"
+        
+         # Add browser icon to the display name
+        browser = result.get('browser', 'unknown')
+        browser_icon = self._get_browser_icon(browser)
+        display_name = result['name']
+
+        error_details = ""
+        if result['error_message']:
+            error_details = f"""
+                <div class="error-details" style="display: none;">
+                    <pre>{result['error_message']}</pre>
+                </div>
+                """
+        
+        return f"""
+            <tr class="test-row {status_class}" data-browser="{browser}"onclick="toggleDetails({i})">
+                <td>{i}</td>
+                <td class="test-name">
+                    <span class="browser-icon">{browser_icon}</span>
+                    {display_name}
+                </td>
+                <td class="status {status_class}">
+                    <span class="status-icon">{status_icon}</span>
+                    {result['status']}
+                </td>
+                <td>{duration_str}</td>
+                <td>{result.get('timestamp', '').split('T')[1][:8] if result.get('timestamp') else 'N/A'}</td>
+            </tr>
+            <tr class="details-row" id="details-{i}" data-browser="{browser}"style="display: none;">
+                <td colspan="5">
+                    <div class="test-details">
+                        {result['details']}
+                        {self._generate_metrics_details(result.get('metrics', {}))}
+                        {error_details}
+                    </div>
+                </td>
+            </tr>
+            """
     
     def _generate_browser_summary_cards(self, browser_stats):
         """Generate browser-specific summary cards"""
         if not browser_stats:
             return ""
         
-        cards_html = '<div class="browser-summary-cards"><h3>Browser Performance</h3><div class="browser-cards">'
+        cards = ['<div class="browser-summary-cards"><h3>Browser Performance</h3><div class="browser-cards">']
         
         for browser, stats in browser_stats.items():
             if browser == 'unknown':
@@ -226,7 +281,7 @@ class HTMLReportGenerator:
             browser_icon = self._get_browser_icon(browser)
             pass_rate = (stats['passed'] / stats['total'] * 100) if stats['total'] > 0 else 0
             
-            cards_html += f"""
+            cards.append(f"""
             <div class="browser-card">
                 <div class="browser-header">
                     <span class="browser-icon-large">{browser_icon}</span>
@@ -253,10 +308,216 @@ class HTMLReportGenerator:
                     </div>
                 </div>
             </div>
-            """
+            """)
+        
+        cards.append('</div></div>')
+        return "".join(cards)
+    
+    def _generate_schedule_section(self):
+        """Generate predicted vs actual makespan for parallel runs"""
+        if not self.schedule:
+            return ""
+        
+        predicted_makespan = max(worker['predicted'] for worker in self.schedule)
+        actual_makespan = max(worker['actual'] for worker in self.schedule)
+        
+        rows = []
+        for worker in self.schedule:
+            fill = (worker['actual'] / actual_makespan * 100) if actual_makespan > 0 else 0
+            rows.append(f"""
+                <tr>
+                    <td>{worker['worker']}</td>
+                    <td>{worker['tests']}</td>
+                    <td>{worker['predicted']:.2f}s</td>
+                    <td>{worker['actual']:.2f}s</td>
+                    <td><div class="mini-progress-bar"><div class="mini-progress-fill" style="width: {fill:.1f}%"></div></div></td>
+                </tr>""")
+        
+        return f"""
+        <div class="schedule-summary">
+            <h3>Worker Schedule</h3>
+            <div class="report-meta schedule-meta">
+                <span>Predicted makespan: {predicted_makespan:.2f}s</span>
+                <span>Actual makespan: {actual_makespan:.2f}s</span>
+                <span>Workers: {len(self.schedule)}</span>
+            </div>
+            <table class="results-table schedule-table">
+                <thead>
+                    <tr><th>Worker</th><th>Tests</th><th>Predicted</th><th>Actual</th><th>Load</th></tr>
+                </thead>
+                <tbody>{''.join(rows)}
+                </tbody>
+            </table>
+        </div>
+        """
+    
+    def _generate_phase_section(self):
+        """Generate per-browser time spent in setup/teardown (infrastructure) versus test bodies"""
+        totals = self.phase_totals
+        if not totals:
+            return ""
+        
+        rows = []
+        for browser, stats in sorted(totals.items()):
+            wall_clock = stats['setup'] + stats['call'] + stats['teardown']
+            infrastructure = (stats['setup'] + stats['teardown']) / wall_clock * 100 if wall_clock > 0 else 0
+            rows.append(f"""
+                <tr>
+                    <td>{self._get_browser_icon(browser)} {browser.title()}</td>
+                    <td>{stats['tests']}</td>
+                    <td>{wall_clock:.2f}s</td>
+                    <td>{stats['setup']:.2f}s</td>
+                    <td>{stats['driver_launch']:.2f}s</td>
+                    <td>{stats['driver_resolve']:.2f}s</td>
+                    <td>{stats['login']:.2f}s</td>
+                    <td>{stats['call']:.2f}s</td>
+                    <td>{stats['teardown']:.2f}s</td>
+                    <td>{infrastructure:.1f}%</td>
+                    <td><div class="mini-progress-bar"><div class="mini-progress-fill" style="width: {infrastructure:.1f}%"></div></div></td>
+                </tr>""")
         
-        cards_html += '</div></div>'
-        return cards_html
+        return f"""
+        <div class="schedule-summary">
+            <h3>Infrastructure vs Test Time</h3>
+            <table class="results-table schedule-table">
+                <thead>
+                    <tr><th>Browser</th><th>Tests</th><th>Wall clock</th><th>Setup</th><th>Driver launch</th><th>Binary resolution</th><th>Login</th><th>Test body</th><th>Teardown</th><th>Infrastructure</th><th></th></tr>
+                </thead>
+                <tbody>{''.join(rows)}
+                </tbody>
+            </table>
+        </div>
+        """
+    
+    def _generate_budget_section(self):
+        """Generate the session-wide performance budgets (step percentiles across browsers)"""
+        if not self.budget_checks:
+            return ""
+        
+        return f"""
+        <div class="schedule-summary">
+            <h3>Performance Budgets ({self.budget_mode})</h3>
+            {self._generate_budget_table(self.budget_checks)}
+        </div>
+        """
+    
+    def _generate_metrics_details(self, metrics):
+        """Generate the per-test measurement tables shown in a result's details row"""
+        return (self._generate_steps_table(metrics.get('steps', []))
+                + self._generate_commands_table(metrics.get('commands'))
+                + self._generate_budget_table(metrics.get('budgets', []))
+                + self._generate_trace_waterfall(metrics.get('trace')))
+    
+    def _generate_trace_waterfall(self, trace, max_rows=300):
+        """Generate a timeline of the page-object and helper spans of a test"""
+        if not trace or not trace['spans']:
+            return ""
+        
+        spans = trace['spans']
+        total = max(start + duration for _, start, duration, _, _ in spans) or 1
+        rows = []
+        for name, start, duration, depth, error in spans[:max_rows]:
+            bar_class = 'trace-bar failed' if error else 'trace-bar'
+            title = f"{name}: {duration * 1000:.0f}ms at +{start:.3f}s" + (f" ({error})" if error else "")
+            rows.append(f"""
+                    <div class="trace-row" title="{html.escape(title)}">
+                        <div class="trace-name" style="padding-left: {depth * 14}px">{html.escape(name)}</div>
+                        <div class="trace-track"><div class="{bar_class}" style="left: {start / total * 100:.2f}%; width: {max(duration / total * 100, 0.2):.2f}%"></div></div>
+                        <div class="trace-duration">{duration * 1000:.0f}ms</div>
+                    </div>""")
+        
+        hidden = len(spans) - min(len(spans), max_rows) + trace.get('dropped', 0)
+        more = f'<div class="trace-more">{hidden} more span(s) not shown</div>' if hidden else ""
+        return f"""
+                <div class="trace-waterfall">
+                    <h4>Timeline ({total:.2f}s)</h4>{''.join(rows)}
+                    {more}
+                </div>"""
+    
+    def _generate_budget_table(self, checks):
+        """Generate a table of budgets next to the measured values"""
+        if not checks:
+            return ""
+        
+        rows = []
+        for check in checks:
+            status_class = 'failed' if check['exceeded'] else 'passed'
+            actual = f"{check['actual']:.3f}" if isinstance(check['actual'], float) else check['actual']
+            rows.append(f"""
+                    <tr>
+                        <td>{check['scope']}</td>
+                        <td>{check['metric']}</td>
+                        <td>{check['budget']}</td>
+                        <td>{actual}</td>
+                        <td class="status {status_class}">{'exceeded' if check['exceeded'] else 'within'}</td>
+                    </tr>""")
+        
+        return f"""
+                <table class="results-table steps-table">
+                    <thead>
+                        <tr><th>Budget</th><th>Metric</th><th>Limit</th><th>Actual</th><th>Outcome</th></tr>
+                    </thead>
+                    <tbody>{''.join(rows)}
+                    </tbody>
+                </table>"""
+    
+    def _generate_steps_table(self, steps):
+        """Generate the step timing table for pipelines such as checkout"""
+        if not steps:
+            return ""
+        
+        total = sum(step['duration'] for step in steps) or 1
+        rows = []
+        for step in steps:
+            status_class = 'failed' if step['status'] == 'failed' else 'passed'
+            error = f" - {step['error']}" if step.get('error') else ""
+            rows.append(f"""
+                    <tr>
+                        <td>{step['step']}</td>
+                        <td class="status {status_class}">{step['status']}{error}</td>
+                        <td>{step['attempts']}</td>
+                        <td>{step['duration']:.2f}s</td>
+                        <td>{step['commands']}</td>
+                        <td><div class="mini-progress-bar"><div class="mini-progress-fill" style="width: {step['duration'] / total * 100:.1f}%"></div></div></td>
+                    </tr>""")
+        
+        return f"""
+                <table class="results-table steps-table">
+                    <thead>
+                        <tr><th>Step</th><th>Outcome</th><th>Attempts</th><th>Duration</th><th>Commands</th><th>Share</th></tr>
+                    </thead>
+                    <tbody>{''.join(rows)}
+                    </tbody>
+                </table>"""
+    
+    def _generate_commands_table(self, commands):
+        """Generate the WebDriver command totals and the slowest commands of a test"""
+        if not commands:
+            return ""
+        
+        by_name = sorted(commands['by_name'].items(), key=lambda item: item[1]['duration'], reverse=True)
+        totals = ", ".join(f"{name} {stats['count']}x {stats['duration']:.2f}s" for name, stats in by_name)
+        rows = []
+        for command in commands['slowest']:
+            status_class = 'failed' if command['error'] else 'passed'
+            rows.append(f"""
+                    <tr>
+                        <td>{html.escape(command['command'])}</td>
+                        <td>{html.escape(command['target'])}</td>
+                        <td>{html.escape(command['source'])}</td>
+                        <td class="status {status_class}">{html.escape(command['error'] or 'ok')}</td>
+                        <td>{command['duration']:.3f}s</td>
+                    </tr>""")
+        
+        return f"""
+                <div class="commands-summary">WebDriver commands: {commands['count']} in {commands['duration']:.2f}s, {commands['errors']} error(s) - {html.escape(totals)}</div>
+                <table class="results-table steps-table">
+                    <thead>
+                        <tr><th>Slowest command</th><th>Target</th><th>Issued by</th><th>Outcome</th><th>Duration</th></tr>
+                    </thead>
+                    <tbody>{''.join(rows)}
+                    </tbody>
+                </table>"""
     
     def _get_browser_icon(self, browser):
         """Get emoji icon for browser"""
@@ -603,6 +864,99 @@ class HTMLReportGenerator:
             font-size: 1.1em;
         }
         
+        .schedule-summary {
+            padding: 0 30px 30px;
+            background: #f8f9fa;
+        }
+        
+        .schedule-summary h3 {
+            color: #2c3e50;
+            margin-bottom: 15px;
+            font-size: 1.3em;
+        }
+        
+        .schedule-meta {
+            justify-content: flex-start;
+            margin-bottom: 15px;
+            color: #2c3e50;
+        }
+        
+        .steps-table {
+            margin-top: 15px;
+            font-size: 0.9em;
+        }
+        
+        .container.streaming {
+            display: flex;
+            flex-direction: column;
+        }
+        
+        .container.streaming > .session-summary {
+            order: -1;
+        }
+        
+        .report-in-progress {
+            background: #fff8e1;
+            border-left: 4px solid #FFC107;
+            padding: 12px 16px;
+            margin-bottom: 20px;
+            color: #6d5200;
+        }
+        
+        .commands-summary {
+            margin-top: 15px;
+            font-size: 0.9em;
+            color: #555;
+        }
+        
+        .trace-waterfall {
+            margin-top: 15px;
+            font-size: 0.85em;
+        }
+        
+        .trace-row {
+            display: flex;
+            align-items: center;
+            border-bottom: 1px solid #f0f0f0;
+        }
+        
+        .trace-name {
+            flex: 0 0 35%;
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            font-family: monospace;
+        }
+        
+        .trace-track {
+            flex: 1;
+            position: relative;
+            height: 12px;
+            background: #f7f7f7;
+        }
+        
+        .trace-bar {
+            position: absolute;
+            top: 0;
+            height: 100%;
+            background: #2196F3;
+        }
+        
+        .trace-bar.failed {
+            background: #f44336;
+        }
+        
+        .trace-duration {
+            flex: 0 0 70px;
+            text-align: right;
+            color: #555;
+        }
+        
+        .trace-more {
+            margin-top: 5px;
+            color: #777;
+        }
+        
         .test-row[data-browser="chrome"] { border-left-color: #FFC107; }
         .test-row[data-browser="firefox"] { border-left-color: #FF9800; }
         .test-row[data-browser="edge"] { border-left-color: #2196F3; }
@@ -659,3 +1013,55 @@ class HTMLReportGenerator:
             });
         });
         """
+
+
+class StreamingHTMLReport(HTMLReportGenerator):
+    """
+    HTML report written to disk while the session runs
+
+    Each result's rows are appended to the file (and its spans to the trace
+    file) as soon as it is added; only the running totals stay in memory.
+    Until the session finishes the page shows an "in progress" banner above
+    the rows written so far, so a crashed run still leaves a readable report.
+    generate_html_report() then appends the summary sections, which the
+    stylesheet moves above the results.
+    """
+    
+    def __init__(self, project_name, output_path):
+        super().__init__(project_name)
+        self.output_path = output_path
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        self._traces = ChromeTraceWriter(trace_path_for(output_path))
+        self._file = open(output_path, 'w', encoding='utf-8')
+        self._file.write(self._generate_document_start("container streaming"))
+        self._file.write(f"""
+        <div class="report-in-progress">
+            Report in progress (started {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}): results appear as tests finish, the summary is added when the session ends.
+        </div>
+        """)
+        self._file.write(self._generate_results_table_start())
+        self._file.flush()
+    
+    def _record(self, result):
+        """Append the result's rows and spans instead of keeping it"""
+        if self._file is None:
+            return
+        self._file.write(self._generate_result_rows(self.result_count, result))
+        self._file.flush()
+        self._traces.add(result['name'], result['metrics'].get('trace'))
+    
+    def generate_html_report(self, output_path: str = None) -> str:
+        """Finish the streamed report with the summary sections (output_path is fixed at creation)"""
+        if self._file is not None:
+            self._file.write(self._generate_results_table_end())
+            self._file.write(f"""
+        <div class="session-summary">
+            {self._generate_summary_sections()}
+        </div>
+        <style>.report-in-progress {{ display: none; }}</style>
+        """)
+            self._file.write(self._generate_document_end())
+            self._file.close()
+            self._file = None
+            self._traces.close()
+        return self.output_path
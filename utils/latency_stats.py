@@ -0,0 +1,144 @@
+import math
+import random
+import threading
+from collections import defaultdict
+
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended
+DEFAULT_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 30)
+
+# Values a Reservoir keeps; percentiles are exact until a name has more samples
+RESERVOIR_SIZE = 1000
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile (pct in 0-100) of a list of numbers, None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def histogram(values, buckets=DEFAULT_BUCKETS):
+    """
+    Count values per latency bucket
+
+    Returns:
+        list: (label, count) pairs, e.g. ('<=0.5s', 3) ... ('>30s', 0)
+    """
+    counts = [0] * (len(buckets) + 1)
+    for value in values:
+        for index, bound in enumerate(buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<={bound:g}s" for bound in buckets] + [f">{buckets[-1]:g}s"]
+    return list(zip(labels, counts))
+
+
+class Reservoir:
+    """
+    Fixed-size uniform sample of a stream of values (reservoir sampling)
+
+    Memory stays at `size` values however many are added, and percentile()
+    over the sample is exact until then. Iterating yields the kept values,
+    so a Reservoir can be passed to percentile() and histogram() directly;
+    `count` and `max` cover every value added.
+    """
+
+    def __init__(self, size=RESERVOIR_SIZE, seed=0):
+        self.size = size
+        self.count = 0
+        self.max = None
+        self._values = []
+        self._random = random.Random(seed)
+
+    def add(self, value):
+        self.count += 1
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self._values) < self.size:
+            self._values.append(value)
+            return
+        index = self._random.randrange(self.count)
+        if index < self.size:
+            self._values[index] = value
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+
+class LatencyRecorder:
+    """
+    Thread-safe latency samples and errors grouped by name (scenario, step, ...)
+
+    Latencies go into a Reservoir per name, so memory stays bounded however
+    long the run is; counts, mean and max still cover every sample.
+    """
+
+    def __init__(self):
+        self._samples = defaultdict(Reservoir)
+        self._totals = defaultdict(float)
+        self._errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, ok=True):
+        with self._lock:
+            if ok:
+                self._samples[name].add(seconds)
+                self._totals[name] += seconds
+            else:
+                self._errors[name] += 1
+
+    def durations(self, name):
+        """Kept latencies for a name (a uniform sample once it has more than RESERVOIR_SIZE)"""
+        with self._lock:
+            return list(self._samples.get(name, []))
+
+    def names(self):
+        with self._lock:
+            return sorted(set(self._samples) | set(self._errors))
+
+    def summary(self, name, elapsed):
+        """
+        Latency percentiles and rates for one name
+
+        Args:
+            elapsed (float): Wall-clock seconds the rates are computed over
+
+        Returns:
+            dict: {'completed', 'errors', 'per_second', 'errors_per_minute',
+                   'mean', 'p50', 'p95', 'p99', 'max'} (latencies in seconds)
+        """
+        with self._lock:
+            samples = self._samples.get(name)
+            completed = samples.count if samples else 0
+            peak = samples.max if samples else None
+            durations = list(samples) if samples else []
+            total = self._totals.get(name, 0.0)
+            errors = self._errors.get(name, 0)
+        elapsed = max(elapsed, 1e-9)
+        return {
+            'completed': completed,
+            'errors': errors,
+            'per_second': completed / elapsed,
+            'errors_per_minute': errors / elapsed * 60,
+            'mean': total / completed if completed else None,
+            'p50': percentile(durations, 50),
+            'p95': percentile(durations, 95),
+            'p99': percentile(durations, 99),
+            'max': peak
+        }
+
+
+def format_seconds(value):
+    return f"{value:.2f}s" if value is not None else "-"
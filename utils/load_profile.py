@@ -0,0 +1,269 @@
+"""
+Drive the E2E checkout scenarios as a virtual-user load profile.
+
+Usage:
+    python -m utils.load_profile --users 10 --ramp-up 60 --steady 300 --ramp-down 30
+    python -m utils.load_profile --users 4 --ramp-up 10 --steady 60 --ramp-down 10 --base-url http://127.0.0.1:8000
+
+The number of virtual users follows the profile: it grows linearly to
+--users during ramp-up, holds for the steady phase and shrinks during
+ramp-down. Each user owns a headless browser and loops login -> add items ->
+checkout with the regular page objects and helpers. A user asked to stop
+finishes its current iteration first. The run reports p50/p95/p99 and a
+histogram per step, errors per minute and completed checkouts per second,
+in the log and as JSON next to the reports.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from pages.login_page import LoginPage
+from pages.routes import set_base_url
+from utils.cart_helper import CartHelper
+from utils.checkout_helper import CheckoutHelper
+from utils.drivers import create_driver, release_driver, reset_driver_state
+from utils.latency_stats import LatencyRecorder, format_seconds, histogram
+from utils.orchestrator import load_credentials, load_scenarios
+from utils.session_files import configure_file_logging, prepare_session_files
+
+logger = logging.getLogger(__name__)
+
+# Seconds between adjustments of the virtual-user count
+TICK_SECONDS = 0.5
+
+
+class LoadProfile:
+    """Ramp-up, steady and ramp-down phases for a peak number of virtual users"""
+
+    def __init__(self, users, ramp_up=60, steady=300, ramp_down=30):
+        self.users = max(1, users)
+        self.ramp_up = max(0, ramp_up)
+        self.steady = max(0, steady)
+        self.ramp_down = max(0, ramp_down)
+
+    @property
+    def duration(self):
+        return self.ramp_up + self.steady + self.ramp_down
+
+    def users_at(self, elapsed):
+        """Target number of virtual users `elapsed` seconds into the run"""
+        if elapsed < self.ramp_up:
+            return max(1, round(self.users * elapsed / self.ramp_up))
+        if elapsed < self.ramp_up + self.steady:
+            return self.users
+        if elapsed < self.duration:
+            remaining = self.duration - elapsed
+            return round(self.users * remaining / self.ramp_down)
+        return 0
+
+
+class VirtualUserRunner:
+    """Start and stop virtual users to follow a LoadProfile and record step latencies"""
+
+    def __init__(self, profile, scenarios, browser="chrome", headless=True):
+        self.profile = profile
+        self.scenarios = scenarios
+        self.browser = browser
+        self.headless = headless
+        self.credentials = load_credentials()
+        self.steps = LatencyRecorder()
+        self.checkouts = 0
+        self.errors = 0
+        self.peak_users = 0
+        self._counter_lock = threading.Lock()
+
+    def run(self):
+        """
+        Run the whole profile, then wait for every user to finish its iteration
+
+        Returns:
+            dict: Run summary (see summary())
+        """
+        active = []
+        stopping = []
+        started = time.monotonic()
+        logger.info(f"Load profile: up to {self.profile.users} user(s), ramp-up {self.profile.ramp_up}s, "
+                    f"steady {self.profile.steady}s, ramp-down {self.profile.ramp_down}s")
+
+        user_index = 0
+        while True:
+            elapsed = time.monotonic() - started
+            if elapsed >= self.profile.duration:
+                break
+            target = self.profile.users_at(elapsed)
+            while len(active) < target:
+                stop = threading.Event()
+                thread = threading.Thread(target=self._virtual_user, args=(user_index, stop),
+                                          name=f"vu-{user_index + 1}", daemon=True)
+                thread.start()
+                active.append((thread, stop))
+                user_index += 1
+            while len(active) > target:
+                thread, stop = active.pop()
+                stop.set()
+                stopping.append(thread)
+            self.peak_users = max(self.peak_users, len(active))
+            time.sleep(TICK_SECONDS)
+
+        for thread, stop in active:
+            stop.set()
+            stopping.append(thread)
+        for thread in stopping:
+            thread.join()
+
+        return self.summary(time.monotonic() - started)
+
+    def summary(self, elapsed):
+        steps = {}
+        for name in self.steps.names():
+            stats = self.steps.summary(name, elapsed)
+            stats['histogram'] = histogram(self.steps.durations(name))
+            steps[name] = stats
+        minutes = elapsed / 60 if elapsed > 0 else 1
+        return {
+            'peak_users': self.peak_users,
+            'elapsed': elapsed,
+            'checkouts': self.checkouts,
+            'checkouts_per_second': self.checkouts / elapsed if elapsed > 0 else 0,
+            'errors': self.errors,
+            'errors_per_minute': self.errors / minutes,
+            'steps': steps
+        }
+
+    def _virtual_user(self, index, stop):
+        driver = None
+        iteration = 0
+        try:
+            while not stop.is_set():
+                scenario = self.scenarios[(index + iteration) % len(self.scenarios)]
+                iteration += 1
+                if driver is None:
+                    driver = self._timed("launch", lambda: create_driver(self.browser, self.headless))
+                    if driver is None:
+                        self._count(error=True)
+                        stop.wait(1)
+                        continue
+                if self._iteration(driver, scenario):
+                    reset_driver_state(driver)
+                else:
+                    # Don't carry a broken page or half-built cart into the next loop
+                    release_driver(driver)
+                    driver = None
+        finally:
+            if driver is not None:
+                release_driver(driver)
+
+    def _iteration(self, driver, scenario):
+        """login -> add items -> checkout; True if the checkout completed"""
+        started = time.monotonic()
+        cart_helper = CartHelper(driver)
+
+        def log_in():
+            login_page = LoginPage(driver)
+            login_page.load()
+            login_page.login(self.credentials["username"], self.credentials["password"])
+            return "inventory" in driver.current_url
+
+        def add_items():
+            # Always through the UI: adding items is one of the measured steps
+            result = cart_helper.add_items_to_cart(scenario["items_to_add"])
+            return result if result['total_added'] > 0 else None
+
+        add_result = None
+        if self._timed("login", log_in):
+            add_result = self._timed("add_items", add_items)
+        if add_result is None or not self._timed("to_checkout", cart_helper.proceed_to_checkout):
+            self._count(error=True)
+            return False
+
+        customer = scenario["customer_info"]
+        try:
+            result = CheckoutHelper(driver).complete_full_checkout_flow(
+                customer["first_name"], customer["last_name"], customer["postal_code"],
+                expected_items_count=add_result['total_added'], return_home=True
+            )
+        except Exception as e:
+            logger.error(f"Checkout raised: {e}")
+            result = {'success': False, 'steps': []}
+        for step in result.get('steps', []):
+            self.steps.record(f"checkout.{step['step']}", step['duration'], step['status'] != 'failed')
+
+        self.steps.record("iteration", time.monotonic() - started, result['success'])
+        self._count(error=not result['success'])
+        return result['success']
+
+    def _timed(self, name, action):
+        """Run one step, record its latency, and return its result (None on error)"""
+        started = time.monotonic()
+        try:
+            result = action()
+        except Exception as e:
+            logger.error(f"Step '{name}' raised: {str(e).splitlines()[0] if str(e) else type(e).__name__}")
+            result = None
+        self.steps.record(name, time.monotonic() - started, bool(result))
+        return result
+
+    def _count(self, error):
+        with self._counter_lock:
+            if error:
+                self.errors += 1
+            else:
+                self.checkouts += 1
+
+
+def log_summary(summary):
+    lines = [f"{'Step':<22}{'Done':>6}{'Errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'Max':>9}"]
+    for name, stats in summary['steps'].items():
+        lines.append(f"{name:<22}{stats['completed']:>6}{stats['errors']:>8}{format_seconds(stats['p50']):>9}"
+                     f"{format_seconds(stats['p95']):>9}{format_seconds(stats['p99']):>9}{format_seconds(stats['max']):>9}")
+        lines.append("    " + "  ".join(f"{label}: {count}" for label, count in stats['histogram']))
+    lines.append(f"Checkouts: {summary['checkouts']} ({summary['checkouts_per_second']:.3f}/s), "
+                 f"errors: {summary['errors']} ({summary['errors_per_minute']:.2f}/min), "
+                 f"peak users: {summary['peak_users']}, elapsed: {summary['elapsed']:.2f}s")
+    for line in lines:
+        logger.info(line)
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the checkout scenarios as a virtual-user load profile")
+    parser.add_argument("--users", type=int, default=5, help="Peak number of virtual users")
+    parser.add_argument("--ramp-up", type=float, default=60, help="Seconds to grow to the peak")
+    parser.add_argument("--steady", type=float, default=300, help="Seconds to hold the peak")
+    parser.add_argument("--ramp-down", type=float, default=30, help="Seconds to shrink back to zero")
+    parser.add_argument("--scenario", action="append", help="Only run this scenario (repeatable)")
+    parser.add_argument("--browser", default="chrome", choices=["chrome", "firefox", "edge"])
+    parser.add_argument("--headed", action="store_true", help="Show the browsers")
+    parser.add_argument("--base-url", default=None, help="Storefront to target (default SAUCEDEMO_BASE_URL or saucedemo.com)")
+    args = parser.parse_args(argv)
+
+    if args.base_url:
+        set_base_url(args.base_url)
+
+    scenarios = load_scenarios(args.scenario)
+    if not scenarios:
+        print("No matching scenarios")
+        return 2
+
+    start_time = datetime.now()
+    log_file_path, report_file_path = prepare_session_files("load_profile", start_time)
+    configure_file_logging(log_file_path, "%(asctime)s - %(levelname)s - %(threadName)s - %(message)s")
+
+    profile = LoadProfile(args.users, args.ramp_up, args.steady, args.ramp_down)
+    summary = VirtualUserRunner(profile, scenarios, args.browser, not args.headed).run()
+    log_summary(summary)
+
+    summary_path = os.path.splitext(report_file_path)[0] + ".json"
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Summary: {summary_path}")
+    return 0 if summary['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,431 @@
+"""
+A local stand-in for the SauceDemo storefront, for offline runs and benchmarks.
+
+Usage:
+    python -m utils.local_storefront --port 8000
+    python -m utils.local_storefront --port 8000 --latency "*=50" --latency cart=300 --error-rate checkout_overview=0.05
+
+Serves the routes in pages/routes.py with the element ids and classes the
+page objects use. Like the real site, the login session is a
+`session-username` cookie and the cart lives in localStorage under
+"cart-contents", so the auth cache, the cart seeder and checkpoints work
+unchanged. Every route can be given a fixed latency (ms) and an error rate
+(share of requests answered with HTTP 500); "*" applies to all routes.
+
+Point the suite at it with LOCAL_STOREFRONT=true (conftest starts one on a
+free port), or start it here and pass --base-url to the orchestrator and
+load profile.
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pages.routes import ROUTES
+from utils.cart_seeder import CART_STORAGE_KEY, PRODUCTS
+
+logger = logging.getLogger(__name__)
+
+PASSWORD = "secret_sauce"
+USERS = ["standard_user", "locked_out_user", "problem_user", "performance_glitch_user", "error_user", "visual_user"]
+LOCKED_OUT_USERS = ["locked_out_user"]
+TAX_RATE = 0.08
+
+# Product id -> (price, description)
+_PRODUCT_DETAILS = {
+    4: (29.99, "carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style "
+               "with unequaled laptop and tablet protection."),
+    0: (9.99, "A red light isn't the desired state in testing but it sure helps when riding your bike at night. "
+              "Water-resistant with 3 lighting modes, 1 AAA battery included."),
+    1: (15.99, "Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, "
+               "100% ringspun combed cotton, heather gray with red bolt."),
+    5: (49.99, "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling "
+               "everything from a relaxing day outdoors to a busy day at the office."),
+    2: (7.99, "Rib snap infant onesie for the junior automation engineer in development. "
+              "Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel."),
+    3: (15.99, "This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate "
+               "a few tests. Super-soft and comfy ringspun combed cotton.")
+}
+
+CATALOG = [
+    {'id': product_id, 'name': name, 'price': _PRODUCT_DETAILS[product_id][0], 'desc': _PRODUCT_DETAILS[product_id][1]}
+    for product_id, name in PRODUCTS
+]
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Swag Labs</title>
+<style>
+body {{ font-family: sans-serif; margin: 0; }}
+.primary_header {{ display: flex; justify-content: space-between; padding: 12px 20px; background: #132322; color: #fff; }}
+.shopping_cart_link {{ color: #fff; display: inline-block; min-width: 24px; min-height: 24px; }}
+.shopping_cart_link::before {{ content: "Cart"; margin-right: 6px; }}
+.shopping_cart_badge {{ background: #e2231a; border-radius: 50%; padding: 2px 7px; }}
+#root > div {{ padding: 0 20px 20px; }}
+.inventory_item, .cart_item {{ border-bottom: 1px solid #ddd; padding: 12px 0; }}
+.error-message-container.error {{ background: #e2231a; color: #fff; padding: 4px 10px; }}
+input, button {{ display: block; margin: 8px 0; padding: 6px 10px; }}
+</style>
+</head>
+<body>
+<div id="root"></div>
+<script>
+window.__PAGE__ = {page};
+window.__STORE__ = {store};
+</script>
+<script>
+{app}
+</script>
+</body>
+</html>
+"""
+
+# Client-side app: renders the requested page and keeps the cart in localStorage
+_APP_SCRIPT = r"""
+(function () {
+  var page = window.__PAGE__, store = window.__STORE__, products = store.products;
+  var root = document.getElementById('root');
+  var links = store.links;
+
+  function escape(text) {
+    var div = document.createElement('div');
+    div.textContent = String(text);
+    return div.innerHTML;
+  }
+  function money(value) { return '$' + value.toFixed(2); }
+  function slug(name) { return name.toLowerCase().replace(/ /g, '-'); }
+  function product(id) { return products.filter(function (p) { return p.id === id; })[0]; }
+  function cart() {
+    try { return JSON.parse(localStorage.getItem(store.cartKey) || '[]'); } catch (e) { return []; }
+  }
+  function saveCart(ids) { localStorage.setItem(store.cartKey, JSON.stringify(ids)); }
+  function currentUser() {
+    var match = document.cookie.match(/(?:^|; )session-username=([^;]*)/);
+    return match ? decodeURIComponent(match[1]) : null;
+  }
+  function go(route) { window.location.href = links[route]; }
+  function on(id, handler) { document.getElementById(id).addEventListener('click', handler); }
+  function showError(message) {
+    var container = root.querySelector('.error-message-container');
+    container.classList.add('error');
+    container.innerHTML = '<h3 data-test="error">' + escape(message) + '</h3>';
+  }
+
+  function header() {
+    return '<div class="primary_header"><div class="app_logo">Swag Labs</div>' +
+      '<a class="shopping_cart_link" href="' + links.cart + '"></a></div>';
+  }
+  function updateBadge() {
+    var link = root.querySelector('.shopping_cart_link'), count = cart().length;
+    var badge = link.querySelector('.shopping_cart_badge');
+    if (!count) { if (badge) { badge.remove(); } return; }
+    if (!badge) {
+      badge = document.createElement('span');
+      badge.className = 'shopping_cart_badge';
+      link.appendChild(badge);
+    }
+    badge.textContent = String(count);
+  }
+  function cartList() {
+    return '<div class="cart_list">' + cart().map(product).filter(Boolean).map(function (p) {
+      return '<div class="cart_item"><div class="cart_quantity">1</div><div class="cart_item_label">' +
+        '<a id="item_' + p.id + '_title_link" href="#"><div class="inventory_item_name">' + escape(p.name) + '</div></a>' +
+        '<div class="inventory_item_desc">' + escape(p.desc) + '</div>' +
+        '<div class="item_pricebar"><div class="inventory_item_price">' + money(p.price) + '</div></div>' +
+        '</div></div>';
+    }).join('') + '</div>';
+  }
+
+  var pages = {
+    login: function () {
+      root.innerHTML = '<div class="login_wrapper"><form id="login-form">' +
+        '<input id="user-name" name="user-name" type="text" placeholder="Username" autocomplete="off">' +
+        '<input id="password" name="password" type="password" placeholder="Password" autocomplete="off">' +
+        '<div class="error-message-container"></div>' +
+        '<input id="login-button" name="login-button" type="submit" value="Login">' +
+        '</form></div>';
+      document.getElementById('login-form').addEventListener('submit', function (event) {
+        event.preventDefault();
+        var username = document.getElementById('user-name').value;
+        var password = document.getElementById('password').value;
+        if (!username) { return showError('Epic sadface: Username is required'); }
+        if (!password) { return showError('Epic sadface: Password is required'); }
+        if (store.users.indexOf(username) === -1 || password !== store.password) {
+          return showError('Epic sadface: Username and password do not match any user in this service');
+        }
+        if (store.lockedOut.indexOf(username) !== -1) {
+          return showError('Epic sadface: Sorry, this user has been locked out.');
+        }
+        document.cookie = 'session-username=' + encodeURIComponent(username) + '; path=/';
+        go('inventory');
+      });
+    },
+    inventory: function () {
+      var ids = cart();
+      root.innerHTML = header() + '<div class="inventory_container"><div class="inventory_list">' +
+        products.map(function (p) {
+          var inCart = ids.indexOf(p.id) !== -1;
+          return '<div class="inventory_item"><div class="inventory_item_description"><div class="inventory_item_label">' +
+            '<a id="item_' + p.id + '_title_link" href="#"><div class="inventory_item_name">' + escape(p.name) + '</div></a>' +
+            '<div class="inventory_item_desc">' + escape(p.desc) + '</div></div>' +
+            '<div class="pricebar"><div class="inventory_item_price">' + money(p.price) + '</div>' +
+            '<button class="btn btn_inventory" data-id="' + p.id + '" id="' + (inCart ? 'remove-' : 'add-to-cart-') +
+            escape(slug(p.name)) + '">' + (inCart ? 'Remove' : 'Add to cart') + '</button></div></div></div>';
+        }).join('') + '</div></div>';
+      updateBadge();
+      Array.prototype.forEach.call(root.querySelectorAll('.btn_inventory'), function (button) {
+        button.addEventListener('click', function () {
+          // Update in place like the real site: the list and other buttons keep their identity
+          var id = Number(button.getAttribute('data-id')), ids = cart(), p = product(id);
+          var index = ids.indexOf(id);
+          if (index === -1) { ids.push(id); } else { ids.splice(index, 1); }
+          saveCart(ids);
+          button.id = (index === -1 ? 'remove-' : 'add-to-cart-') + slug(p.name);
+          button.textContent = index === -1 ? 'Remove' : 'Add to cart';
+          updateBadge();
+        });
+      });
+    },
+    cart: function () {
+      root.innerHTML = header() + '<div class="cart_contents_container">' + cartList() +
+        '<button id="continue-shopping">Continue Shopping</button>' +
+        '<button id="checkout">Checkout</button></div>';
+      updateBadge();
+      on('continue-shopping', function () { go('inventory'); });
+      on('checkout', function () { go('checkout_info'); });
+    },
+    checkout_info: function () {
+      root.innerHTML = header() + '<div class="checkout_info_container"><form id="checkout-form">' +
+        '<input id="first-name" name="firstName" type="text" placeholder="First Name">' +
+        '<input id="last-name" name="lastName" type="text" placeholder="Last Name">' +
+        '<input id="postal-code" name="postalCode" type="text" placeholder="Zip/Postal Code">' +
+        '<div class="error-message-container"></div>' +
+        '<button id="cancel" type="button">Cancel</button>' +
+        '<input id="continue" name="continue" type="submit" value="Continue">' +
+        '</form></div>';
+      updateBadge();
+      on('cancel', function () { go('cart'); });
+      document.getElementById('checkout-form').addEventListener('submit', function (event) {
+        event.preventDefault();
+        var fields = [['first-name', 'First Name'], ['last-name', 'Last Name'], ['postal-code', 'Postal Code']];
+        for (var i = 0; i < fields.length; i++) {
+          if (!document.getElementById(fields[i][0]).value) {
+            return showError('Error: ' + fields[i][1] + ' is required');
+          }
+        }
+        go('checkout_overview');
+      });
+    },
+    checkout_overview: function () {
+      var subtotal = cart().map(product).filter(Boolean).reduce(function (sum, p) { return sum + p.price; }, 0);
+      var tax = Math.round(subtotal * store.taxRate * 100) / 100;
+      root.innerHTML = header() + '<div class="checkout_summary_container">' + cartList() +
+        '<div class="summary_info">' +
+        '<div class="summary_subtotal_label">Item total: ' + money(subtotal) + '</div>' +
+        '<div class="summary_tax_label">Tax: ' + money(tax) + '</div>' +
+        '<div class="summary_total_label">Total: ' + money(subtotal + tax) + '</div>' +
+        '<button id="cancel">Cancel</button><button id="finish">Finish</button></div></div>';
+      updateBadge();
+      on('cancel', function () { go('inventory'); });
+      on('finish', function () { saveCart([]); go('checkout_complete'); });
+    },
+    checkout_complete: function () {
+      root.innerHTML = header() + '<div class="checkout_complete_container">' +
+        '<h2 class="complete-header">Thank you for your order!</h2>' +
+        '<div class="complete-text">Your order has been dispatched, and will arrive just as fast as the pony can get there!</div>' +
+        '<button id="back-to-products">Back Home</button></div>';
+      updateBadge();
+      on('back-to-products', function () { go('inventory'); });
+    }
+  };
+
+  if (page !== 'login' && !currentUser()) {
+    window.location.replace(links.login);
+    return;
+  }
+  pages[page]();
+})();
+"""
+
+
+def parse_route_values(pairs, cast=float):
+    """
+    Parse "route=value" settings (CLI flags or comma-separated env vars)
+
+    Args:
+        pairs (list or str): e.g. ["*=50", "cart=300"] or "*=50,cart=300"
+
+    Returns:
+        dict: route name (or "*") -> value
+    """
+    if isinstance(pairs, str):
+        pairs = [pair for pair in pairs.split(",") if pair.strip()]
+    values = {}
+    for pair in pairs or []:
+        route, sep, value = pair.partition("=")
+        route = route.strip()
+        if not sep or (route != "*" and route not in ROUTES):
+            raise ValueError(f"Expected <route>=<value> with a route from {sorted(ROUTES)} or '*', got '{pair}'")
+        values[route] = cast(value)
+    return values
+
+
+class LocalStorefront:
+    """
+    Threaded HTTP server rendering the SauceDemo pages, with injectable latency and errors
+
+    Args:
+        latency_ms (dict): route name (or "*") -> milliseconds to wait before answering
+        error_rates (dict): route name (or "*") -> share of requests (0-1) answered with HTTP 500
+        seed (int): Seed for the error injection, for repeatable runs
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=None, error_rates=None, seed=None):
+        self.host = host
+        self.port = port
+        self.latency_ms = dict(latency_ms or {})
+        self.error_rates = dict(error_rates or {})
+        self.requests = 0
+        self.injected_errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self._paths = {"/" + path: route for route, (path, _) in ROUTES.items()}
+        self._paths["/index.html"] = "login"
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self):
+        """Serve in a background thread; returns the base URL"""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="local-storefront", daemon=True)
+        self._thread.start()
+        logger.info(f"Local storefront serving {self.base_url} (latency {self.latency_ms or 'none'}, "
+                    f"error rates {self.error_rates or 'none'})")
+        return self.base_url
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        logger.info(f"Local storefront stopped after {self.requests} request(s), "
+                    f"{self.injected_errors} injected error(s)")
+
+    def render(self, route):
+        links = {name: "/" + path for name, (path, _) in ROUTES.items()}
+        store = {
+            'products': CATALOG,
+            'users': USERS,
+            'lockedOut': LOCKED_OUT_USERS,
+            'password': PASSWORD,
+            'taxRate': TAX_RATE,
+            'cartKey': CART_STORAGE_KEY,
+            'links': links
+        }
+        return _PAGE_TEMPLATE.format(page=json.dumps(route), store=json.dumps(store), app=_APP_SCRIPT)
+
+    def _respond(self, path):
+        """(status, body) for a request path, after the route's injected latency and errors"""
+        route = self._paths.get(path.split("?", 1)[0])
+        if route is None:
+            return 404, "Not found"
+
+        latency = self.latency_ms.get(route, self.latency_ms.get("*", 0))
+        if latency:
+            time.sleep(latency / 1000)
+        error_rate = self.error_rates.get(route, self.error_rates.get("*", 0))
+        with self._lock:
+            self.requests += 1
+            failed = error_rate and self._random.random() < error_rate
+            if failed:
+                self.injected_errors += 1
+        if failed:
+            return 500, f"Injected error for route '{route}'"
+        return 200, self.render(route)
+
+    def _handler_class(self):
+        storefront = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body = storefront._respond(self.path)
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8" if status == 200 else "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                logger.debug(f"Local storefront: {self.address_string()} {format % args}")
+
+        return Handler
+
+
+def local_storefront_enabled():
+    return os.getenv('LOCAL_STOREFRONT', 'false').lower() == 'true'
+
+
+def storefront_from_env():
+    """
+    A LocalStorefront configured from the environment
+
+    LOCAL_STOREFRONT_LATENCY and LOCAL_STOREFRONT_ERRORS take comma-separated
+    route=value pairs (milliseconds / 0-1 rates); LOCAL_STOREFRONT_SEED seeds
+    the error injection.
+    """
+    seed = os.getenv('LOCAL_STOREFRONT_SEED')
+    return LocalStorefront(
+        latency_ms=parse_route_values(os.getenv('LOCAL_STOREFRONT_LATENCY', '')),
+        error_rates=parse_route_values(os.getenv('LOCAL_STOREFRONT_ERRORS', '')),
+        seed=int(seed) if seed else None
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a local SauceDemo stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", action="append", default=[], metavar="ROUTE=MS",
+                        help="Delay a route's responses (repeatable, '*' for all routes)")
+    parser.add_argument("--error-rate", action="append", default=[], metavar="ROUTE=RATE",
+                        help="Answer this share (0-1) of a route's requests with HTTP 500 (repeatable)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the error injection")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        storefront = LocalStorefront(args.host, args.port, parse_route_values(args.latency),
+                                     parse_route_values(args.error_rate), args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    storefront.start()
+    print(f"Serving {storefront.base_url} - Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        storefront.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+Run the E2E checkout scenarios as many concurrent browser sessions.
+
+Usage:
+    python -m utils.orchestrator --sessions 4 --iterations 5
+    python -m utils.orchestrator --sessions 8 --scenario single_item_purchase --base-url http://127.0.0.1:8000
+
+Each session is a thread with its own browser (own temp profile, cookies and
+storage), so journeys never share app state. At most --sessions browsers run
+at once and at most --max-queued journeys wait behind them; scheduling more
+blocks until a session frees up. The run reports throughput and latency
+percentiles per scenario, in the log and as JSON next to the reports.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from pages.login_page import LoginPage
+from pages.routes import set_base_url
+from utils.auth_cache import auth_cache_enabled, get_auth_cache
+from utils.cart_helper import CartHelper
+from utils.checkout_helper import CheckoutHelper
+from utils.drivers import create_driver, release_driver, reset_driver_state
+from utils.latency_stats import LatencyRecorder, format_seconds
+from utils.session_files import PROJECT_ROOT, configure_file_logging, prepare_session_files
+
+logger = logging.getLogger(__name__)
+
+CHECKOUT_DATA_PATH = os.path.join(PROJECT_ROOT, "data", "checkout_data.json")
+LOGIN_DATA_PATH = os.path.join(PROJECT_ROOT, "data", "login_data.json")
+
+
+def load_scenarios(names=None):
+    """e2e_test_scenarios from checkout_data.json, optionally only the named ones"""
+    with open(CHECKOUT_DATA_PATH, encoding="utf-8") as f:
+        scenarios = json.load(f)["e2e_test_scenarios"]
+    if names:
+        scenarios = [scenario for scenario in scenarios if scenario["test_name"] in names]
+    return scenarios
+
+
+def load_credentials():
+    with open(LOGIN_DATA_PATH, encoding="utf-8") as f:
+        return json.load(f)["users"][0]
+
+
+def run_checkout_journey(driver, browser, scenario, credentials):
+    """
+    One complete journey on a driver: log in, fill the cart, check out, return home
+
+    Returns:
+        dict: {'success': bool, 'error': str or None}
+    """
+    if auth_cache_enabled():
+        get_auth_cache().login(driver, browser, credentials["username"], credentials["password"])
+    else:
+        login_page = LoginPage(driver)
+        login_page.load()
+        login_page.login(credentials["username"], credentials["password"])
+
+    cart_helper = CartHelper(driver)
+    add_result = cart_helper.build_cart(scenario["items_to_add"], scenario.get("cart_setup", "ui"))
+    if add_result['total_added'] == 0:
+        return {'success': False, 'error': "No items could be added"}
+    if not cart_helper.proceed_to_checkout():
+        return {'success': False, 'error': "Could not reach checkout"}
+
+    customer = scenario["customer_info"]
+    checkout_result = CheckoutHelper(driver).complete_full_checkout_flow(
+        customer["first_name"], customer["last_name"], customer["postal_code"],
+        expected_items_count=add_result['total_added'], return_home=True
+    )
+    return {'success': checkout_result['success'], 'error': checkout_result.get('error')}
+
+
+class ScenarioOrchestrator:
+    """Run checkout journeys on a pool of concurrent, isolated browser sessions"""
+
+    def __init__(self, scenarios, sessions=4, iterations=1, browser="chrome", headless=True, max_queued=None):
+        self.scenarios = scenarios
+        self.sessions = max(1, sessions)
+        self.iterations = max(1, iterations)
+        self.browser = browser
+        self.headless = headless
+        self.max_queued = max_queued if max_queued is not None else self.sessions
+        self.credentials = load_credentials()
+        self.latencies = LatencyRecorder()
+        self._local = threading.local()
+        self._drivers = []
+        self._drivers_lock = threading.Lock()
+
+    def run(self):
+        """
+        Run every scenario `iterations` times across the sessions
+
+        Returns:
+            dict: Per-scenario summaries (see LatencyRecorder.summary) plus run totals
+        """
+        # Running journeys plus queued ones never exceed this many
+        slots = threading.BoundedSemaphore(self.sessions + self.max_queued)
+        started = time.monotonic()
+        logger.info(f"Orchestrator: {len(self.scenarios)} scenario(s) x {self.iterations} on "
+                    f"{self.sessions} {self.browser} session(s)")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.sessions, thread_name_prefix="session") as pool:
+                futures = []
+                for _ in range(self.iterations):
+                    for scenario in self.scenarios:
+                        slots.acquire()
+                        future = pool.submit(self._journey, scenario)
+                        future.add_done_callback(lambda _: slots.release())
+                        futures.append(future)
+                for future in futures:
+                    future.result()
+        finally:
+            with self._drivers_lock:
+                drivers, self._drivers = self._drivers, []
+            for driver in drivers:
+                release_driver(driver)
+
+        return self.summary(time.monotonic() - started)
+
+    def summary(self, elapsed):
+        scenarios = {name: self.latencies.summary(name, elapsed) for name in self.latencies.names()}
+        completed = sum(stats['completed'] for stats in scenarios.values())
+        errors = sum(stats['errors'] for stats in scenarios.values())
+        return {
+            'sessions': self.sessions,
+            'browser': self.browser,
+            'elapsed': elapsed,
+            'completed': completed,
+            'errors': errors,
+            'per_second': completed / elapsed if elapsed > 0 else 0,
+            'scenarios': scenarios
+        }
+
+    def _journey(self, scenario):
+        name = scenario["test_name"]
+        started = time.monotonic()
+        try:
+            driver = self._session_driver()
+            result = run_checkout_journey(driver, self.browser, scenario, self.credentials)
+            reset_driver_state(driver)
+        except Exception as e:
+            result = {'success': False, 'error': str(e).splitlines()[0] if str(e) else type(e).__name__}
+            self._discard_session_driver()
+        duration = time.monotonic() - started
+
+        self.latencies.record(name, duration, result['success'])
+        if result['success']:
+            logger.info(f"[{threading.current_thread().name}] {name} completed in {duration:.2f}s")
+        else:
+            logger.error(f"[{threading.current_thread().name}] {name} failed after {duration:.2f}s: {result['error']}")
+
+    def _session_driver(self):
+        """This session thread's browser, launched on first use"""
+        driver = getattr(self._local, "driver", None)
+        if driver is None:
+            driver = create_driver(self.browser, self.headless)
+            self._local.driver = driver
+            with self._drivers_lock:
+                self._drivers.append(driver)
+        return driver
+
+    def _discard_session_driver(self):
+        """Drop a browser whose state can't be trusted; the session relaunches on its next journey"""
+        driver = getattr(self._local, "driver", None)
+        self._local.driver = None
+        if driver is None:
+            return
+        with self._drivers_lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        release_driver(driver)
+
+
+def log_summary(summary):
+    lines = [
+        f"{'Scenario':<28}{'Done':>6}{'Errors':>8}{'Per sec':>9}{'p50':>9}{'p95':>9}{'p99':>9}",
+    ]
+    for name, stats in summary['scenarios'].items():
+        lines.append(f"{name:<28}{stats['completed']:>6}{stats['errors']:>8}{stats['per_second']:>9.3f}"
+                     f"{format_seconds(stats['p50']):>9}{format_seconds(stats['p95']):>9}{format_seconds(stats['p99']):>9}")
+    lines.append(f"Total: {summary['completed']} journey(s), {summary['errors']} error(s) in {summary['elapsed']:.2f}s "
+                 f"({summary['per_second']:.3f}/s on {summary['sessions']} session(s))")
+    for line in lines:
+        logger.info(line)
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run checkout scenarios on concurrent browser sessions")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent browser sessions (global cap)")
+    parser.add_argument("--iterations", type=int, default=1, help="Times each scenario is run")
+    parser.add_argument("--scenario", action="append", help="Only run this scenario (repeatable)")
+    parser.add_argument("--browser", default="chrome", choices=["chrome", "firefox", "edge"])
+    parser.add_argument("--max-queued", type=int, default=None, help="Journeys allowed to wait for a session (default: --sessions)")
+    parser.add_argument("--headed", action="store_true", help="Show the browsers")
+    parser.add_argument("--base-url", default=None, help="Storefront to target (default SAUCEDEMO_BASE_URL or saucedemo.com)")
+    args = parser.parse_args(argv)
+
+    if args.base_url:
+        set_base_url(args.base_url)
+
+    scenarios = load_scenarios(args.scenario)
+    if not scenarios:
+        print("No matching scenarios")
+        return 2
+
+    start_time = datetime.now()
+    log_file_path, report_file_path = prepare_session_files("orchestrator", start_time)
+    configure_file_logging(log_file_path, "%(asctime)s - %(levelname)s - %(threadName)s - %(message)s")
+
+    orchestrator = ScenarioOrchestrator(scenarios, args.sessions, args.iterations, args.browser,
+                                        not args.headed, args.max_queued)
+    summary = orchestrator.run()
+    log_summary(summary)
+
+    summary_path = os.path.splitext(report_file_path)[0] + ".json"
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Summary: {summary_path}")
+    return 0 if summary['errors'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
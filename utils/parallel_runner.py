@@ -0,0 +1,365 @@
+"""
+Run the suite on several pytest worker processes and merge their results.
+
+Usage:
+    python -m utils.parallel_runner tests/e2e_checkout.py --workers auto
+    python -m utils.parallel_runner tests/e2e_checkout.py tests/inventory.py --workers 4 --pytest-args "-k purchase"
+
+The controller collects the nodeids, splits them across workers, and each
+worker streams its results back over a local socket. The controller writes
+one HTML report and one merged log, exactly like a serial run.
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import secrets
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from multiprocessing.connection import Client, Listener
+
+from utils.html_reporter import HTMLReportGenerator
+from utils.performance_budgets import apply_suite_budgets
+from utils.session_files import (PROJECT_ROOT, configure_file_logging, merge_log_files,
+                                 prepare_session_files, session_name_from_args)
+from utils.test_scheduler import DurationStore, records_duration, schedule_longest_first
+
+logger = logging.getLogger(__name__)
+
+CONTROLLER_ADDRESS_ENV = "SUITE_CONTROLLER_ADDRESS"
+CONTROLLER_AUTHKEY_ENV = "SUITE_CONTROLLER_AUTHKEY"
+
+# Rough footprint of one worker: python + driver + browser + one standby spare
+DEFAULT_WORKER_MEMORY_MB = 1024
+
+RESULTS_FILE_ENV = "SUITE_RESULTS_FILE"
+
+
+class JsonLinesChannel:
+    """Results channel that appends messages to a JSON-lines file (used by CI shards)"""
+
+    def __init__(self, path):
+        self._file = open(path, "a", encoding="utf-8")
+
+    def send(self, message):
+        self._file.write(json.dumps(message) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def connect_to_controller():
+    """Open the results channel from a worker to its controller (None outside parallel/shard runs)"""
+    results_file = os.getenv(RESULTS_FILE_ENV)
+    if results_file:
+        return JsonLinesChannel(results_file)
+
+    address = os.getenv(CONTROLLER_ADDRESS_ENV)
+    if not address:
+        return None
+    host, port = address.rsplit(":", 1)
+    return Client((host, int(port)), authkey=bytes.fromhex(os.environ[CONTROLLER_AUTHKEY_ENV]))
+
+
+def available_memory_mb():
+    """Physical memory currently available, or None if it can't be determined"""
+    if sys.platform.startswith("win"):
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(status)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys // (1024 * 1024)
+        return None
+
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def default_worker_count(test_count, memory_per_worker_mb=None):
+    """Size the worker pool by CPU count and available memory"""
+    memory_per_worker_mb = memory_per_worker_mb or int(os.getenv("PARALLEL_WORKER_MEMORY_MB", DEFAULT_WORKER_MEMORY_MB))
+    workers = os.cpu_count() or 1
+
+    memory_mb = available_memory_mb()
+    if memory_mb is not None:
+        workers = min(workers, memory_mb // memory_per_worker_mb)
+
+    return max(1, min(workers, test_count))
+
+
+def collect_nodeids(paths, pytest_args=None):
+    """Collect test nodeids without starting a session log or report"""
+    work_dir = tempfile.mkdtemp(prefix="parallel-collect-")
+    env = dict(os.environ, SUITE_WORKER_ID="collector", SUITE_WORKER_LOG=os.path.join(work_dir, "collect.log"))
+    try:
+        output = subprocess.run(
+            [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider", *paths, *(pytest_args or [])],
+            cwd=PROJECT_ROOT, env=env, capture_output=True, text=True
+        ).stdout
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return [line.strip() for line in output.splitlines() if "::" in line and not line.startswith(" ")]
+
+
+class ParallelRunner:
+    """Controller for a parallel run: starts workers, gathers results, writes one report"""
+
+    def __init__(self, paths, workers="auto", pytest_args=None, project_name="Selenium E2E Test Suite"):
+        self.paths = list(paths)
+        self.workers = workers
+        self.pytest_args = list(pytest_args or [])
+        self.project_name = project_name
+        self.results = []
+        self.exit_codes = {}
+        self.durations = DurationStore()
+        self.predicted_loads = []
+        self.worker_finish_times = {}
+
+    def run(self):
+        """Run every collected test across the workers and return a pytest-style exit code"""
+        start_time = datetime.now()
+        session_name = session_name_from_args(self.paths)
+        log_file_path, report_file_path = prepare_session_files(session_name, start_time)
+        work_dir = tempfile.mkdtemp(prefix="parallel-run-")
+
+        controller_log = os.path.join(work_dir, "controller.log")
+        configure_file_logging(controller_log, "%(asctime)s - %(levelname)s - [controller] %(message)s")
+
+        nodeids = collect_nodeids(self.paths, self.pytest_args)
+        if not nodeids:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            print("No tests collected")
+            return 5
+
+        worker_count = default_worker_count(len(nodeids)) if self.workers == "auto" else max(1, min(int(self.workers), len(nodeids)))
+        assignments = self.plan(nodeids, worker_count)
+        logger.info(f"Parallel run: {len(nodeids)} test(s) on {len(assignments)} worker(s)")
+        print(f"Running {len(nodeids)} test(s) on {len(assignments)} worker(s)")
+
+        authkey = secrets.token_bytes(16)
+        listener = Listener(("127.0.0.1", 0), authkey=authkey)
+        messages = queue.Queue()
+        connections = []
+        threading.Thread(target=self._accept_loop, args=(listener, messages, connections), daemon=True).start()
+
+        processes = {}
+        worker_logs = []
+        workers_started_at = time.time()
+        for index, chunk in enumerate(assignments, 1):
+            worker_id = f"worker-{index}"
+            nodeid_file = os.path.join(work_dir, f"{worker_id}.nodeids")
+            with open(nodeid_file, "w", encoding="utf-8") as f:
+                f.write("\n".join(chunk))
+            worker_log = os.path.join(work_dir, f"{worker_id}.log")
+            worker_logs.append(worker_log)
+
+            env = dict(os.environ,
+                       SUITE_WORKER_ID=worker_id,
+                       SUITE_WORKER_LOG=worker_log,
+                       SUITE_WORKER_NODEIDS=nodeid_file,
+                       **{CONTROLLER_ADDRESS_ENV: "%s:%d" % listener.address,
+                          CONTROLLER_AUTHKEY_ENV: authkey.hex()})
+            output = open(os.path.join(work_dir, f"{worker_id}.out"), "w", encoding="utf-8")
+            processes[worker_id] = (subprocess.Popen(
+                [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *self.paths, *self.pytest_args],
+                cwd=PROJECT_ROOT, env=env, stdout=output, stderr=subprocess.STDOUT
+            ), output)
+            logger.info(f"Started {worker_id} with {len(chunk)} test(s)")
+
+        # Consume streamed results until every worker has exited and its channel is drained
+        while True:
+            try:
+                self._handle_message(messages.get(timeout=0.5))
+                continue
+            except queue.Empty:
+                pass
+            if all(process.poll() is not None for process, _ in processes.values()):
+                time.sleep(0.2)
+                for connection_thread in list(connections):
+                    connection_thread.join()
+                while not messages.empty():
+                    self._handle_message(messages.get())
+                break
+
+        listener.close()
+        for worker_id, (process, output) in processes.items():
+            output.close()
+            self.exit_codes.setdefault(worker_id, process.returncode)
+            if process.returncode not in (0, 1, 5):
+                logger.error(f"{worker_id} exited with code {process.returncode}")
+                print(f"{worker_id} exited with code {process.returncode}, see {output.name}")
+
+        end_time = datetime.now()
+        schedule = self._schedule_summary(assignments, processes, workers_started_at)
+        self.durations.record_many({result["nodeid"]: result["duration"] for result in self.results
+                                    if records_duration(result["nodeid"], result["status"])})
+        self.durations.save()
+
+        merge_log_files([controller_log, *worker_logs], log_file_path)
+        configure_file_logging(log_file_path)
+        exit_code = self._write_summary(start_time, end_time, report_file_path, schedule)
+
+        if all(code in (0, 1, 5) for code in self.exit_codes.values()):
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return exit_code
+
+    def plan(self, nodeids, worker_count):
+        """Assign nodeids to workers longest-first using historical durations"""
+        assignments, self.predicted_loads = schedule_longest_first(nodeids, worker_count, self.durations)
+        self.predicted_loads = [load for chunk, load in zip(assignments, self.predicted_loads) if chunk]
+        return [chunk for chunk in assignments if chunk]
+
+    def _schedule_summary(self, assignments, processes, workers_started_at):
+        """Predicted vs actual time per worker, used to judge how well the plan balanced"""
+        workers = []
+        for index, (worker_id, chunk) in enumerate(zip(processes, assignments)):
+            finished_at = self.worker_finish_times.get(worker_id, time.time())
+            workers.append({
+                'worker': worker_id,
+                'tests': len(chunk),
+                'predicted': self.predicted_loads[index] if index < len(self.predicted_loads) else 0.0,
+                'actual': finished_at - workers_started_at
+            })
+        return workers
+
+    def _accept_loop(self, listener, messages, connections):
+        while True:
+            try:
+                connection = listener.accept()
+            except OSError:
+                return
+            thread = threading.Thread(target=self._receive_loop, args=(connection, messages), daemon=True)
+            connections.append(thread)
+            thread.start()
+
+    def _receive_loop(self, connection, messages):
+        try:
+            while True:
+                messages.put(connection.recv())
+        except (EOFError, OSError):
+            pass
+        finally:
+            connection.close()
+
+    def _handle_message(self, message):
+        if message.get("type") == "result":
+            result = result_from_message(message)
+            self.results.append(result)
+            print(f"[{message['worker']}] {result['status']}: {result['test_name']}")
+        elif message.get("type") == "done":
+            self.exit_codes[message["worker"]] = message["exitstatus"]
+            self.worker_finish_times[message["worker"]] = time.time()
+
+    def _write_summary(self, start_time, end_time, report_file_path, schedule):
+        return write_session_summary(self.results, start_time, end_time, report_file_path, schedule,
+                              self._exit_code(), self.project_name)
+
+    def _exit_code(self):
+        return combine_exit_codes(self.exit_codes.values())
+
+
+def result_from_message(message):
+    """Turn a streamed worker message into a report result tagged with its worker"""
+    result = dict(message["result"])
+    result["details"] += f"\nWorker: {message['worker']}"
+    result["nodeid"] = message["nodeid"]
+    result["worker"] = message["worker"]
+    return result
+
+
+def combine_exit_codes(codes):
+    """Single pytest-style exit code for several worker or shard processes"""
+    codes = list(codes)
+    if any(code not in (0, 1, 5) for code in codes):
+        return 3
+    if 1 in codes:
+        return 1
+    return 0 if 0 in codes else 5
+
+
+def write_session_summary(results, start_time, end_time, report_file_path, schedule, exit_status,
+                          project_name="Selenium E2E Test Suite"):
+    """
+    Log the session summary and write one HTML report for results gathered from several processes
+
+    Returns:
+        int: The session exit status, after session-wide performance budgets
+    """
+    reporter = HTMLReportGenerator(project_name)
+    for result in results:
+        reporter.add_test_result(
+            test_name=result["test_name"],
+            status=result["status"],
+            duration=result["duration"],
+            details=result["details"],
+            error_message=result["error_message"],
+            browser=result["browser"],
+            metrics=result.get("metrics")
+        )
+    exit_status = apply_suite_budgets(reporter, exit_status)
+    total_tests = len(results)
+    failed_count = sum(1 for result in results if result["status"] == "FAILED")
+    passed_count = sum(1 for result in results if result["status"] == "PASSED")
+    total_duration = (end_time - start_time).total_seconds()
+
+    logging.info("=" * 60)
+    logging.info("TEST SESSION SUMMARY")
+    logging.info("=" * 60)
+    logging.info(f"Total Tests: {total_tests}")
+    logging.info(f"Passed: {passed_count}")
+    logging.info(f"Failed: {failed_count}")
+    logging.info(f"Workers: {len(schedule)}")
+    if schedule:
+        logging.info(f"Makespan: predicted {max(w['predicted'] for w in schedule):.2f}s, "
+                     f"actual {max(w['actual'] for w in schedule):.2f}s")
+    logging.info(f"Duration: {total_duration:.2f}s")
+    logging.info(f"Exit Status: {exit_status}")
+    logging.info(f"Session finished: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    reporter.set_session_times(start_time, end_time)
+    reporter.set_schedule_summary(schedule)
+    report_path = os.path.abspath(reporter.generate_html_report(report_file_path))
+    logging.info(f"📊 HTML Report: {report_path}")
+    logging.info("=" * 60)
+
+    print(f"\n📊 HTML Report Generated!")
+    print(f"📁 File: {report_path}")
+    print(f"📈 Summary: {passed_count}/{total_tests} tests passed in {total_duration:.2f}s on {len(schedule)} worker(s)")
+    return exit_status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Selenium suite on several worker processes")
+    parser.add_argument("paths", nargs="*", default=["tests/e2e_checkout.py"], help="Test files or nodeids to collect")
+    parser.add_argument("--workers", default="auto", help="Number of workers, or 'auto' to size by CPU and memory")
+    parser.add_argument("--pytest-args", default="", help="Extra pytest options passed to collection and workers")
+    args = parser.parse_args(argv)
+
+    runner = ParallelRunner(args.paths, workers=args.workers, pytest_args=shlex.split(args.pytest_args))
+    return runner.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
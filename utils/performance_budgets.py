@@ -0,0 +1,173 @@
+import json
+import logging
+import os
+
+from utils.latency_stats import percentile
+from utils.session_files import PROJECT_ROOT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGETS_PATH = os.path.join(PROJECT_ROOT, "data", "performance_budgets.json")
+
+MODES = ("fail", "warn", "off")
+
+# Per-test budgets: metric -> how to read the actual value from (metrics, duration)
+_TEST_METRICS = {
+    'commands': lambda metrics, duration: metrics.get('commands', {}).get('count'),
+    'command_time': lambda metrics, duration: metrics.get('commands', {}).get('duration'),
+    'duration': lambda metrics, duration: duration
+}
+
+# How test metrics are labelled in checks: the budgeted duration is measured
+# when the test body ends, before teardown, unlike the report's test duration
+_TEST_METRIC_LABELS = {'duration': 'duration (setup + call)'}
+
+# Per-step budgets checked on every run of the step: metric -> step record key
+_STEP_METRICS = {'max': 'duration', 'commands': 'commands'}
+
+# Step budgets checked across the whole session (all tests and browsers)
+_SUITE_PERCENTILES = {'p50': 50, 'p95': 95, 'p99': 99}
+
+
+class PerformanceBudgets:
+    """
+    Round-trip and latency budgets for tests and pipeline steps
+
+    Budgets come from data/performance_budgets.json and from
+    `@pytest.mark.budget(...)` (which wins for its test):
+
+        {
+          "mode": "warn",
+          "tests": {"test_single_item_e2e_purchase": {"commands": 40, "duration": 30}},
+          "steps": {"overview": {"p95": 0.8, "max": 2, "commands": 10}}
+        }
+
+    Test budgets ('commands', 'command_time', 'duration' in seconds of setup
+    plus call, i.e. without teardown) and step
+    'max'/'commands' are checked after each test; step 'p50'/'p95'/'p99'
+    (seconds) are checked once over every run of the step in the session.
+    In "fail" mode an exceeded budget fails the test (or the session, for
+    percentiles); "warn" only logs and reports it. PERFORMANCE_BUDGETS
+    overrides the file's mode.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("PERFORMANCE_BUDGETS_PATH", DEFAULT_BUDGETS_PATH)
+        config = self._load()
+        self.tests = config.get("tests", {})
+        self.steps = config.get("steps", {})
+        mode = os.getenv("PERFORMANCE_BUDGETS", config.get("mode", "warn")).lower()
+        if mode not in MODES:
+            logger.warning(f"Unknown performance budget mode '{mode}', using 'warn'")
+            mode = "warn"
+        self.mode = mode
+
+    def check_test(self, test_name, metrics, duration, marker_budgets=None):
+        """
+        Compare one test's metrics with its budgets
+
+        Args:
+            test_name (str): Test function name, without parameters
+            metrics (dict): The test's metrics (see TestMetrics)
+            duration (float): Setup plus call time in seconds (teardown has not run yet)
+            marker_budgets (dict, optional): Keyword arguments of its budget marker
+
+        Returns:
+            list: Checks, each {'scope', 'metric', 'budget', 'actual', 'exceeded'}
+        """
+        budgets = dict(self.tests.get(test_name, {}))
+        budgets.update(marker_budgets or {})
+        step_budgets = {name: dict(values) for name, values in self.steps.items()}
+        for name, values in budgets.pop("steps", {}).items():
+            step_budgets.setdefault(name, {}).update(values)
+
+        checks = []
+        for metric, budget in budgets.items():
+            if metric not in _TEST_METRICS:
+                logger.warning(f"Unknown test budget '{metric}' for {test_name}")
+                continue
+            actual = _TEST_METRICS[metric](metrics, duration)
+            if actual is not None:
+                checks.append(_check("test", _TEST_METRIC_LABELS.get(metric, metric), budget, actual))
+
+        for step in metrics.get('steps', []):
+            for metric, key in _STEP_METRICS.items():
+                budget = step_budgets.get(step['step'], {}).get(metric)
+                if budget is not None:
+                    checks.append(_check(f"step {step['step']}", metric, budget, step[key]))
+        return checks
+
+    def check_suite(self, step_durations):
+        """
+        Check step percentiles over every run of each step in the session
+
+        Args:
+            step_durations (dict): step name -> durations of its passed runs, a
+                list or a bounded Reservoir (HTMLReportGenerator.step_durations)
+
+        Returns:
+            list: Checks, like check_test()
+        """
+        checks = []
+        for name, values in self.steps.items():
+            for metric, pct in _SUITE_PERCENTILES.items():
+                if metric in values and step_durations.get(name):
+                    checks.append(_check(f"step {name}", metric, values[metric], percentile(step_durations[name], pct)))
+        return checks
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read performance budgets {self.path}: {e}")
+            return {}
+
+
+def _check(scope, metric, budget, actual):
+    return {'scope': scope, 'metric': metric, 'budget': budget, 'actual': actual, 'exceeded': actual > budget}
+
+
+def format_check(check):
+    """e.g. 'step overview p95: 0.912 > 0.8'"""
+    actual = check['actual']
+    actual = f"{actual:.3f}" if isinstance(actual, float) else actual
+    relation = ">" if check['exceeded'] else "<="
+    return f"{check['scope']} {check['metric']}: {actual} {relation} {check['budget']}"
+
+
+def apply_suite_budgets(reporter, exit_status):
+    """
+    Check session-wide step budgets, log them and add them to the report
+
+    Returns:
+        int: The session exit status; 1 instead of 0 when a budget is
+             exceeded in "fail" mode
+    """
+    budgets = get_performance_budgets()
+    if budgets.mode == "off":
+        return exit_status
+    checks = budgets.check_suite(reporter.step_durations)
+    if not checks:
+        return exit_status
+
+    reporter.set_budget_summary(checks, budgets.mode)
+    for check in checks:
+        if check['exceeded']:
+            logger.warning(f"Performance budget exceeded: {format_check(check)}")
+        else:
+            logger.info(f"Performance budget: {format_check(check)}")
+    if budgets.mode == "fail" and exit_status == 0 and any(check['exceeded'] for check in checks):
+        return 1
+    return exit_status
+
+
+_budgets = None
+
+def get_performance_budgets():
+    global _budgets
+    if _budgets is None:
+        _budgets = PerformanceBudgets()
+    return _budgets
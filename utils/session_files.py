@@ -0,0 +1,104 @@
+import glob
+import logging
+import os
+from datetime import datetime
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def session_name_from_args(args):
+    """Name used for log/report files, e.g. 'e2e_checkout' for tests/e2e_checkout.py"""
+    if args:
+        return os.path.splitext(os.path.basename(args[0].split("::")[0]))[0]
+    return "full_suite"
+
+
+def prepare_session_files(test_name_raw, start_time, keep=5):
+    """
+    Create the logs/ and reports/ folders, prune old logs and write the log header
+
+    Args:
+        test_name_raw (str): Session name used as the file prefix
+        start_time (datetime): Session start time written into the header
+        keep (int): Number of logs to keep for this session name (including the new one)
+
+    Returns:
+        tuple: (log_file_path, report_file_path)
+    """
+    log_folder = os.path.join(PROJECT_ROOT, "logs")
+    reports_folder = os.path.join(PROJECT_ROOT, "reports")
+    os.makedirs(log_folder, exist_ok=True)
+    os.makedirs(reports_folder, exist_ok=True)
+
+    timestamp = start_time.strftime("%Y-%m-%d_%H%M")
+    log_file_path = os.path.join(log_folder, f"{test_name_raw}_{timestamp}.txt")
+    report_file_path = os.path.join(reports_folder, f"{test_name_raw}_report_{timestamp}.html")
+
+    # Keep only the most recent logs for this test type
+    matching_logs = glob.glob(os.path.join(log_folder, f"{test_name_raw}_*.txt"))
+    matching_logs.sort(key=os.path.getmtime)
+    if len(matching_logs) >= keep:
+        for file in matching_logs[:len(matching_logs) - (keep - 1)]:
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+
+    write_log_header(log_file_path, test_name_raw, start_time)
+    return log_file_path, report_file_path
+
+
+def write_log_header(log_file_path, test_name_raw, start_time):
+    """Start a log file with the standard session banner"""
+    with open(log_file_path, "w", encoding="utf-8") as f:
+        f.write(f"\n{test_name_raw.upper()} TEST SESSION\n")
+        f.write(f"Started: {start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write("=" * 60 + "\n\n")
+
+
+def configure_file_logging(log_file_path, log_format=LOG_FORMAT):
+    """Route the root logger to a single file, replacing existing handlers"""
+    logger = logging.getLogger()
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+
+    file_handler = logging.FileHandler(log_file_path, mode="a", encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(log_format))
+    logger.setLevel(logging.INFO)
+    logger.addHandler(file_handler)
+    return file_handler
+
+
+def merge_log_files(log_paths, output_path):
+    """
+    Append several worker logs to one file in timestamp order
+
+    Lines without a leading timestamp (tracebacks, multi-line messages) stay
+    attached to the entry above them.
+    """
+    entries = []
+    for worker_index, path in enumerate(log_paths):
+        if not os.path.exists(path):
+            continue
+        worker_entries = []
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if _starts_with_timestamp(line) or not worker_entries:
+                    worker_entries.append([line[:23], worker_index, len(entries) + len(worker_entries), line])
+                else:
+                    worker_entries[-1][3] += line
+        entries.extend(worker_entries)
+
+    entries.sort(key=lambda entry: (entry[0], entry[1], entry[2]))
+    with open(output_path, "a", encoding="utf-8") as out:
+        for entry in entries:
+            out.write(entry[3])
+
+
+def _starts_with_timestamp(line):
+    try:
+        datetime.strptime(line[:19], "%Y-%m-%d %H:%M:%S")
+        return True
+    except ValueError:
+        return False
@@ -0,0 +1,251 @@
+"""
+Split the suite across CI machines and merge the per-shard results.
+
+Usage:
+    python -m utils.shards plan --total 3 --index 0 tests/e2e_checkout.py
+    python -m utils.shards plan --total 3 --output shard-plan.json tests/e2e_checkout.py
+    python -m utils.shards run --total 3 --index 0 --plan shard-plan.json tests/e2e_checkout.py --results-dir shard-results
+    python -m utils.shards merge shard-results
+
+`plan` prints the nodeids of one shard, or writes every shard to a plan
+file with --output. Shards are balanced longest-first from the duration
+history, so the split only depends on the collected nodeids and that
+history. In CI the plan is computed once and handed to every shard with
+--plan, so machines that see different histories still run a disjoint,
+complete split. `run` executes one shard and writes its results (JSON
+lines), log and plan metadata into the results dir. `merge` combines any number of those into
+one HTML report and one log. Run several `run` commands as separate
+processes to try the whole flow locally.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import shlex
+import subprocess
+import sys
+from datetime import datetime
+
+from utils.parallel_runner import (RESULTS_FILE_ENV, collect_nodeids, combine_exit_codes,
+                                   result_from_message, write_session_summary)
+from utils.session_files import (PROJECT_ROOT, configure_file_logging, merge_log_files,
+                                 prepare_session_files)
+from utils.test_scheduler import DurationStore, records_duration, schedule_longest_first
+
+logger = logging.getLogger(__name__)
+
+
+def plan_shards(nodeids, total, store=None):
+    """
+    Deterministic, duration-balanced split of nodeids into shards
+
+    Args:
+        nodeids (list): Every collected nodeid
+        total (int): Number of shards
+
+    Returns:
+        list: (nodeids, predicted seconds) per shard, by shard index
+    """
+    if total < 1:
+        raise ValueError(f"Need at least one shard, got {total}")
+    assignments, loads = schedule_longest_first(sorted(set(nodeids)), total, store or DurationStore())
+    return list(zip(assignments, loads))
+
+
+def plan_shard(nodeids, total, index, store=None):
+    """
+    Deterministic, duration-balanced subset of nodeids for one shard
+
+    Args:
+        nodeids (list): Every collected nodeid
+        total (int): Number of shards
+        index (int): Zero-based shard index
+
+    Returns:
+        tuple: (nodeids for this shard, predicted seconds for this shard)
+    """
+    if not 0 <= index < total:
+        raise ValueError(f"Shard index {index} out of range for {total} shard(s)")
+    return plan_shards(nodeids, total, store)[index]
+
+
+def write_plan(path, nodeids, total, store=None):
+    """Write every shard's nodeids and predicted seconds to a JSON plan file"""
+    shards = [{"index": index, "nodeids": shard_nodeids, "predicted": predicted}
+              for index, (shard_nodeids, predicted) in enumerate(plan_shards(nodeids, total, store))]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"total": total, "shards": shards}, f, indent=2)
+    return path
+
+
+def load_plan_shard(path, total, index):
+    """
+    One shard of a plan file written by write_plan()
+
+    Returns:
+        tuple: (nodeids for this shard, predicted seconds for this shard)
+    """
+    with open(path, encoding="utf-8") as f:
+        plan = json.load(f)
+    if plan["total"] != total:
+        raise ValueError(f"Shard plan {path} has {plan['total']} shard(s), expected {total}")
+    if not 0 <= index < total:
+        raise ValueError(f"Shard index {index} out of range for {total} shard(s)")
+    shard = plan["shards"][index]
+    return shard["nodeids"], shard["predicted"]
+
+
+def run_shard(paths, total, index, results_dir, pytest_args=None, plan_path=None):
+    """
+    Run one shard as a pytest worker and write its results into results_dir
+
+    Args:
+        plan_path (str, optional): Plan file from write_plan(); without one the
+            shard is planned here from the local duration history
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    results_dir = os.path.abspath(results_dir)
+    shard_id = f"shard-{index + 1}of{total}"
+
+    if plan_path:
+        nodeids, predicted = load_plan_shard(plan_path, total, index)
+    else:
+        nodeids, predicted = plan_shard(collect_nodeids(paths, pytest_args), total, index)
+    nodeid_file = os.path.join(results_dir, f"{shard_id}.nodeids")
+    with open(nodeid_file, "w", encoding="utf-8") as f:
+        f.write("\n".join(nodeids))
+
+    results_file = os.path.join(results_dir, f"{shard_id}.jsonl")
+    if os.path.exists(results_file):
+        os.remove(results_file)
+
+    started = datetime.now()
+    exit_code = 5
+    if nodeids:
+        env = dict(os.environ,
+                   SUITE_WORKER_ID=shard_id,
+                   SUITE_WORKER_LOG=os.path.join(results_dir, f"{shard_id}.log"),
+                   SUITE_WORKER_NODEIDS=nodeid_file,
+                   **{RESULTS_FILE_ENV: results_file})
+        exit_code = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *paths, *(pytest_args or [])],
+            cwd=PROJECT_ROOT, env=env
+        ).returncode
+    finished = datetime.now()
+
+    with open(os.path.join(results_dir, f"{shard_id}.meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "shard": shard_id,
+            "index": index,
+            "total": total,
+            "tests": len(nodeids),
+            "predicted": predicted,
+            "started": started.isoformat(),
+            "finished": finished.isoformat(),
+            "exit_code": exit_code
+        }, f, indent=2)
+    return exit_code
+
+
+def merge_shards(results_dirs, session_name="sharded_suite", record_durations=True):
+    """
+    Combine shard results into one HTML report and one merged log
+
+    Returns:
+        int: Combined pytest-style exit code
+    """
+    metas = []
+    for results_dir in results_dirs:
+        for meta_path in glob.glob(os.path.join(results_dir, "**", "*.meta.json"), recursive=True):
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            meta["dir"] = os.path.dirname(meta_path)
+            metas.append(meta)
+    if not metas:
+        print("No shard results found")
+        return 5
+    metas.sort(key=lambda meta: meta["index"])
+
+    results = []
+    for meta in metas:
+        results_file = os.path.join(meta["dir"], f"{meta['shard']}.jsonl")
+        if not os.path.exists(results_file):
+            continue
+        with open(results_file, encoding="utf-8") as f:
+            for line in f:
+                message = json.loads(line)
+                if message.get("type") == "result":
+                    results.append(result_from_message(message))
+
+    start_time = min(datetime.fromisoformat(meta["started"]) for meta in metas)
+    end_time = max(datetime.fromisoformat(meta["finished"]) for meta in metas)
+    schedule = [{
+        'worker': meta["shard"],
+        'tests': meta["tests"],
+        'predicted': meta["predicted"],
+        'actual': (datetime.fromisoformat(meta["finished"]) - datetime.fromisoformat(meta["started"])).total_seconds()
+    } for meta in metas]
+
+    missing = sorted(set(range(metas[0]["total"])) - {meta["index"] for meta in metas})
+    exit_code = combine_exit_codes(meta["exit_code"] for meta in metas)
+    if missing:
+        print(f"Missing results for shard index(es): {missing}")
+        exit_code = 3
+
+    log_file_path, report_file_path = prepare_session_files(session_name, start_time)
+    merge_log_files([os.path.join(meta["dir"], f"{meta['shard']}.log") for meta in metas], log_file_path)
+    configure_file_logging(log_file_path)
+    if missing:
+        logging.error(f"Missing results for shard index(es): {missing}")
+    exit_code = write_session_summary(results, start_time, end_time, report_file_path, schedule, exit_code)
+
+    if record_durations:
+        durations = DurationStore()
+        durations.record_many({result["nodeid"]: result["duration"] for result in results
+                               if records_duration(result["nodeid"], result["status"])})
+        durations.save()
+    return exit_code
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plan, run and merge test shards across CI machines")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name in ("plan", "run"):
+        command = commands.add_parser(name)
+        command.add_argument("paths", nargs="*", default=["tests/e2e_checkout.py"], help="Test files to collect")
+        command.add_argument("--total", type=int, required=True, help="Total number of shards")
+        command.add_argument("--pytest-args", default="", help="Extra pytest options")
+        if name == "plan":
+            command.add_argument("--index", type=int, help="Zero-based index of the shard to print")
+            command.add_argument("--output", help="Write every shard to this plan file instead")
+        else:
+            command.add_argument("--index", type=int, required=True, help="Zero-based index of this shard")
+            command.add_argument("--plan", help="Plan file from `plan --output` (default: plan from local history)")
+            command.add_argument("--results-dir", default="shard-results", help="Where to write results, log and metadata")
+
+    merge = commands.add_parser("merge")
+    merge.add_argument("results_dirs", nargs="+", help="Directories containing shard results")
+    merge.add_argument("--name", default="sharded_suite", help="Session name used for the report and log files")
+    merge.add_argument("--no-record-durations", action="store_true", help="Don't fold shard durations into the history")
+
+    args = parser.parse_args(argv)
+    if args.command == "plan":
+        if (args.index is None) == (args.output is None):
+            parser.error("plan needs exactly one of --index or --output")
+        nodeids = collect_nodeids(args.paths, shlex.split(args.pytest_args))
+        if args.output:
+            write_plan(args.output, nodeids, args.total)
+            print(f"Wrote {args.total} shard(s) of {len(set(nodeids))} test(s) to {args.output}")
+            return 0
+        shard_nodeids, _ = plan_shard(nodeids, args.total, args.index)
+        print("\n".join(shard_nodeids))
+        return 0
+    if args.command == "run":
+        return run_shard(args.paths, args.total, args.index, args.results_dir, shlex.split(args.pytest_args), args.plan)
+    return merge_shards(args.results_dirs, args.name, not args.no_record_durations)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import contextvars
+import copy
+import heapq
+import os
+
+from pages.tracing import start_trace
+
+
+class TestMetrics:
+    """
+    Extra measurements collected while one test runs
+
+    Helpers record into the current test's metrics (if a test is running);
+    conftest attaches them to the test's result so they end up in the HTML
+    report, including results streamed from parallel workers.
+    """
+
+    __test__ = False
+
+    def __init__(self, nodeid, slowest_commands=None):
+        self.nodeid = nodeid
+        self.data = {}
+        self.slowest_commands = slowest_commands or int(os.getenv('COMMAND_METRICS_TOP', '5'))
+        self._slowest = []
+        self._sequence = 0
+        # Page-object and helper spans (see pages.tracing); None when tracing is off
+        self.trace = None
+
+    def add_steps(self, steps):
+        """Append step records (see CheckoutHelper.run_checkout_pipeline)"""
+        self.data.setdefault('steps', []).extend(copy.deepcopy(steps))
+
+    def add_command(self, name, target, source, duration, error=None):
+        """
+        Record one WebDriver command (see utils.webdriver_commands.instrument_driver)
+
+        Keeps totals, per-command-name totals and only the N slowest commands,
+        so a test issuing thousands of commands stays small in the report.
+        """
+        commands = self.data.setdefault('commands', {'count': 0, 'duration': 0.0, 'errors': 0, 'by_name': {}, 'slowest': []})
+        commands['count'] += 1
+        commands['duration'] += duration
+        by_name = commands['by_name'].setdefault(name, {'count': 0, 'duration': 0.0, 'errors': 0})
+        by_name['count'] += 1
+        by_name['duration'] += duration
+        if error:
+            commands['errors'] += 1
+            by_name['errors'] += 1
+
+        self._sequence += 1
+        entry = (duration, self._sequence, {'command': name, 'target': target, 'source': source,
+                                            'duration': duration, 'error': error})
+        if len(self._slowest) < self.slowest_commands:
+            heapq.heappush(self._slowest, entry)
+        elif duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def add_timing(self, name, seconds):
+        """Add to a named share of the test's time (e.g. 'driver_launch', 'login')"""
+        timings = self.data.setdefault('timings', {})
+        timings[name] = timings.get(name, 0) + seconds
+
+    def has_data(self):
+        return bool(self.data) or bool(self.trace and self.trace.spans)
+
+    def to_dict(self):
+        if 'commands' in self.data:
+            self.data['commands']['slowest'] = [record for _, _, record in sorted(self._slowest, reverse=True)]
+        data = copy.deepcopy(self.data)
+        if self.trace and self.trace.spans:
+            data['trace'] = self.trace.to_dict()
+        return data
+
+
+_current = contextvars.ContextVar("test_metrics", default=None)
+
+def start_test_metrics(nodeid):
+    """Begin collecting for a test; replaces whatever the previous test left"""
+    metrics = TestMetrics(nodeid)
+    metrics.trace = start_trace()
+    _current.set(metrics)
+    return metrics
+
+def current_test_metrics():
+    """Metrics of the running test, or None outside a test (or in a thread it didn't start)"""
+    return _current.get()
+
+def record_timing(name, seconds):
+    """Add to the running test's named timing; ignored outside a test"""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.add_timing(name, seconds)
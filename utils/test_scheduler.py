@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import re
+import statistics
+from datetime import datetime
+
+from utils.session_files import PROJECT_ROOT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DURATIONS_PATH = os.path.join(PROJECT_ROOT, ".cache", "test_durations.json")
+
+# Used when there is no history at all
+DEFAULT_ESTIMATE = 10.0
+
+# Weight of the newest run in the moving average
+SMOOTHING = 0.5
+
+_BROWSER_PARAM = re.compile(r"(?<=[\[-])(chrome|firefox|edge)(?=[\]-])")
+
+
+class DurationStore:
+    """
+    Per-nodeid test durations persisted across runs
+
+    Nodeids already include the browser param (e.g. '...::test_x[firefox]'),
+    so each browser keeps its own history. Durations are smoothed with an
+    exponential moving average so one slow run doesn't dominate.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("TEST_DURATIONS_PATH", DEFAULT_DURATIONS_PATH)
+        self.durations = self._load()
+
+    def record(self, nodeid, duration):
+        """Fold a new measurement into the history for a nodeid"""
+        entry = self.durations.get(nodeid)
+        if entry:
+            entry["duration"] = SMOOTHING * duration + (1 - SMOOTHING) * entry["duration"]
+            entry["runs"] += 1
+        else:
+            entry = {"duration": duration, "runs": 1}
+        entry["updated"] = datetime.now().isoformat(timespec="seconds")
+        self.durations[nodeid] = entry
+
+    def record_many(self, durations):
+        for nodeid, duration in durations.items():
+            self.record(nodeid, duration)
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.durations, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save test durations to {self.path}: {e}")
+
+    def estimate(self, nodeid):
+        """
+        Expected duration of a test in seconds
+
+        Falls back, in order, to: the same test on other browsers scaled by
+        how slow this browser usually is, the median of this browser's
+        tests, the median of all tests, and DEFAULT_ESTIMATE.
+        """
+        if nodeid in self.durations:
+            return self.durations[nodeid]["duration"]
+
+        browser = browser_of(nodeid)
+        base = strip_browser(nodeid)
+        siblings = [entry["duration"] for known, entry in self.durations.items() if strip_browser(known) == base]
+        if siblings:
+            return statistics.mean(siblings) * self._browser_factor(browser)
+
+        same_browser = [entry["duration"] for known, entry in self.durations.items() if browser_of(known) == browser]
+        if browser and same_browser:
+            return statistics.median(same_browser)
+        if self.durations:
+            return statistics.median(entry["duration"] for entry in self.durations.values())
+        return DEFAULT_ESTIMATE
+
+    def _browser_factor(self, browser):
+        """How much slower than average this browser's tests run"""
+        if not browser or not self.durations:
+            return 1.0
+        overall = statistics.mean(entry["duration"] for entry in self.durations.values())
+        same_browser = [entry["duration"] for known, entry in self.durations.items() if browser_of(known) == browser]
+        if not same_browser or overall <= 0:
+            return 1.0
+        return statistics.mean(same_browser) / overall
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+def schedule_longest_first(nodeids, workers, store):
+    """
+    Assign tests to workers longest-first (LPT scheduling)
+
+    Each test, from the slowest estimate down, goes to the worker with the
+    least predicted work so far. Ties are broken by nodeid so the plan is
+    deterministic.
+
+    Returns:
+        tuple: (assignments, predicted_loads) - one nodeid list and one
+        predicted total in seconds per worker
+    """
+    estimates = {nodeid: store.estimate(nodeid) for nodeid in nodeids}
+    ordered = sorted(nodeids, key=lambda nodeid: (-estimates[nodeid], nodeid))
+
+    assignments = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for nodeid in ordered:
+        target = min(range(workers), key=lambda index: (loads[index], index))
+        assignments[target].append(nodeid)
+        loads[target] += estimates[nodeid]
+
+    return assignments, loads
+
+
+def browser_of(nodeid):
+    """Browser param of a nodeid like '...::test_x[firefox-1]' ('' if none)"""
+    match = _BROWSER_PARAM.search(nodeid)
+    return match.group(1) if match else ""
+
+
+def records_duration(nodeid, status):
+    """Whether a result belongs in the duration history: browser tests that ran (unit tests would skew the medians)"""
+    return status != "SKIPPED" and bool(_BROWSER_PARAM.search(nodeid))
+
+
+def strip_browser(nodeid):
+    """Nodeid with the browser param removed, used to match a test across browsers"""
+    return _BROWSER_PARAM.sub("*", nodeid)
@@ -0,0 +1,66 @@
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def trace_path_for(report_file_path):
+    """<report>.trace.json next to an HTML report"""
+    return os.path.splitext(report_file_path)[0] + ".trace.json"
+
+
+class ChromeTraceWriter:
+    """
+    Append tests' page-object spans to a file in the Chrome trace event format
+
+    Uses the JSON array format, which trace viewers also load when the closing
+    bracket is missing, so a session that dies mid-run still leaves a usable
+    trace. Each test becomes its own track (named after the test) on a shared
+    wall clock, so tests from parallel workers show side by side. The file
+    opens in chrome://tracing or Perfetto (ui.perfetto.dev) and is only
+    created once a test has spans.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._tracks = 0
+
+    def add(self, test_name, trace):
+        """Write one test's spans (see pages.tracing.Trace.to_dict); no-op without spans"""
+        if not trace or not trace['spans']:
+            return
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._file.write("[")
+            self._write({'name': 'process_name', 'ph': 'M', 'pid': 1, 'tid': 0, 'args': {'name': "Test session"}})
+
+        self._tracks += 1
+        tid = self._tracks
+        self._write({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': test_name}})
+        started_us = trace['started_at'] * 1e6
+        for name, start, duration, depth, error in trace['spans']:
+            event = {'name': name, 'cat': 'page', 'ph': 'X', 'pid': 1, 'tid': tid,
+                     'ts': round(started_us + start * 1e6), 'dur': round(duration * 1e6)}
+            if error:
+                event['args'] = {'error': error}
+            self._write(event)
+        self._file.flush()
+
+    def close(self):
+        """
+        Returns:
+            str: Path of the trace file, or None if no test recorded spans
+        """
+        if self._file is None:
+            return None
+        self._file.write("\n]\n")
+        self._file.close()
+        self._file = None
+        logger.info(f"Trace: {os.path.abspath(self.path)}")
+        return self.path
+
+    def _write(self, event):
+        separator = "\n" if self._file.tell() <= 1 else ",\n"
+        self._file.write(separator + json.dumps(event))
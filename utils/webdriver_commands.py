@@ -0,0 +1,123 @@
+import os
+import sys
+import time
+
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+from utils.test_metrics import current_test_metrics
+
+_FIND_COMMANDS = (Command.FIND_ELEMENT, Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENT, Command.FIND_CHILD_ELEMENTS)
+_SCRIPT_COMMANDS = (Command.W3C_EXECUTE_SCRIPT, Command.W3C_EXECUTE_SCRIPT_ASYNC)
+
+# Forget element -> locator mappings past this many (a pooled driver lives for many tests)
+_MAX_TRACKED_ELEMENTS = 2000
+
+# Packages whose frames a command can be attributed to, innermost first
+_SOURCE_PACKAGES = ("pages.", "utils.", "tests.", "conftest")
+
+
+def command_metrics_enabled():
+    return os.getenv('COMMAND_METRICS', 'true').lower() != 'false'
+
+
+def instrument_driver(driver):
+    """
+    Count and time every WebDriver command the driver sends (idempotent)
+
+    Wraps the instance's `execute`, which every WebDriver call goes through
+    (elements call back into it too). `command_count(driver)` deltas show how
+    many round trips a piece of code cost. While a test is running, each
+    command's name, target, duration, outcome and the page-object method that
+    issued it are also recorded into the test's metrics (COMMAND_METRICS=false
+    keeps only the count).
+    """
+    if getattr(driver, '_command_counter_installed', False):
+        return
+    original_execute = driver.execute
+    record = command_metrics_enabled()
+
+    def execute(driver_command, params=None):
+        driver.command_count += 1
+        metrics = current_test_metrics() if record else None
+        if metrics is None:
+            return original_execute(driver_command, params)
+
+        started = time.perf_counter()
+        error = None
+        try:
+            response = original_execute(driver_command, params)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            metrics.add_command(driver_command, _command_target(driver, driver_command, params),
+                                _command_source(), time.perf_counter() - started, error)
+        if driver_command in _FIND_COMMANDS:
+            _remember_locators(driver, params, response)
+        return response
+
+    driver.command_count = 0
+    driver._element_locators = {}
+    driver.execute = execute
+    driver._command_counter_installed = True
+
+
+def command_count(driver):
+    return getattr(driver, 'command_count', 0)
+
+
+def _command_target(driver, driver_command, params):
+    """Short description of what a command acts on: locator, element, URL or script"""
+    if not params:
+        return ""
+    if driver_command in _FIND_COMMANDS:
+        return f"{params.get('using')}={params.get('value')}"
+    if driver_command == Command.GET:
+        return params.get('url', "")
+    if driver_command in _SCRIPT_COMMANDS:
+        return " ".join(params.get('script', "").split())[:60]
+    if 'id' in params:
+        return driver._element_locators.get(params['id'], "element")
+    return ""
+
+
+def _remember_locators(driver, params, response):
+    """Map returned element ids to the locator that found them, for later element commands"""
+    value = response.get('value') if isinstance(response, dict) else None
+    elements = value if isinstance(value, list) else [value]
+    locators = driver._element_locators
+    if len(locators) > _MAX_TRACKED_ELEMENTS:
+        locators.clear()
+    locator = f"{params.get('using')}={params.get('value')}"
+    for element in elements:
+        if isinstance(element, WebElement):
+            locators[element.id] = locator
+
+
+def _command_source():
+    """
+    The code that issued the command: the outermost page-object method of the
+    innermost run of page-object frames (so BasePage.click called from
+    CartPage.click_checkout reports CartPage.click_checkout), else the
+    innermost helper, test or conftest function.
+    """
+    frame = sys._getframe(2)
+    source = None
+    while frame is not None:
+        module = frame.f_globals.get('__name__', "")
+        if module == "pages.tracing":
+            pass  # span wrappers around the real methods
+        elif module.startswith("pages."):
+            source = frame
+        elif source is not None:
+            break
+        elif module.startswith(_SOURCE_PACKAGES) and module != __name__:
+            source = frame
+            break
+        frame = frame.f_back
+    if source is None:
+        return "-"
+    owner = source.f_locals.get('self')
+    name = source.f_code.co_name
+    return f"{type(owner).__name__}.{name}" if owner is not None else name